@@ -0,0 +1,276 @@
+"""
+Admission control for the API: rate limiting and load shedding
+
+Every request is put in a priority class by path:
+
+- critical: liveness and the headline fusion score, never limited or shed
+- heavy: endpoints that fan out to MongoDB or run models
+- tile: vector tiles, cheap and cached but requested dozens at a time as
+  the map pans, so their per-client burst is much larger
+- normal: lightweight reads and stats
+
+Each route is listed in exactly one class (by path, or by prefix for
+routes with path parameters); unlisted paths fall back to normal.
+
+Non-critical requests pass two checks, both held in memory per worker:
+
+1. token buckets, one per (client, class) and one per heavy route shared
+   by all clients; an empty bucket answers 429 with Retry-After
+2. in-flight shedding: heavy requests are refused once ADMISSION_HEAVY_INFLIGHT
+   requests are running, normal ones at ADMISSION_MAX_INFLIGHT; refused
+   requests get 503 with Retry-After
+
+Long-lived /updates streams are exempt; UpdateHub caps those itself.
+Limits are per uvicorn worker, so the effective totals scale with workers.
+"""
+
+import logging
+import math
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, Hashable, Optional, Tuple
+
+import orjson
+
+from metrics import ADMISSION_IN_FLIGHT, ADMISSION_REJECTED
+
+logger = logging.getLogger(__name__)
+
+ADMISSION_ENABLED = os.getenv("ADMISSION_ENABLED", "true").lower() == "true"
+# Sustained requests/second and burst per client for each class
+CLIENT_RATE_NORMAL = float(os.getenv("ADMISSION_CLIENT_RATE", "10"))
+CLIENT_BURST_NORMAL = float(os.getenv("ADMISSION_CLIENT_BURST", "20"))
+CLIENT_RATE_HEAVY = float(os.getenv("ADMISSION_CLIENT_HEAVY_RATE", "2"))
+CLIENT_BURST_HEAVY = float(os.getenv("ADMISSION_CLIENT_HEAVY_BURST", "5"))
+CLIENT_RATE_TILE = float(os.getenv("ADMISSION_CLIENT_TILE_RATE", "50"))
+CLIENT_BURST_TILE = float(os.getenv("ADMISSION_CLIENT_TILE_BURST", "200"))
+# Requests/second across all clients for each heavy route
+ROUTE_RATE_HEAVY = float(os.getenv("ADMISSION_ROUTE_HEAVY_RATE", "50"))
+ROUTE_BURST_HEAVY = float(os.getenv("ADMISSION_ROUTE_HEAVY_BURST", "100"))
+HEAVY_INFLIGHT = int(os.getenv("ADMISSION_HEAVY_INFLIGHT", "32"))
+MAX_INFLIGHT = int(os.getenv("ADMISSION_MAX_INFLIGHT", "96"))
+SHED_RETRY_AFTER = int(os.getenv("ADMISSION_SHED_RETRY_AFTER", "2"))
+# Use the first X-Forwarded-For hop as client id (only behind a trusted proxy)
+TRUST_FORWARDED = os.getenv("ADMISSION_TRUST_FORWARDED", "false").lower() == "true"
+
+CRITICAL = "critical"
+NORMAL = "normal"
+HEAVY = "heavy"
+TILE = "tile"
+
+CRITICAL_PATHS = {"/", "/health", "/health/live", "/health/ready", "/fusion-score", "/metrics"}
+HEAVY_PATHS = {
+    "/dashboard", "/sync", "/fusion-scores", "/fusion-score/top", "/map/health", "/weather/forecast",
+    "/predict-price", "/charts/prices", "/charts/weather", "/charts/ndvi"
+}
+NORMAL_PATHS = {
+    "/news-risk", "/updates/stats", "/model-pool/stats", "/admission/stats", "/cache/stats",
+    "/openapi.json", "/docs", "/docs/oauth2-redirect", "/redoc"
+}
+# Routes with path parameters, matched by prefix
+PREFIX_CLASSES = (
+    ("/map/tiles/", TILE),
+    ("/commodities/", HEAVY),
+)
+EXEMPT_PATHS = {"/updates"}
+
+
+def priority_class(path: str) -> str:
+    if path in CRITICAL_PATHS:
+        return CRITICAL
+    if path in HEAVY_PATHS:
+        return HEAVY
+    for prefix, priority in PREFIX_CLASSES:
+        if path.startswith(prefix):
+            return priority
+    return NORMAL
+
+
+class TokenBucket:
+    """Refills rate tokens per second up to burst"""
+
+    __slots__ = ("rate", "burst", "tokens", "updated")
+
+    def __init__(self, rate: float, burst: float, now: float):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = burst
+        self.updated = now
+
+    def take(self, now: float, cost: float = 1.0) -> float:
+        """Consume cost tokens; 0 when admitted, else seconds until they are available"""
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        if self.tokens >= cost:
+            self.tokens -= cost
+            return 0.0
+        return (cost - self.tokens) / self.rate
+
+
+class BucketTable:
+    """
+    Token buckets by key, bounded with LRU eviction
+
+    An evicted client starts again with a full bucket, so maxsize should
+    comfortably exceed the number of clients active within one burst.
+    """
+
+    def __init__(self, rate: float, burst: float, maxsize: int = 10000,
+                 timer: Callable[[], float] = time.monotonic):
+        self.rate = rate
+        self.burst = burst
+        self.maxsize = maxsize
+        self._timer = timer
+        self._buckets: "OrderedDict[Hashable, TokenBucket]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def take(self, key: Hashable, cost: float = 1.0) -> float:
+        """0 when admitted, else seconds to wait"""
+        now = self._timer()
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                bucket = self._buckets[key] = TokenBucket(self.rate, self.burst, now)
+                while len(self._buckets) > self.maxsize:
+                    self._buckets.popitem(last=False)
+            else:
+                self._buckets.move_to_end(key)
+            return bucket.take(now, cost)
+
+    def __len__(self) -> int:
+        return len(self._buckets)
+
+
+class AdmissionController:
+    """Per-class buckets and in-flight accounting behind AdmissionMiddleware"""
+
+    def __init__(self, heavy_inflight: int = HEAVY_INFLIGHT, max_inflight: int = MAX_INFLIGHT,
+                 shed_retry_after: int = SHED_RETRY_AFTER,
+                 timer: Callable[[], float] = time.monotonic):
+        """
+        Args:
+            heavy_inflight: Running requests at which heavy requests are shed
+            max_inflight: Running requests at which normal and tile requests are shed
+            shed_retry_after: Seconds advertised with a 503
+            timer: Monotonic clock, injectable for tests
+        """
+        self.heavy_inflight = heavy_inflight
+        self.max_inflight = max_inflight
+        self.shed_retry_after = shed_retry_after
+        self.client_buckets = {
+            NORMAL: BucketTable(CLIENT_RATE_NORMAL, CLIENT_BURST_NORMAL, timer=timer),
+            HEAVY: BucketTable(CLIENT_RATE_HEAVY, CLIENT_BURST_HEAVY, timer=timer),
+            TILE: BucketTable(CLIENT_RATE_TILE, CLIENT_BURST_TILE, timer=timer)
+        }
+        self.route_buckets = BucketTable(ROUTE_RATE_HEAVY, ROUTE_BURST_HEAVY, timer=timer)
+        self.in_flight = 0
+
+        self.admitted = 0
+        self.rate_limited = 0
+        self.shed = 0
+
+    def admit(self, client: str, path: str) -> Optional[Tuple[int, int, str]]:
+        """
+        None when the request may run, else (status, retry_after, detail)
+
+        An admitted non-critical request must be followed by release().
+        """
+        priority = priority_class(path)
+        if priority == CRITICAL:
+            self.admitted += 1
+            return None
+
+        limit = self.heavy_inflight if priority == HEAVY else self.max_inflight
+        if self.in_flight >= limit:
+            return self._reject(priority, "shed", 503, self.shed_retry_after, "Server busy, retry later")
+
+        wait = self.client_buckets[priority].take(client)
+        if not wait and priority == HEAVY:
+            wait = self.route_buckets.take(path)
+        if wait:
+            return self._reject(priority, "rate_limited", 429, math.ceil(wait), "Rate limit exceeded")
+
+        self.in_flight += 1
+        self.admitted += 1
+        ADMISSION_IN_FLIGHT.inc()
+        return None
+
+    def release(self):
+        self.in_flight -= 1
+        ADMISSION_IN_FLIGHT.dec()
+
+    def _reject(self, priority: str, reason: str, status: int, retry_after: int, detail: str):
+        if reason == "shed":
+            self.shed += 1
+        else:
+            self.rate_limited += 1
+        ADMISSION_REJECTED.labels(priority, reason).inc()
+        return status, max(1, retry_after), detail
+
+    def stats(self) -> Dict:
+        return {
+            "in_flight": self.in_flight,
+            "heavy_inflight_limit": self.heavy_inflight,
+            "max_inflight": self.max_inflight,
+            "admitted": self.admitted,
+            "rate_limited": self.rate_limited,
+            "shed": self.shed,
+            "tracked_clients": {name: len(table) for name, table in self.client_buckets.items()}
+        }
+
+
+def client_id(scope) -> str:
+    """Client address, or the first X-Forwarded-For hop when trusted"""
+    if TRUST_FORWARDED:
+        for name, value in scope.get("headers", []):
+            if name == b"x-forwarded-for":
+                return value.decode("latin-1").split(",")[0].strip()
+    client = scope.get("client")
+    return client[0] if client else "unknown"
+
+
+class AdmissionMiddleware:
+    """Pure ASGI middleware applying an AdmissionController to HTTP requests"""
+
+    def __init__(self, app, controller: AdmissionController, enabled: bool = ADMISSION_ENABLED):
+        self.app = app
+        self.controller = controller
+        self.enabled = enabled
+
+    async def __call__(self, scope, receive, send):
+        if not self.enabled or scope["type"] != "http" or scope["path"] in EXEMPT_PATHS \
+                or scope["method"] == "OPTIONS":
+            await self.app(scope, receive, send)
+            return
+
+        path = scope["path"]
+        rejection = self.controller.admit(client_id(scope), path)
+        if rejection is not None:
+            status, retry_after, detail = rejection
+            await self._reject(send, status, retry_after, detail)
+            return
+
+        if priority_class(path) == CRITICAL:
+            await self.app(scope, receive, send)
+            return
+
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            self.controller.release()
+
+    @staticmethod
+    async def _reject(send, status: int, retry_after: int, detail: str):
+        body = orjson.dumps({"detail": detail})
+        await send({
+            "type": "http.response.start",
+            "status": status,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode("latin-1")),
+                (b"retry-after", str(retry_after).encode("latin-1"))
+            ]
+        })
+        await send({"type": "http.response.body", "body": body})
@@ -0,0 +1,82 @@
+"""
+LTTB downsampling throughput for /charts/* series
+
+Times the vectorized lttb_indices against a pure-Python LTTB loop, and
+the full downsample() path from date-keyed documents (numpy conversion
+included), for random-walk series reduced to a chart's worth of points.
+The pure-Python loop is skipped above --python-limit points.
+
+Usage (from backend/):
+    python benchmarks/bench_downsampling.py
+    python benchmarks/bench_downsampling.py --sizes 10000,1000000 --points 600 --repeat 5
+"""
+
+import argparse
+import os
+import sys
+import timeit
+from datetime import datetime, timedelta
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from downsampling import downsample, lttb_indices
+
+
+def python_lttb(x, y, max_points):
+    """Reference loop: per-bucket means and areas in plain Python"""
+    n = len(x)
+    every = (n - 2) / (max_points - 2)
+    kept, a = [0], 0
+    for bucket in range(max_points - 2):
+        start, end = int(bucket * every) + 1, int((bucket + 1) * every) + 1
+        following_end = min(int((bucket + 2) * every) + 1, n)
+        following = range(end, following_end) or range(n - 1, n)
+        cx = sum(x[i] for i in following) / len(following)
+        cy = sum(y[i] for i in following) / len(following)
+        best, best_area = start, -1.0
+        for i in range(start, end):
+            area = abs((x[a] - cx) * (y[i] - y[a]) - (x[a] - x[i]) * (cy - y[a]))
+            if area > best_area:
+                best, best_area = i, area
+        kept.append(best)
+        a = best
+    return kept + [n - 1]
+
+
+def best_ms(fn, repeat: int) -> float:
+    return min(timeit.repeat(fn, number=1, repeat=repeat)) * 1000
+
+
+def main(sizes, points: int, repeat: int, python_limit: int):
+    rng = np.random.default_rng(0)
+    print(f"max_points={points}, best of {repeat}")
+    for n in sizes:
+        x = np.arange(n, dtype=np.float64) * 86400 + 1.6e9
+        y = np.cumsum(rng.normal(size=n))
+        vectorized = best_ms(lambda: lttb_indices(x, y, points), repeat)
+
+        if n <= python_limit:
+            xs, ys = x.tolist(), y.tolist()
+            loop = f"{best_ms(lambda: python_lttb(xs, ys, points), max(1, repeat // 2)):10.1f} ms"
+        else:
+            loop = "   skipped"
+
+        start = datetime(1900, 1, 1)
+        documents = [{"date": start + timedelta(hours=i), "price_usd_per_ton": value}
+                     for i, value in enumerate(y.tolist())]
+        end_to_end = best_ms(lambda: downsample(documents, "date", "price_usd_per_ton", points), repeat)
+
+        print(f"  {n:>10,} points  numpy {vectorized:9.2f} ms  python loop {loop}  "
+              f"documents -> points {end_to_end:9.1f} ms")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", default="10000,100000,1000000")
+    parser.add_argument("--points", type=int, default=600)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--python-limit", type=int, default=1000000)
+    args = parser.parse_args()
+    main([int(size) for size in args.sizes.split(",")], args.points, args.repeat, args.python_limit)
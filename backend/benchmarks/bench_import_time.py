@@ -0,0 +1,101 @@
+"""
+Cold-start import time of the API worker and the scheduler
+
+Imports each entry module in a fresh interpreter with `-X importtime`,
+reports wall-clock import time (median over --runs), the modules with the
+largest cumulative import time, and which heavy optional dependencies were
+loaded. Heavy dependencies are meant to load on first use (forecasts,
+ingestion, SMS), so none of them should appear for either entry point.
+
+Targets (median wall-clock import, warm OS file cache):
+    main          < 1.5 s  (FastAPI, Motor, prometheus_client, orjson)
+    scheduler_v2  < 0.8 s  (pymongo, schedule, prometheus_client)
+
+Measured (Python 3.11, 7 runs): main 0.89 s; scheduler_v2 0.78 s while
+push.py took dumps from responses (FastAPI alone ~335 ms), 0.35 s since
+it imports serialization instead.
+
+Usage (from backend/):
+    python benchmarks/bench_import_time.py
+    python benchmarks/bench_import_time.py --modules main --runs 10 --top 25
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Dict, List, Tuple
+
+BACKEND = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+TARGET_SECONDS = {"main": 1.5, "scheduler_v2": 0.8}
+HEAVY_MODULES = ["numpy", "sklearn", "feedparser", "twilio", "requests"]
+
+
+def run_import(module: str, cwd: str, importtime: bool = False) -> Tuple[float, str]:
+    """Wall-clock seconds to import module in a new interpreter, and its stderr"""
+    command = [sys.executable]
+    if importtime:
+        command += ["-X", "importtime"]
+    command += ["-c", f"import {module}"]
+    env = dict(os.environ, PYTHONPATH=BACKEND, PYTHONDONTWRITEBYTECODE="1")
+
+    started = time.perf_counter()
+    result = subprocess.run(command, cwd=cwd, env=env, capture_output=True, text=True)
+    elapsed = time.perf_counter() - started
+    if result.returncode != 0:
+        raise RuntimeError(f"import {module} failed:\n{result.stderr[-2000:]}")
+    return elapsed, result.stderr
+
+
+def parse_importtime(stderr: str) -> Dict[str, Tuple[int, int]]:
+    """{module: (self_us, cumulative_us)} from -X importtime output"""
+    modules = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = (part.strip() for part in line[len("import time:"):].split("|"))
+        modules[name.strip()] = (int(self_us), int(cumulative_us))
+    return modules
+
+
+def report(module: str, runs: int, top: int, cwd: str):
+    # Interpreter start-up alone, to separate it from our imports
+    baseline = statistics.median(run_import("sys", cwd)[0] for _ in range(runs))
+    wall = statistics.median(run_import(module, cwd)[0] for _ in range(runs))
+    _, stderr = run_import(module, cwd, importtime=True)
+    modules = parse_importtime(stderr)
+
+    target = TARGET_SECONDS.get(module)
+    verdict = "" if target is None else (" OK" if wall < target else f" OVER target {target:.1f} s")
+    print(f"\n== import {module}: {wall:.3f} s wall (interpreter alone {baseline:.3f} s), "
+          f"{len(modules)} modules{verdict}")
+
+    top_level: List[Tuple[str, int]] = sorted(
+        ((name, cumulative) for name, (_, cumulative) in modules.items() if "." not in name),
+        key=lambda item: item[1], reverse=True
+    )
+    for name, cumulative in top_level[:top]:
+        print(f"  {cumulative / 1000:9.1f} ms  {name}")
+
+    loaded = [name for name in HEAVY_MODULES if name in modules]
+    print(f"  heavy dependencies loaded: {', '.join(loaded) if loaded else 'none'}")
+
+
+def main(modules: List[str], runs: int, top: int):
+    # Separate working directory: scheduler_v2 opens scheduler.log on import
+    with tempfile.TemporaryDirectory() as cwd:
+        for module in modules:
+            report(module, runs, top, cwd)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--modules", nargs="+", default=["main", "scheduler_v2"])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=15)
+    args = parser.parse_args()
+    main(args.modules, args.runs, args.top)
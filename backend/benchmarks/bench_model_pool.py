@@ -0,0 +1,103 @@
+"""
+Event-loop responsiveness while forecasts run
+
+A probe coroutine stands in for light endpoints: every 5 ms it awaits a
+1 ms sleep and records how late it woke up (event-loop lag, which every
+concurrent request on the worker pays). Meanwhile `--concurrency`
+forecasts run back to back, either inline on the loop (what a plain
+async handler does) or through model_pool.ModelPool.
+
+Usage (from backend/):
+    python benchmarks/bench_model_pool.py
+    python benchmarks/bench_model_pool.py --points 3650 --concurrency 8 --seconds 5
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+from datetime import datetime, timedelta
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from model_pool import ModelPool
+from models.price_predictor import run_forecast
+
+
+def history(points: int):
+    start = datetime(2015, 1, 1)
+    return [
+        {"date": start + timedelta(days=i), "price": 300 + 20 * np.sin(i / 58) + np.random.randn()}
+        for i in range(points)
+    ]
+
+
+async def probe(stop: asyncio.Event, lags: list):
+    while not stop.is_set():
+        started = time.perf_counter()
+        await asyncio.sleep(0.001)
+        lags.append((time.perf_counter() - started - 0.001) * 1000)
+        await asyncio.sleep(0.004)
+
+
+async def forecaster(run, stop: asyncio.Event, counts: list):
+    while not stop.is_set():
+        await run()
+        counts[0] += 1
+
+
+async def measure(mode: str, prices, concurrency: int, seconds: float, pool: ModelPool):
+    if mode == "inline":
+        async def run():
+            run_forecast("prophet_style", prices, 30)
+            await asyncio.sleep(0)
+    elif mode == "pool":
+        async def run():
+            await pool.run(run_forecast, "prophet_style", prices, 30)
+    else:
+        async def run():
+            await asyncio.sleep(0.01)
+
+    stop = asyncio.Event()
+    lags, counts = [], [0]
+    tasks = [asyncio.ensure_future(probe(stop, lags))]
+    if mode != "idle":
+        tasks += [asyncio.ensure_future(forecaster(run, stop, counts)) for _ in range(concurrency)]
+    await asyncio.sleep(seconds)
+    stop.set()
+    await asyncio.gather(*tasks)
+
+    lags = np.array(lags)
+    print(
+        f"{mode:>6} | forecasts/s {counts[0] / seconds:8.1f} | probe lag ms "
+        f"p50 {np.percentile(lags, 50):6.2f}  p99 {np.percentile(lags, 99):7.2f}  max {lags.max():7.2f}"
+    )
+
+
+async def main(points: int, concurrency: int, seconds: float):
+    prices = history(points)
+    started = time.perf_counter()
+    run_forecast("prophet_style", prices, 30)
+    print(f"{points:,} points, one forecast inline: {(time.perf_counter() - started) * 1000:.2f} ms, "
+          f"{concurrency} concurrent callers, {os.cpu_count()} CPUs")
+
+    pool = ModelPool(queue_depth=concurrency)
+    await pool.start()
+    try:
+        for mode in ("idle", "inline", "pool"):
+            await measure(mode, prices, concurrency, seconds, pool)
+    finally:
+        pool.shutdown()
+    print("pool:", pool.stats())
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--points", type=int, default=3650)
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--seconds", type=float, default=3.0)
+    args = parser.parse_args()
+    asyncio.run(main(args.points, args.concurrency, args.seconds))
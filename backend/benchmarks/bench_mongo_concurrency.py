@@ -0,0 +1,141 @@
+"""
+Concurrency benchmark: blocking pymongo vs Motor repository
+
+Replays the dashboard read mix (fusion score, NDVI tiles, weather, news)
+from N concurrent clients inside one event loop and reports requests/sec.
+
+- "pymongo": synchronous MongoClient calls inside async functions, which is
+  what the API handlers did before the repository layer (blocks the loop)
+- "motor":   the same reads through database.MacroDataRepository
+- "http":    optional end-to-end run against a live API (--url), e.g. once
+  against a server started from the baseline commit and once from HEAD
+
+Usage (from backend/):
+    python benchmarks/bench_mongo_concurrency.py --clients 50 200 --duration 10
+    python benchmarks/bench_mongo_concurrency.py --url http://localhost:8000
+
+Results: none recorded yet. The req/s figures at 50 and 200 clients need a
+running MongoDB with the ingested dataset. None was available where the
+repository layer was written, and numbers from a mocked database would not
+reflect pool or event-loop behaviour. When recording them here, include
+the MongoDB version, the host and the document counts per collection.
+"""
+
+import argparse
+import asyncio
+import itertools
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database import MacroDataRepository, create_async_client, create_sync_client, get_database
+
+COUNTRIES = ["IN", "US", "BR", "AR"]
+CROPS = ["wheat", "rice", "corn", "soybeans"]
+
+
+def blocking_reads(db):
+    """Dashboard reads the way the old handlers issued them"""
+
+    async def fusion(country, crop):
+        return db["fusion_scores"].find_one({"country": country, "crop": crop}, sort=[("timestamp", -1)])
+
+    async def tiles(country, crop):
+        return list(db["satellites"].find({"country": country, "crop": crop, "type": "NDVI"},
+                                          sort=[("timestamp", -1)], limit=100))
+
+    async def weather(country, crop):
+        return list(db["weather"].find({"country": country}, sort=[("date", -1)], limit=30))
+
+    async def news(country, crop):
+        return list(db["news"].find({"country": country}, sort=[("date", -1)], limit=20))
+
+    return [fusion, tiles, weather, news]
+
+
+def motor_reads(repository: MacroDataRepository):
+    """Dashboard reads through the async repository"""
+
+    async def fusion(country, crop):
+        return await repository.get_latest_fusion_score(country, crop)
+
+    async def tiles(country, crop):
+        return await repository.get_crop_health_tiles(country, crop)
+
+    async def weather(country, crop):
+        return await repository.get_weather_forecast(country, 30)
+
+    async def news(country, crop):
+        return await repository.get_recent_news(country)
+
+    return [fusion, tiles, weather, news]
+
+
+def http_reads(client):
+    """Dashboard reads against a running API"""
+
+    async def fusion(country, crop):
+        return await client.get("/fusion-score", params={"country": country, "crop": crop})
+
+    async def tiles(country, crop):
+        return await client.get("/map/health", params={"country": country, "crop": crop})
+
+    async def weather(country, crop):
+        return await client.get("/weather/forecast", params={"country": country})
+
+    async def news(country, crop):
+        return await client.get("/news-risk", params={"country": country})
+
+    return [fusion, tiles, weather, news]
+
+
+async def run_load(reads, clients: int, duration: float) -> float:
+    """Run `clients` workers looping over the read mix, return requests/sec"""
+    pairs = itertools.cycle(itertools.product(COUNTRIES, CROPS))
+    deadline = time.perf_counter() + duration
+    completed = 0
+
+    async def worker(offset: int):
+        nonlocal completed
+        i = offset
+        while time.perf_counter() < deadline:
+            country, crop = next(pairs)
+            await reads[i % len(reads)](country, crop)
+            completed += 1
+            i += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker(n) for n in range(clients)))
+    return completed / (time.perf_counter() - start)
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--clients", type=int, nargs="+", default=[50, 200])
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds per run")
+    parser.add_argument("--url", help="benchmark a running API instead of MongoDB directly")
+    args = parser.parse_args()
+
+    if args.url:
+        import httpx
+        async with httpx.AsyncClient(base_url=args.url, timeout=30) as client:
+            for clients in args.clients:
+                rps = await run_load(http_reads(client), clients, args.duration)
+                print(f"http    clients={clients:<4} {rps:10.1f} req/s")
+        return
+
+    # Same URI, database and pool settings as the API and scheduler
+    sync_db = get_database(create_sync_client())
+    repository = MacroDataRepository(get_database(create_async_client()))
+
+    for clients in args.clients:
+        before = await run_load(blocking_reads(sync_db), clients, args.duration)
+        after = await run_load(motor_reads(repository), clients, args.duration)
+        print(f"pymongo clients={clients:<4} {before:10.1f} req/s")
+        print(f"motor   clients={clients:<4} {after:10.1f} req/s  ({after / before:.1f}x)")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,141 @@
+"""
+Connection count and memory benchmark for the /updates push channel
+
+In-process mode parks N idle streams on an UpdateHub exactly as the
+endpoint does (one sse_stream generator per connection) and reports
+memory per connection plus broadcast and per-topic fan-out latency.
+
+With --url it opens N real SSE connections to a running API instead and
+reads /updates/stats; compare the server's RSS before and after.
+
+Usage (from backend/):
+    python benchmarks/bench_push_hub.py
+    python benchmarks/bench_push_hub.py --connections 1000 10000 50000
+    python benchmarks/bench_push_hub.py --url http://localhost:8000 --connections 2000
+"""
+
+import argparse
+import asyncio
+import gc
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from push import UpdateHub, sse_stream
+
+COUNTRIES = ["IN", "US", "BR", "AR"]
+CROPS = ["wheat", "rice", "corn", "soybeans"]
+
+
+def rss_kb() -> int:
+    with open("/proc/self/statm") as statm:
+        return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") // 1024
+
+
+async def consume(hub: UpdateHub, subscription, received: list, done: asyncio.Event, expected: list):
+    async for frame in sse_stream(hub, subscription):
+        if frame.startswith(b"event:"):
+            received[0] += 1
+            if received[0] >= expected[0]:
+                done.set()
+
+
+async def run_in_process(connections: int):
+    hub = UpdateHub(max_subscribers=connections)
+    received, expected = [0], [connections]
+    done = asyncio.Event()
+
+    gc.collect()
+    rss_before = rss_kb()
+    tracemalloc.start()
+    started = time.perf_counter()
+    tasks = []
+    for i in range(connections):
+        subscription = hub.subscribe(COUNTRIES[i % 4], CROPS[(i // 4) % 4])
+        tasks.append(asyncio.ensure_future(consume(hub, subscription, received, done, expected)))
+    await asyncio.sleep(0)
+    await asyncio.sleep(0)
+    setup = time.perf_counter() - started
+    traced, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    rss_after = rss_kb()
+
+    # Refresh notice to every stream
+    started = time.perf_counter()
+    hub.publish({"type": "data_updated", "collection": "weather"})
+    await done.wait()
+    broadcast = time.perf_counter() - started
+
+    # One pair's score delta reaches 1/16 of the streams
+    received[0], expected[0] = 0, connections // 16
+    done.clear()
+    started = time.perf_counter()
+    hub.publish({"type": "fusion_score", "country": "IN", "crop": "wheat", "fusion_score": 71.5})
+    if expected[0]:
+        await done.wait()
+    topic = time.perf_counter() - started
+
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+
+    print(
+        f"{connections:>8,} streams | setup {setup * 1000:8.1f} ms | "
+        f"{traced / connections / 1024:5.2f} KiB/conn traced, "
+        f"{(rss_after - rss_before) / connections:5.2f} KiB/conn RSS | "
+        f"broadcast {broadcast * 1000:7.1f} ms | one topic {topic * 1000:6.2f} ms | "
+        f"open after close: {hub.stats()['connections']}"
+    )
+
+
+async def run_over_http(url: str, connections: int):
+    import httpx
+
+    limits = httpx.Limits(max_connections=connections, max_keepalive_connections=0)
+    async with httpx.AsyncClient(base_url=url, limits=limits, timeout=None) as client:
+        failures = []
+
+        async def hold(i: int, ready: asyncio.Event):
+            params = {"country": COUNTRIES[i % 4], "crop": CROPS[(i // 4) % 4]}
+            try:
+                async with client.stream("GET", "/updates", params=params) as response:
+                    response.raise_for_status()
+                    ready.set()
+                    async for _ in response.aiter_bytes():
+                        pass
+            except httpx.HTTPError as e:
+                failures.append(e)
+                ready.set()
+
+        events = [asyncio.Event() for _ in range(connections)]
+        started = time.perf_counter()
+        tasks = [asyncio.ensure_future(hold(i, events[i])) for i in range(connections)]
+        await asyncio.gather(*(event.wait() for event in events))
+        print(f"{connections - len(failures):,} streams open in {time.perf_counter() - started:.2f}s, {len(failures)} failed")
+        # Every pooled connection is held by a stream
+        async with httpx.AsyncClient(base_url=url) as probe:
+            print("server:", (await probe.get("/updates/stats")).json())
+
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--connections", type=int, nargs="+", default=[1000, 10000])
+    parser.add_argument("--url", help="Benchmark a running API instead of an in-process hub")
+    args = parser.parse_args()
+
+    for connections in args.connections:
+        if args.url:
+            asyncio.run(run_over_http(args.url, connections))
+        else:
+            asyncio.run(run_in_process(connections))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""
+Serialization microbenchmark per endpoint payload
+
+Compares FastAPI's default path for a returned dict (jsonable_encoder walk,
+then JSONResponse/json.dumps) with returning responses.FastJSONResponse
+(single orjson pass). Payloads mirror what each endpoint returns.
+
+Usage (from backend/):
+    python benchmarks/bench_serialization.py
+    python benchmarks/bench_serialization.py --repeat 2000
+"""
+
+import argparse
+import os
+import random
+import sys
+import timeit
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+from responses import FastJSONResponse
+
+
+def tile(i: int) -> dict:
+    return {
+        "country": "IN", "crop": "wheat", "region": f"Tile_{i // 5}_{i % 5}", "type": "NDVI",
+        "ndvi_value": random.uniform(0.5, 0.8), "latitude": random.uniform(8, 35),
+        "longitude": random.uniform(68, 97), "area_km2": 10000.0, "confidence": 0.92,
+        "timestamp": datetime.utcnow(), "source": "sentinel-2"
+    }
+
+
+def weather_day(i: int) -> dict:
+    return {
+        "country": "IN", "city": "Delhi", "latitude": 28.7041, "longitude": 77.1025,
+        "date": datetime(2024, 1, 1) + timedelta(days=i), "temperature_min": random.uniform(10, 20),
+        "temperature_max": random.uniform(20, 35), "rainfall_mm": random.uniform(0, 20),
+        "humidity_percent": random.uniform(40, 90), "wind_speed_kmh": random.uniform(0, 30),
+        "timestamp": datetime.utcnow(), "source": "open-meteo"
+    }
+
+
+def price_day(i: int) -> dict:
+    return {
+        "commodity": "wheat", "date": datetime(2024, 1, 1) + timedelta(days=i),
+        "price_usd_per_ton": random.uniform(280, 320), "volume_traded": random.randint(80000, 120000),
+        "source": "market_data", "timestamp": datetime.utcnow()
+    }
+
+
+def news_item(i: int) -> dict:
+    return {
+        "country": "IN", "title": f"Monsoon outlook update {i}", "summary": "Rainfall forecast " * 10,
+        "link": f"https://news.example.com/{i}", "source": "Google News", "date": datetime.utcnow(),
+        "published_date": "Mon, 01 Jan 2024 00:00:00 GMT", "sentiment_score": random.uniform(-1, 1),
+        "categories": ["weather", "market"], "timestamp": datetime.utcnow()
+    }
+
+
+def payloads() -> dict:
+    now = datetime.utcnow().isoformat()
+    return {
+        "/fusion-score": {
+            "country": "IN", "crop": "wheat", "fusion_score": 71.3, "risk_level": "medium",
+            "confidence": 0.82, "components": {"crop_health": 80.0, "weather_score": 70.0,
+                                               "price_trend": 65.0, "news_risk": 70.0},
+            "timestamp": datetime.utcnow(), "expires_at": datetime.utcnow()
+        },
+        "/map/health (100 tiles)": {"country": "IN", "crop": "wheat",
+                                    "tiles": [tile(i) for i in range(100)], "timestamp": now},
+        "/map/health (2,500 tiles)": {"country": "IN", "crop": "wheat",
+                                      "tiles": [tile(i) for i in range(2500)], "timestamp": now},
+        "/weather/forecast (30 days)": {"country": "IN", "forecast_days": 30,
+                                        "data": [weather_day(i) for i in range(30)], "timestamp": now},
+        "/predict-price": {"commodity": "wheat", "days_ahead": 30,
+                           "historical_data": [price_day(i) for i in range(10)],
+                           "forecast_trend": "stable", "confidence": 0.85, "timestamp": now},
+        "/news-risk": {"country": "IN", "risk_score": 0.2, "risk_level": "low",
+                       "recent_news": [news_item(i) for i in range(20)], "timestamp": now},
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=500)
+    args = parser.parse_args()
+
+    print(f"{'endpoint':<30} {'default (us)':>14} {'orjson (us)':>12} {'speedup':>8}")
+    for name, payload in payloads().items():
+        default = timeit.timeit(lambda: JSONResponse(jsonable_encoder(payload)).body, number=args.repeat)
+        fast = timeit.timeit(lambda: FastJSONResponse(payload).body, number=args.repeat)
+        default_us = default / args.repeat * 1e6
+        fast_us = fast / args.repeat * 1e6
+        print(f"{name:<30} {default_us:14.1f} {fast_us:12.1f} {default_us / fast_us:7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""
+Payload size and parse time of /map/health tile formats
+
+Compares the default row format (one JSON object per tile) with
+format=columnar (shared fields hoisted, per-tile values as parallel
+arrays) and columnar with a trimmed ?fields= selection, at map scales.
+Parse time is orjson.loads and json.loads of the body (JSON.parse in the
+browser behaves like the latter).
+
+Usage (from backend/):
+    python benchmarks/bench_tile_payload.py
+    python benchmarks/bench_tile_payload.py --sizes 25,2500 --repeat 20
+"""
+
+import argparse
+import gzip
+import json
+import os
+import random
+import sys
+import timeit
+from datetime import datetime
+
+import orjson
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database.repository import TILE_FIELDS, TILE_SHARED_FIELDS
+from responses import columnar, dumps
+
+MAP_FIELDS = ["region", "ndvi_value", "latitude", "longitude"]
+
+
+def tile(i: int) -> dict:
+    return {
+        "country": "IN", "crop": "wheat", "region": f"Tile_{i // 500}_{i % 500}", "type": "NDVI",
+        "ndvi_value": random.uniform(0.5, 0.8), "latitude": random.uniform(8, 35),
+        "longitude": random.uniform(68, 97), "area_km2": 10000.0, "confidence": 0.92,
+        "timestamp": datetime.utcnow(), "source": "sentinel-2"
+    }
+
+
+def envelope(**body) -> dict:
+    """/map/health page around the tile payload"""
+    return {"country": "IN", "crop": "wheat", **body, "next_cursor": None,
+            "timestamp": datetime.utcnow().isoformat()}
+
+
+def measure(label: str, body: bytes, repeat: int, baseline: int):
+    fast = min(timeit.repeat(lambda: orjson.loads(body), number=1, repeat=repeat)) * 1000
+    stdlib = min(timeit.repeat(lambda: json.loads(body), number=1, repeat=repeat)) * 1000
+    print(
+        f"  {label:<18} {len(body):>12,} B ({len(body) / baseline:5.0%})  gzip {len(gzip.compress(body)):>11,} B  "
+        f"parse orjson {fast:9.3f} ms  json {stdlib:9.3f} ms"
+    )
+
+
+def main(sizes, repeat: int):
+    for count in sizes:
+        tiles = [tile(i) for i in range(count)]
+        print(f"{count:,} tiles")
+        rows = dumps(envelope(tiles=tiles))
+        bodies = [
+            ("rows", rows),
+            ("columnar", dumps(envelope(**columnar(tiles, TILE_FIELDS, TILE_SHARED_FIELDS)))),
+            ("columnar+fields", dumps(envelope(**columnar(tiles, MAP_FIELDS, TILE_SHARED_FIELDS))))
+        ]
+        runs = max(3, repeat // max(1, count // 2500))
+        for label, body in bodies:
+            measure(label, body, runs, len(rows))
+    print(f"hoistable: {', '.join(TILE_SHARED_FIELDS)}; fields= {','.join(MAP_FIELDS)}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", default="25,2500,250000")
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+    main([int(size) for size in args.sizes.split(",")], args.repeat)
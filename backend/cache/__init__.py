@@ -0,0 +1,90 @@
+"""Caching layer for Macro-Data Fusion API reads"""
+
+import os
+
+from .ttl_cache import TTLCache
+from .singleflight import SingleFlight
+from .shared import SharedCache, TieredCache, publish_invalidation, INVALIDATION_CHANNEL
+
+# Latest fusion score per country/crop. Scores are rewritten once a day by
+# DataRefreshScheduler, and FusionScoreCalculator bumps entries on write.
+fusion_score_cache = TTLCache(
+    maxsize=int(os.getenv("FUSION_CACHE_MAXSIZE", "1024")),
+    ttl=float(os.getenv("FUSION_CACHE_TTL_SECONDS", "900"))
+)
+
+# Tile, weather and news reads for the other dashboard endpoints
+api_read_cache = TTLCache(
+    maxsize=int(os.getenv("API_CACHE_MAXSIZE", "1024")),
+    ttl=float(os.getenv("API_CACHE_TTL_SECONDS", "900"))
+)
+
+# Optional cross-worker tier, disabled when REDIS_URL is unset
+REDIS_URL = os.getenv("REDIS_URL")
+shared_cache = SharedCache(REDIS_URL)
+
+# Per-endpoint TTLs (seconds), keyed by cache namespace
+CACHE_TTLS = {
+    "fusion_score": float(os.getenv("CACHE_TTL_FUSION_SCORE", "900")),
+    "crop_health": float(os.getenv("CACHE_TTL_CROP_HEALTH", "900")),
+    "weather_forecast": float(os.getenv("CACHE_TTL_WEATHER", "1800")),
+    "news_risk": float(os.getenv("CACHE_TTL_NEWS", "600")),
+    # Keys carry the latest price date, so new prices miss regardless
+    "price_forecast": float(os.getenv("CACHE_TTL_PRICE_FORECAST", "86400")),
+    # Keys carry the first open period and the commodities data version
+    "price_bars": float(os.getenv("CACHE_TTL_PRICE_BARS", "2592000")),
+    # Short: ETags are derived from these counters
+    "data_versions": float(os.getenv("CACHE_TTL_DATA_VERSIONS", "15"))
+}
+
+
+def fusion_score_key(country: str, crop: str) -> str:
+    """Cache key for the latest fusion score of a country/crop pair"""
+    return f"fusion_score:{country}:{crop}"
+
+
+def crop_health_key(country: str, crop: str) -> str:
+    return f"crop_health:{country}:{crop}"
+
+
+def weather_forecast_key(country: str, days: int) -> str:
+    return f"weather_forecast:{country}:{days}"
+
+
+def news_risk_key(country: str) -> str:
+    return f"news_risk:{country}"
+
+
+def price_forecast_key(commodity: str, days_ahead: int, model: str, latest_date: str) -> str:
+    """Cache key for one model run over a price history ending at latest_date"""
+    return f"price_forecast:{commodity}:{days_ahead}:{model}:{latest_date}"
+
+
+def price_bars_key(commodity: str, interval: str, closed_before: str, version: int) -> str:
+    """Cache key for the closed OHLC bars of a commodity before closed_before, at a data version"""
+    return f"price_bars:{commodity}:{interval}:{closed_before}:{version}"
+
+
+DATA_VERSIONS_KEY = "data_versions"
+
+
+__all__ = [
+    'TTLCache',
+    'SingleFlight',
+    'SharedCache',
+    'TieredCache',
+    'publish_invalidation',
+    'INVALIDATION_CHANNEL',
+    'fusion_score_cache',
+    'api_read_cache',
+    'shared_cache',
+    'CACHE_TTLS',
+    'REDIS_URL',
+    'fusion_score_key',
+    'crop_health_key',
+    'weather_forecast_key',
+    'news_risk_key',
+    'price_forecast_key',
+    'price_bars_key',
+    'DATA_VERSIONS_KEY'
+]
@@ -0,0 +1,213 @@
+"""
+Shared second cache tier backed by a Redis-protocol store
+
+Every uvicorn worker keeps its own TTLCache; this tier sits behind it so a
+value loaded by one worker is reused by the others. The scheduler deletes
+refreshed keys and publishes their prefixes on INVALIDATION_CHANNEL so
+workers drop the matching in-process entries as well.
+
+The tier is optional: without REDIS_URL, without the redis package, or
+while the store is unreachable, reads fall back to the in-process tier.
+"""
+
+import asyncio
+import logging
+import time
+from typing import Any, Awaitable, Callable, Iterable, Optional
+
+from bson import json_util
+
+from .singleflight import SingleFlight
+from .ttl_cache import TTLCache
+
+try:
+    import redis
+    import redis.asyncio as aioredis
+except ImportError:  # optional dependency
+    redis = None
+    aioredis = None
+
+logger = logging.getLogger(__name__)
+
+INVALIDATION_CHANNEL = "macro_data_fusion:invalidate"
+KEY_PREFIX = "mdf:"
+
+
+def serialize(value: Any) -> bytes:
+    """Extended JSON keeps datetimes intact across the round trip"""
+    return json_util.dumps(value).encode("utf-8")
+
+
+def deserialize(payload: bytes) -> Any:
+    return json_util.loads(payload)
+
+
+class SharedCache:
+    """Async client for the shared tier with a circuit breaker"""
+
+    def __init__(self, url: Optional[str], retry_after: float = 30.0,
+                 socket_timeout: float = 0.25):
+        """
+        Args:
+            url: redis:// URL, None disables the tier
+            retry_after: Seconds to stay in fallback mode after an error
+            socket_timeout: Per-command timeout so a dead store adds little latency
+        """
+        self.url = url
+        self.retry_after = retry_after
+        self._down_until = 0.0
+        self._client = None
+
+        if url and aioredis is None:
+            logger.warning("REDIS_URL is set but the redis package is not installed; shared cache disabled")
+        elif url:
+            self._client = aioredis.from_url(
+                url,
+                socket_timeout=socket_timeout,
+                socket_connect_timeout=socket_timeout
+            )
+
+        self.hits = 0
+        self.misses = 0
+        self.errors = 0
+
+    @property
+    def available(self) -> bool:
+        return self._client is not None and time.monotonic() >= self._down_until
+
+    def _mark_down(self, error: Exception):
+        self.errors += 1
+        self._down_until = time.monotonic() + self.retry_after
+        logger.warning(f"Shared cache unavailable, using in-process tier for {self.retry_after:.0f}s: {str(error)}")
+
+    async def get(self, key: str) -> Any:
+        """Cached value, or None on a miss or while the store is down"""
+        if not self.available:
+            return None
+        try:
+            payload = await self._client.get(KEY_PREFIX + key)
+        except Exception as e:
+            self._mark_down(e)
+            return None
+
+        if payload is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return deserialize(payload)
+
+    async def set(self, key: str, value: Any, ttl: float):
+        if not self.available:
+            return
+        try:
+            await self._client.set(KEY_PREFIX + key, serialize(value), ex=max(1, int(ttl)))
+        except Exception as e:
+            self._mark_down(e)
+
+    async def listen_for_invalidations(self, local_caches: Iterable[TTLCache],
+                                       derived_caches: Iterable[TTLCache] = ()):
+        """
+        Drop in-process entries whose keys match published prefixes
+
+        derived_caches hold values built from the local caches under other
+        keys (rendered bodies) and are cleared on every message.
+        Runs until cancelled, resubscribing after connection errors.
+        """
+        if self._client is None:
+            return
+
+        local_caches = list(local_caches)
+        derived_caches = list(derived_caches)
+        while True:
+            try:
+                pubsub = self._client.pubsub()
+                await pubsub.subscribe(INVALIDATION_CHANNEL)
+                logger.info(f"Subscribed to {INVALIDATION_CHANNEL}")
+                async for message in pubsub.listen():
+                    if message["type"] != "message":
+                        continue
+                    prefix = message["data"].decode("utf-8")
+                    for local in local_caches:
+                        local.invalidate_prefix(prefix)
+                    for derived in derived_caches:
+                        derived.clear()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                # Entries written while disconnected still expire by TTL
+                logger.warning(f"Invalidation listener error: {str(e)}")
+                await asyncio.sleep(self.retry_after)
+
+    def stats(self) -> dict:
+        return {
+            "enabled": self._client is not None,
+            "available": self.available,
+            "hits": self.hits,
+            "misses": self.misses,
+            "errors": self.errors
+        }
+
+    async def close(self):
+        if self._client is not None:
+            await self._client.aclose()
+
+
+class TieredCache:
+    """
+    Read-through lookup: in-process tier, then shared tier, then loader
+
+    Concurrent misses for the same key are coalesced, so one expiry
+    triggers one shared-tier read and at most one loader call per worker.
+    """
+
+    def __init__(self, local: TTLCache, shared: SharedCache, flight: Optional[SingleFlight] = None):
+        self.local = local
+        self.shared = shared
+        self.flight = flight or SingleFlight()
+
+    async def get_or_load(self, key: str, loader: Callable[[], Awaitable[Any]], ttl: float) -> Any:
+        """
+        Return the cached value for key, loading and populating both tiers
+        on a miss. Empty results (None, [], {}) are not cached.
+        """
+        value = self.local.get(key)
+        if value is not None:
+            return value
+        return await self.flight.do(key, lambda: self._load(key, loader, ttl))
+
+    async def _load(self, key: str, loader: Callable[[], Awaitable[Any]], ttl: float) -> Any:
+        value = await self.shared.get(key)
+        if value is not None:
+            self.local.set(key, value, ttl=ttl)
+            return value
+
+        value = await loader()
+        if value:
+            self.local.set(key, value, ttl=ttl)
+            await self.shared.set(key, value, ttl)
+        return value
+
+
+def publish_invalidation(url: Optional[str], prefixes: Iterable[str]) -> int:
+    """
+    Delete shared keys under each prefix and notify API workers
+
+    Synchronous so the scheduler can call it between refresh phases.
+    Returns the number of shared keys deleted; never raises.
+    """
+    if not url or redis is None:
+        return 0
+
+    deleted = 0
+    try:
+        client = redis.Redis.from_url(url, socket_timeout=2, socket_connect_timeout=2)
+        for prefix in prefixes:
+            keys = list(client.scan_iter(match=f"{KEY_PREFIX}{prefix}*", count=500))
+            if keys:
+                deleted += client.delete(*keys)
+            client.publish(INVALIDATION_CHANNEL, prefix)
+        client.close()
+    except Exception as e:
+        logger.warning(f"Cache invalidation publish failed: {str(e)}")
+
+    return deleted
@@ -0,0 +1,23 @@
+"""MongoDB access layer for Macro-Data Fusion platform"""
+
+from .repository import MacroDataRepository
+from .indexes import ensure_indexes, find_collection_scans, bootstrap_indexes
+from .versions import bump_version, VERSIONS_COLLECTION
+from .leaderboard import update_leaderboard, LEADERBOARD_COLLECTION
+from .connection import create_async_client, create_sync_client, get_database, mongo_uri, mongo_db_name
+
+__all__ = [
+    'MacroDataRepository',
+    'ensure_indexes',
+    'find_collection_scans',
+    'bootstrap_indexes',
+    'bump_version',
+    'VERSIONS_COLLECTION',
+    'update_leaderboard',
+    'LEADERBOARD_COLLECTION',
+    'create_async_client',
+    'create_sync_client',
+    'get_database',
+    'mongo_uri',
+    'mongo_db_name'
+]
@@ -0,0 +1,61 @@
+"""
+MongoDB client construction shared by the API and the schedulers
+
+Connection string, database name, pool sizes and timeouts come from the
+environment so every process talks to MongoDB with the same settings.
+They are read when a client is built, not at import, so values loaded
+from .env by the entry points after their imports still apply.
+Callers own the client: create it when the process starts, close it on
+shutdown.
+"""
+
+import os
+from typing import Dict
+
+from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import MongoClient
+
+
+def mongo_uri() -> str:
+    return os.getenv("MONGODB_URI", "mongodb://localhost:27017")
+
+
+def mongo_db_name() -> str:
+    return os.getenv("MONGODB_DB_NAME", "macro_data_fusion")
+
+
+def client_options(**overrides) -> Dict:
+    """
+    Pool and timeout settings for MongoClient / AsyncIOMotorClient
+
+    overrides (e.g. event_listeners, minPoolSize) win over the environment.
+    """
+    options = {
+        "maxPoolSize": int(os.getenv("MONGO_MAX_POOL_SIZE", "50")),
+        "minPoolSize": int(os.getenv("MONGO_MIN_POOL_SIZE", "5")),
+        "maxIdleTimeMS": int(os.getenv("MONGO_MAX_IDLE_TIME_MS", "300000")),
+        # Fail fast instead of hanging requests when MongoDB is unreachable
+        "serverSelectionTimeoutMS": int(os.getenv("MONGO_SERVER_SELECTION_TIMEOUT_MS", "5000")),
+        "connectTimeoutMS": int(os.getenv("MONGO_CONNECT_TIMEOUT_MS", "5000")),
+        "socketTimeoutMS": int(os.getenv("MONGO_SOCKET_TIMEOUT_MS", "30000")),
+        # Bounded wait for a pooled connection under load
+        "waitQueueTimeoutMS": int(os.getenv("MONGO_WAIT_QUEUE_TIMEOUT_MS", "2000")),
+        "appname": os.getenv("MONGO_APP_NAME", "macro-data-fusion")
+    }
+    options.update(overrides)
+    return options
+
+
+def create_async_client(**overrides) -> AsyncIOMotorClient:
+    """Motor client for the API event loop"""
+    return AsyncIOMotorClient(mongo_uri(), **client_options(**overrides))
+
+
+def create_sync_client(**overrides) -> MongoClient:
+    """pymongo client for the schedulers and other synchronous jobs"""
+    return MongoClient(mongo_uri(), **client_options(**overrides))
+
+
+def get_database(client):
+    """The platform database on either client type"""
+    return client[mongo_db_name()]
@@ -0,0 +1,82 @@
+"""
+Viewport helpers for geospatial tile queries
+
+NDVI tiles carry a GeoJSON geometry (the tile's bounding polygon) indexed
+with 2dsphere. A map viewport arrives as bbox=min_lon,min_lat,max_lon,max_lat
+and is turned into a $geoIntersects polygon. Below MAP_DETAIL_MIN_ZOOM,
+tiles are averaged into grid cells sized to the zoom level instead of
+being sent at full resolution.
+"""
+
+import math
+import os
+from typing import Dict, Optional, Tuple
+
+# Zoom at which individual tiles are returned; lower zooms get grid cells
+MAP_DETAIL_MIN_ZOOM = int(os.getenv("MAP_DETAIL_MIN_ZOOM", "6"))
+# Grid cells per 256 px web-map tile width when aggregating
+CELLS_PER_MAP_TILE = 4
+# Tiles or cells returned for one viewport unless ?limit= asks for fewer
+MAP_VIEWPORT_LIMIT = int(os.getenv("MAP_VIEWPORT_LIMIT", "1000"))
+
+# Fields of an aggregated grid cell
+CELL_FIELDS = ["latitude", "longitude", "ndvi_value", "tile_count", "timestamp"]
+
+# Winding-aware CRS so viewports wider than a hemisphere stay valid polygons
+STRICT_WINDING_CRS = {"type": "name", "properties": {"name": "urn:x-mongodb:crs:strictwinding:EPSG:4326"}}
+
+BBox = Tuple[float, float, float, float]
+
+
+def parse_bbox(value: str) -> BBox:
+    """
+    (min_lon, min_lat, max_lon, max_lat) from "min_lon,min_lat,max_lon,max_lat"
+
+    Raises:
+        ValueError: on malformed, out-of-range or antimeridian-crossing boxes
+    """
+    try:
+        min_lon, min_lat, max_lon, max_lat = (float(part) for part in value.split(","))
+    except ValueError:
+        raise ValueError("bbox must be min_lon,min_lat,max_lon,max_lat")
+
+    if not (-180 <= min_lon < max_lon <= 180 and -90 <= min_lat < max_lat <= 90):
+        raise ValueError("bbox must satisfy -180 <= min_lon < max_lon <= 180 and -90 <= min_lat < max_lat <= 90")
+    return min_lon, min_lat, max_lon, max_lat
+
+
+def bbox_polygon(bbox: BBox) -> Dict:
+    """Counter-clockwise GeoJSON polygon for a bbox"""
+    min_lon, min_lat, max_lon, max_lat = bbox
+    # -180 and 180 are the same meridian; keep the ring non-degenerate
+    max_lon = min(max_lon, min_lon + 359.999)
+    return {
+        "type": "Polygon",
+        "coordinates": [[
+            [min_lon, min_lat], [max_lon, min_lat], [max_lon, max_lat], [min_lon, max_lat], [min_lon, min_lat]
+        ]],
+        "crs": STRICT_WINDING_CRS
+    }
+
+
+def tile_geometry(min_lat: float, max_lat: float, min_lon: float, max_lon: float) -> Dict:
+    """GeoJSON polygon of one NDVI tile, as stored on satellites documents"""
+    return {
+        "type": "Polygon",
+        "coordinates": [[
+            [min_lon, min_lat], [max_lon, min_lat], [max_lon, max_lat], [min_lon, max_lat], [min_lon, min_lat]
+        ]]
+    }
+
+
+def zoom_for_bbox(bbox: BBox) -> int:
+    """Web-map zoom at which the bbox spans about one 256 px tile"""
+    width = bbox[2] - bbox[0]
+    return max(0, min(22, int(math.floor(math.log2(360 / width)))))
+
+
+def cell_degrees(zoom: int) -> Optional[float]:
+    """Aggregation cell size for a zoom, None when tiles are shown individually"""
+    if zoom >= MAP_DETAIL_MIN_ZOOM:
+        return None
+    return 360 / (2 ** zoom) / CELLS_PER_MAP_TILE
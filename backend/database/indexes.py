@@ -0,0 +1,232 @@
+"""
+Index bootstrap for the macro_data_fusion collections
+
+Declares one index per query shape and upsert filter used by the API and
+the ingestors, plus the TTL index behind fusion_scores.expires_at.
+ensure_indexes() is idempotent and runs at API and scheduler startup;
+it also drops indexes that a wider declared index has replaced.
+"""
+
+import logging
+from datetime import datetime
+from typing import Dict, List
+
+from pymongo import ASCENDING, DESCENDING, GEOSPHERE, IndexModel
+from pymongo.errors import OperationFailure
+
+from .leaderboard import LEADERBOARD_COLLECTION, seed_leaderboard
+
+logger = logging.getLogger(__name__)
+
+
+INDEXES = {
+    "fusion_scores": [
+        # GET /fusion-score, FusionScoreCalculator upsert + history
+        IndexModel([("country", ASCENDING), ("crop", ASCENDING), ("timestamp", DESCENDING)],
+                   name="country_crop_timestamp"),
+        # Documents carry expires_at = write time + 1 day
+        IndexModel([("expires_at", ASCENDING)], name="expires_at_ttl", expireAfterSeconds=0),
+    ],
+    LEADERBOARD_COLLECTION: [
+        # FusionScoreCalculator upsert filter (one entry per pair)
+        IndexModel([("country", ASCENDING), ("crop", ASCENDING)], name="country_crop", unique=True),
+        # GET /fusion-score/top, read from either end
+        IndexModel([("fusion_score", ASCENDING), ("country", ASCENDING), ("crop", ASCENDING)],
+                   name="fusion_score_country_crop"),
+        # Entries expire with the fusion score they mirror
+        IndexModel([("expires_at", ASCENDING)], name="expires_at_ttl", expireAfterSeconds=0),
+    ],
+    "satellites": [
+        # GET /map/health, keyset pages on (timestamp, _id)
+        IndexModel([("country", ASCENDING), ("crop", ASCENDING), ("type", ASCENDING),
+                    ("timestamp", DESCENDING), ("_id", DESCENDING)],
+                   name="country_crop_type_timestamp_id"),
+        # Sentinel2Ingestor upsert filter
+        IndexModel([("country", ASCENDING), ("region", ASCENDING), ("type", ASCENDING)],
+                   name="country_region_type"),
+        # GET /map/health?bbox= (tile footprints intersecting the viewport)
+        IndexModel([("country", ASCENDING), ("crop", ASCENDING), ("type", ASCENDING), ("geometry", GEOSPHERE)],
+                   name="country_crop_type_geometry"),
+    ],
+    "ndvi_history": [
+        # GET /charts/ndvi and Sentinel2Ingestor upsert filter (one point per tile per day)
+        IndexModel([("country", ASCENDING), ("crop", ASCENDING), ("region", ASCENDING), ("date", DESCENDING)],
+                   name="country_crop_region_date", unique=True),
+    ],
+    "weather": [
+        # GET /weather/forecast (keyset pages on (date, _id)) and WeatherIngestor upsert filter
+        IndexModel([("country", ASCENDING), ("date", DESCENDING), ("_id", DESCENDING)], name="country_date_id"),
+        # GET /sync (documents written since a mark)
+        IndexModel([("country", ASCENDING), ("timestamp", ASCENDING)], name="country_timestamp"),
+    ],
+    "commodities": [
+        # POST /predict-price, GET /commodities/{commodity}/bars and CommodityIngestor upsert filter
+        IndexModel([("commodity", ASCENDING), ("date", DESCENDING)], name="commodity_date"),
+        # GET /sync
+        IndexModel([("commodity", ASCENDING), ("timestamp", ASCENDING)], name="commodity_timestamp"),
+    ],
+    "news": [
+        # GET /news-risk
+        IndexModel([("country", ASCENDING), ("date", DESCENDING)], name="country_date"),
+        # NewsIngestor upsert filter
+        IndexModel([("country", ASCENDING), ("title", ASCENDING)], name="country_title"),
+        # GET /sync
+        IndexModel([("country", ASCENDING), ("timestamp", ASCENDING)], name="country_timestamp"),
+    ],
+}
+
+# Indexes created by earlier releases and now covered by a declared index
+# with the same leading keys; dropped once their replacement exists
+SUPERSEDED_INDEXES = {
+    "satellites": ["country_crop_type_timestamp"],
+    "weather": ["country_date"],
+}
+
+# Representative query shapes, explained after bootstrap to catch COLLSCANs
+QUERY_SHAPES = [
+    {"name": "GET /fusion-score", "collection": "fusion_scores",
+     "filter": {"country": "IN", "crop": "wheat"}, "sort": [("timestamp", -1)]},
+    {"name": "GET /fusion-score/top", "collection": LEADERBOARD_COLLECTION,
+     "filter": {}, "sort": [("fusion_score", 1), ("country", 1), ("crop", 1)]},
+    {"name": "GET /map/health", "collection": "satellites",
+     "filter": {"country": "IN", "crop": "wheat", "type": "NDVI"}, "sort": [("timestamp", -1), ("_id", -1)]},
+    {"name": "GET /map/health?bbox", "collection": "satellites",
+     "filter": {"country": "IN", "crop": "wheat", "type": "NDVI",
+                "geometry": {"$geoIntersects": {"$geometry": {
+                    "type": "Polygon", "coordinates": [[[70, 10], [80, 10], [80, 20], [70, 20], [70, 10]]]}}}},
+     "sort": [("timestamp", -1)]},
+    {"name": "GET /charts/ndvi", "collection": "ndvi_history",
+     "filter": {"country": "IN", "crop": "wheat", "region": "Tile_0_0"}, "sort": [("date", -1)]},
+    {"name": "GET /weather/forecast", "collection": "weather",
+     "filter": {"country": "IN"}, "sort": [("date", -1), ("_id", -1)]},
+    {"name": "POST /predict-price", "collection": "commodities",
+     "filter": {"commodity": "wheat"}, "sort": [("date", -1)]},
+    {"name": "GET /commodities/{commodity}/bars", "collection": "commodities",
+     "filter": {"commodity": "wheat", "date": {"$gte": datetime(2024, 1, 1)}}, "sort": [("date", 1)]},
+    {"name": "GET /news-risk", "collection": "news",
+     "filter": {"country": "IN"}, "sort": [("date", -1)]},
+    {"name": "GET /sync weather", "collection": "weather",
+     "filter": {"country": "IN", "timestamp": {"$gt": datetime(2024, 1, 1)}}, "sort": [("timestamp", 1)]},
+    {"name": "GET /sync prices", "collection": "commodities",
+     "filter": {"commodity": "wheat", "timestamp": {"$gt": datetime(2024, 1, 1)}}, "sort": [("timestamp", 1)]},
+    {"name": "GET /sync news", "collection": "news",
+     "filter": {"country": "IN", "timestamp": {"$gt": datetime(2024, 1, 1)}}, "sort": [("timestamp", 1)]},
+    {"name": "upsert fusion_scores", "collection": "fusion_scores",
+     "filter": {"country": "IN", "crop": "wheat"}, "sort": None},
+    {"name": "upsert satellites", "collection": "satellites",
+     "filter": {"country": "IN", "region": "Tile_0_0", "type": "NDVI"}, "sort": None},
+    {"name": "upsert weather", "collection": "weather",
+     "filter": {"country": "IN", "date": datetime(2024, 1, 1)}, "sort": None},
+    {"name": "upsert commodities", "collection": "commodities",
+     "filter": {"commodity": "wheat", "date": datetime(2024, 1, 1)}, "sort": None},
+    {"name": "upsert news", "collection": "news",
+     "filter": {"country": "IN", "title": ""}, "sort": None},
+]
+
+
+def ensure_indexes(db) -> Dict[str, List[str]]:
+    """
+    Create every declared index (no-op for indexes that already exist)
+
+    Args:
+        db: pymongo database
+
+    Returns:
+        {collection: [index names]} for the indexes now in place
+    """
+    created = {}
+    for collection_name, indexes in INDEXES.items():
+        try:
+            created[collection_name] = db[collection_name].create_indexes(indexes)
+        except OperationFailure as e:
+            # Same name or keys with different options, e.g. an old TTL value
+            logger.error(f"Index creation failed on {collection_name}: {str(e)}")
+            created[collection_name] = []
+
+    for collection_name, names in SUPERSEDED_INDEXES.items():
+        # Keep the old index while its replacement is missing
+        if not created.get(collection_name):
+            continue
+        for name in names:
+            try:
+                db[collection_name].drop_index(name)
+                logger.info(f"Dropped superseded index {collection_name}.{name}")
+            except OperationFailure:
+                # Never created, or already dropped by another process
+                pass
+
+    logger.info(f"Indexes ensured on {len(created)} collections")
+    return created
+
+
+def find_collection_scans(db) -> List[str]:
+    """
+    Explain each query shape and return the names of those whose winning
+    plan still contains a COLLSCAN stage
+    """
+    scans = []
+    for shape in QUERY_SHAPES:
+        cursor = db[shape["collection"]].find(shape["filter"])
+        if shape["sort"]:
+            cursor = cursor.sort(shape["sort"])
+
+        try:
+            plan = cursor.explain()["queryPlanner"]["winningPlan"]
+        except (OperationFailure, KeyError) as e:
+            logger.warning(f"Could not explain {shape['name']}: {str(e)}")
+            continue
+
+        if "COLLSCAN" in _plan_stages(plan):
+            logger.warning(f"Query shape '{shape['name']}' falls back to a collection scan")
+            scans.append(shape["name"])
+
+    return scans
+
+
+def backfill_tile_geometry(db) -> int:
+    """
+    Give satellites documents written before tiles carried a footprint a
+    Point geometry at their center, so viewport queries can find them
+
+    Sentinel2Ingestor replaces these with the tile polygon on its next run.
+
+    Returns:
+        Number of documents updated
+    """
+    result = db["satellites"].update_many(
+        {"geometry": {"$exists": False}, "longitude": {"$type": "number"}, "latitude": {"$type": "number"}},
+        [{"$set": {"geometry": {"type": "Point", "coordinates": ["$longitude", "$latitude"]}}}]
+    )
+    if result.modified_count:
+        logger.info(f"Backfilled geometry on {result.modified_count} satellites documents")
+    return result.modified_count
+
+
+def bootstrap_indexes(db) -> List[str]:
+    """Ensure indexes, then report query shapes still doing collection scans"""
+    ensure_indexes(db)
+    backfill_tile_geometry(db)
+    seed_leaderboard(db)
+    return find_collection_scans(db)
+
+
+def _plan_stages(plan: Dict) -> List[str]:
+    """Flatten the stage names of an explain() plan tree"""
+    stages = [plan.get("stage", "")]
+    # Newer servers wrap the classic plan under queryPlan (SBE engine)
+    children = [plan["queryPlan"]] if "queryPlan" in plan else []
+    children += [plan["inputStage"]] if "inputStage" in plan else []
+    children += plan.get("inputStages", [])
+    for child in children:
+        stages.extend(_plan_stages(child))
+    return stages
+
+
+if __name__ == "__main__":
+    import os
+    from pymongo import MongoClient
+
+    logging.basicConfig(level=logging.INFO)
+    client = MongoClient(os.getenv("MONGODB_URI", "mongodb://localhost:27017"))
+    remaining = bootstrap_indexes(client["macro_data_fusion"])
+    print("Collection scans:", ", ".join(remaining) if remaining else "none")
@@ -0,0 +1,57 @@
+"""
+Cross-region fusion score leaderboard
+
+fusion_leaderboard holds one small document per country/crop pair with
+its latest score, upserted by FusionScoreCalculator.save_fusion_score
+alongside the full fusion_scores document. The (fusion_score, country,
+crop) index keeps it ordered, so /fusion-score/top reads k index entries
+from either end instead of scanning fusion_scores, however many pairs
+there are. Entries carry the score's expires_at and expire with it.
+"""
+
+import logging
+from typing import Dict
+
+logger = logging.getLogger(__name__)
+
+LEADERBOARD_COLLECTION = "fusion_leaderboard"
+LEADERBOARD_FIELDS = ["country", "crop", "fusion_score", "risk_level", "confidence", "timestamp", "expires_at"]
+
+
+def update_leaderboard(db, document: Dict) -> None:
+    """Upsert the leaderboard entry of a saved fusion score (never raises)"""
+    entry = {field: document[field] for field in LEADERBOARD_FIELDS if field in document}
+    try:
+        db[LEADERBOARD_COLLECTION].update_one(
+            {"country": document["country"], "crop": document["crop"]},
+            {"$set": entry},
+            upsert=True
+        )
+    except Exception as e:
+        # The entry is corrected by the pair's next save
+        logger.warning(f"Could not update leaderboard for {document['country']}/{document['crop']}: {str(e)}")
+
+
+def seed_leaderboard(db) -> int:
+    """
+    Fill an empty leaderboard from the latest fusion_scores of each pair
+
+    One-off for databases written before the leaderboard existed.
+
+    Returns:
+        Number of pairs seeded (0 when the leaderboard already has entries)
+    """
+    if db[LEADERBOARD_COLLECTION].find_one({}, {"_id": 1}) is not None:
+        return 0
+
+    db["fusion_scores"].aggregate([
+        {"$sort": {"country": 1, "crop": 1, "timestamp": -1}},
+        {"$group": {"_id": {"country": "$country", "crop": "$crop"},
+                    **{field: {"$first": f"${field}"} for field in LEADERBOARD_FIELDS}}},
+        {"$project": {"_id": 0}},
+        {"$merge": {"into": LEADERBOARD_COLLECTION, "on": ["country", "crop"],
+                    "whenMatched": "keepExisting", "whenNotMatched": "insert"}}
+    ])
+    seeded = db[LEADERBOARD_COLLECTION].count_documents({})
+    logger.info(f"Seeded fusion leaderboard with {seeded} pairs")
+    return seeded
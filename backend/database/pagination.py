@@ -0,0 +1,61 @@
+"""
+Keyset (cursor) pagination helpers
+
+Pages are ordered by (sort_field desc, _id desc). A cursor encodes the sort
+value and _id of the last document served; the next page starts strictly
+after it, so deep pages cost the same index seek as the first one.
+"""
+
+import base64
+from datetime import datetime
+from typing import Any, Dict, Optional, Tuple
+
+import orjson
+from bson import ObjectId
+from bson.errors import InvalidId
+
+
+def encode_cursor(document: Dict, sort_field: str) -> str:
+    """Opaque URL-safe token for the position just after document"""
+    value = document[sort_field]
+    payload = {
+        "v": value.isoformat() if isinstance(value, datetime) else value,
+        "d": isinstance(value, datetime),
+        "id": str(document["_id"])
+    }
+    return base64.urlsafe_b64encode(orjson.dumps(payload)).decode("ascii").rstrip("=")
+
+
+def decode_cursor(token: str) -> Tuple[Any, ObjectId]:
+    """
+    Returns (sort value, _id) from a cursor token
+
+    Raises:
+        ValueError: if the token is malformed
+    """
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        payload = orjson.loads(base64.urlsafe_b64decode(padded))
+        value = datetime.fromisoformat(payload["v"]) if payload["d"] else payload["v"]
+        return value, ObjectId(payload["id"])
+    except (ValueError, KeyError, TypeError, InvalidId) as e:
+        raise ValueError(f"Invalid cursor: {str(e)}")
+
+
+def keyset_filter(base_filter: Dict, sort_field: str, cursor: Optional[str]) -> Dict:
+    """Add the 'strictly after cursor' condition for a descending keyset"""
+    if not cursor:
+        return base_filter
+
+    value, last_id = decode_cursor(cursor)
+    return {
+        **base_filter,
+        "$or": [
+            {sort_field: {"$lt": value}},
+            {sort_field: value, "_id": {"$lt": last_id}}
+        ]
+    }
+
+
+def keyset_sort(sort_field: str) -> list:
+    return [(sort_field, -1), ("_id", -1)]
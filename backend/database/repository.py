@@ -0,0 +1,413 @@
+import asyncio
+import logging
+from datetime import datetime, timedelta
+from typing import AsyncIterator, Dict, Iterable, List, Optional, Tuple
+
+from .geo import BBox, bbox_polygon
+from .leaderboard import LEADERBOARD_COLLECTION
+from .pagination import encode_cursor, keyset_filter, keyset_sort
+from .versions import VERSIONS_COLLECTION
+
+logger = logging.getLogger(__name__)
+
+
+# Fields each read returns, pushed to MongoDB as projections so _id and any
+# extra stored fields never leave the server
+TILE_FIELDS = [
+    "country", "crop", "region", "type", "ndvi_value", "latitude", "longitude",
+    "area_km2", "confidence", "timestamp", "source"
+]
+# Vector tile features: footprint plus the attributes encoded in the tile
+TILE_FEATURE_FIELDS = ["region", "ndvi_value", "geometry", "timestamp"]
+# OHLC bar periods for /commodities/{commodity}/bars ($dateTrunc units)
+BAR_INTERVALS = ("week", "month")
+# Usually identical across a page of tiles; columnar responses send them once
+TILE_SHARED_FIELDS = ["country", "crop", "type", "source", "area_km2", "confidence"]
+WEATHER_FIELDS = [
+    "country", "city", "latitude", "longitude", "date", "temperature_min", "temperature_max",
+    "rainfall_mm", "humidity_percent", "wind_speed_kmh", "timestamp", "source"
+]
+PRICE_FIELDS = ["commodity", "date", "price_usd_per_ton", "volume_traded", "source", "timestamp"]
+NEWS_FIELDS = [
+    "country", "title", "summary", "link", "source", "date", "published_date",
+    "sentiment_score", "categories", "timestamp"
+]
+
+
+def projection(fields: List[str]) -> Dict:
+    """Inclusion projection for fields, excluding _id"""
+    return {"_id": 0, **{field: 1 for field in fields}}
+
+
+def period_start(moment: datetime, interval: str) -> datetime:
+    """Start of the week (Monday) or month containing moment, as $dateTrunc computes it in UTC"""
+    day = moment.replace(hour=0, minute=0, second=0, microsecond=0)
+    if interval == "week":
+        return day - timedelta(days=day.weekday())
+    if interval == "month":
+        return day.replace(day=1)
+    raise ValueError(f"interval must be one of {', '.join(BAR_INTERVALS)}")
+
+
+class MacroDataRepository:
+    """
+    Async read access to the macro_data_fusion collections
+
+    Wraps a Motor database so API handlers await their queries instead of
+    blocking the event loop with synchronous pymongo calls.
+    """
+
+    def __init__(self, db):
+        """
+        Args:
+            db: Motor database (AsyncIOMotorDatabase)
+        """
+        self.db = db
+        self.fusion_scores_collection = db["fusion_scores"]
+        self.satellites_collection = db["satellites"]
+        self.weather_collection = db["weather"]
+        self.commodities_collection = db["commodities"]
+        self.news_collection = db["news"]
+        self.versions_collection = db[VERSIONS_COLLECTION]
+        self.leaderboard_collection = db[LEADERBOARD_COLLECTION]
+
+    async def get_latest_fusion_score(self, country: str, crop: str) -> Optional[Dict]:
+        """Latest fusion score document for a country/crop pair"""
+        return await self.fusion_scores_collection.find_one(
+            {"country": country, "crop": crop},
+            {"_id": 0},
+            sort=[("timestamp", -1)]
+        )
+
+    async def get_latest_fusion_scores(self, pairs: Optional[Iterable[Tuple[str, str]]] = None) -> Dict[Tuple[str, str], Dict]:
+        """
+        Latest fusion score for many country/crop pairs in one aggregation
+
+        Args:
+            pairs: (country, crop) tuples, or None for every pair on record
+
+        Returns:
+            {(country, crop): compact score document}
+        """
+        match = {}
+        if pairs is not None:
+            pairs = list(pairs)
+            if not pairs:
+                return {}
+            match = {"$or": [{"country": country, "crop": crop} for country, crop in pairs]}
+
+        pipeline = [
+            {"$match": match},
+            # Same key order as the country_crop_timestamp index
+            {"$sort": {"country": 1, "crop": 1, "timestamp": -1}},
+            {"$group": {
+                "_id": {"country": "$country", "crop": "$crop"},
+                "fusion_score": {"$first": "$fusion_score"},
+                "risk_level": {"$first": "$risk_level"},
+                "confidence": {"$first": "$confidence"},
+                "components": {"$first": "$components"},
+                "timestamp": {"$first": "$timestamp"}
+            }}
+        ]
+
+        result = {}
+        async for item in self.fusion_scores_collection.aggregate(pipeline):
+            key = item.pop("_id")
+            result[(key["country"], key["crop"])] = item
+        return result
+
+    async def get_crop_health_tiles(self, country: str, crop: str, limit: int = 100) -> List[Dict]:
+        """Newest NDVI tiles for a country/crop pair"""
+        cursor = self.satellites_collection.find(
+            {"country": country, "crop": crop, "type": "NDVI"},
+            projection(TILE_FIELDS),
+            sort=[("timestamp", -1)],
+            limit=limit
+        )
+        return await self._to_list(cursor)
+
+    async def get_top_fusion_scores(self, k: int, ascending: bool = True) -> List[Dict]:
+        """
+        k country/crop pairs with the lowest (ascending) or highest fusion scores
+
+        Reads k entries from one end of the leaderboard index.
+        """
+        direction = 1 if ascending else -1
+        cursor = self.leaderboard_collection.find(
+            {},
+            {"_id": 0, "expires_at": 0},
+            sort=[("fusion_score", direction), ("country", direction), ("crop", direction)],
+            limit=k
+        )
+        return await self._to_list(cursor)
+
+    async def get_crop_health_page(self, country: str, crop: str, limit: int = 100,
+                                   cursor: Optional[str] = None) -> Dict:
+        """One keyset page of NDVI tiles ordered by (timestamp, _id) desc"""
+        return await self._keyset_page(
+            self.satellites_collection,
+            {"country": country, "crop": crop, "type": "NDVI"},
+            "timestamp", TILE_FIELDS, limit, cursor
+        )
+
+    def stream_crop_health_tiles(self, country: str, crop: str, limit: Optional[int] = None,
+                                 cursor: Optional[str] = None) -> AsyncIterator[Dict]:
+        """NDVI tiles yielded as the cursor produces them"""
+        return self._keyset_stream(
+            self.satellites_collection,
+            {"country": country, "crop": crop, "type": "NDVI"},
+            "timestamp", TILE_FIELDS, limit, cursor
+        )
+
+    async def get_tiles_in_bbox(self, country: str, crop: str, bbox: BBox, limit: int) -> List[Dict]:
+        """Newest NDVI tiles whose footprint intersects bbox"""
+        cursor = self.satellites_collection.find(
+            {
+                "country": country, "crop": crop, "type": "NDVI",
+                "geometry": {"$geoIntersects": {"$geometry": bbox_polygon(bbox)}}
+            },
+            projection(TILE_FIELDS),
+            sort=[("timestamp", -1)],
+            limit=limit
+        )
+        return await self._to_list(cursor)
+
+    async def get_tile_features(self, country: str, crop: str, bbox: BBox, limit: int) -> List[Dict]:
+        """NDVI tile footprints intersecting bbox, for vector tile encoding"""
+        cursor = self.satellites_collection.find(
+            {
+                "country": country, "crop": crop, "type": "NDVI",
+                "geometry": {"$geoIntersects": {"$geometry": bbox_polygon(bbox)}}
+            },
+            projection(TILE_FEATURE_FIELDS),
+            limit=limit
+        )
+        return await self._to_list(cursor)
+
+    async def get_tile_cells_in_bbox(self, country: str, crop: str, bbox: BBox,
+                                     cell: float, limit: int) -> List[Dict]:
+        """
+        NDVI tiles intersecting bbox averaged into cell x cell degree squares
+
+        Each result has the cell center as latitude/longitude, the mean
+        ndvi_value and the number of tiles it stands for. Past limit cells
+        the sparsest are dropped, so a capped viewport keeps its densest
+        cells; ties are broken by position to keep pages stable.
+        """
+        pipeline = [
+            {"$match": {
+                "country": country, "crop": crop, "type": "NDVI",
+                "geometry": {"$geoIntersects": {"$geometry": bbox_polygon(bbox)}}
+            }},
+            {"$group": {
+                "_id": {
+                    "x": {"$floor": {"$divide": ["$longitude", cell]}},
+                    "y": {"$floor": {"$divide": ["$latitude", cell]}}
+                },
+                "ndvi_value": {"$avg": "$ndvi_value"},
+                "tile_count": {"$sum": 1},
+                "timestamp": {"$max": "$timestamp"}
+            }},
+            {"$sort": {"tile_count": -1, "_id.y": 1, "_id.x": 1}},
+            {"$limit": limit},
+            {"$project": {
+                "_id": 0,
+                "latitude": {"$multiply": [{"$add": ["$_id.y", 0.5]}, cell]},
+                "longitude": {"$multiply": [{"$add": ["$_id.x", 0.5]}, cell]},
+                "ndvi_value": 1,
+                "tile_count": 1,
+                "timestamp": 1
+            }}
+        ]
+        return await self._to_list(self.satellites_collection.aggregate(pipeline))
+
+    async def get_weather_forecast(self, country: str, days: int = 30) -> List[Dict]:
+        """Most recent daily weather records for a country"""
+        cursor = self.weather_collection.find(
+            {"country": country},
+            projection(WEATHER_FIELDS),
+            sort=[("date", -1)],
+            limit=days
+        )
+        return await self._to_list(cursor)
+
+    async def get_weather_page(self, country: str, days: int = 30,
+                               cursor: Optional[str] = None) -> Dict:
+        """One keyset page of daily weather ordered by (date, _id) desc"""
+        return await self._keyset_page(
+            self.weather_collection, {"country": country},
+            "date", WEATHER_FIELDS, days, cursor
+        )
+
+    def stream_weather_forecast(self, country: str, days: Optional[int] = None,
+                                cursor: Optional[str] = None) -> AsyncIterator[Dict]:
+        """Daily weather records yielded as the cursor produces them"""
+        return self._keyset_stream(
+            self.weather_collection, {"country": country},
+            "date", WEATHER_FIELDS, days, cursor
+        )
+
+    async def get_price_history(self, commodity: str, limit: int = 365) -> List[Dict]:
+        """Daily commodity prices, newest first"""
+        cursor = self.commodities_collection.find(
+            {"commodity": commodity},
+            projection(PRICE_FIELDS),
+            sort=[("date", -1)],
+            limit=limit
+        )
+        return await self._to_list(cursor)
+
+    async def get_price_series_info(self, commodity: str, limit: int) -> Dict:
+        """
+        Latest price date and number of stored prices (capped at limit)
+
+        Both are answered from the commodity_date index without fetching
+        the series itself.
+        """
+        latest, points = await asyncio.gather(
+            self.commodities_collection.find_one(
+                {"commodity": commodity},
+                {"_id": 0, "date": 1},
+                sort=[("date", -1)]
+            ),
+            self.commodities_collection.count_documents({"commodity": commodity}, limit=limit)
+        )
+        return {
+            "latest_date": latest["date"] if latest else None,
+            "points": points
+        }
+
+    async def get_price_series(self, commodity: str, limit: int) -> List[Dict]:
+        """Up to limit most recent prices as {"date", "price"}, oldest first"""
+        cursor = self.commodities_collection.find(
+            {"commodity": commodity},
+            {"_id": 0, "date": 1, "price_usd_per_ton": 1},
+            sort=[("date", -1)],
+            limit=limit
+        )
+        history = await self._to_list(cursor)
+        return [{"date": item["date"], "price": item["price_usd_per_ton"]} for item in reversed(history)]
+
+    async def get_series(self, collection_name: str, base_filter: Dict, x_field: str, y_field: str,
+                         limit: int) -> List[Dict]:
+        """Up to limit most recent {x_field, y_field} points, oldest first"""
+        cursor = self.db[collection_name].find(
+            base_filter,
+            {"_id": 0, x_field: 1, y_field: 1},
+            sort=[(x_field, -1)],
+            limit=limit
+        )
+        points = await self._to_list(cursor)
+        points.reverse()
+        return points
+
+    async def get_price_bars(self, commodity: str, interval: str, start: Optional[datetime] = None,
+                             end: Optional[datetime] = None) -> List[Dict]:
+        """
+        Open/high/low/close/volume bars of daily prices per week or month
+
+        Computed by MongoDB over the commodity_date index. Bars cover
+        dates in [start, end) and are ordered by period_start.
+        """
+        date_range = {}
+        if start is not None:
+            date_range["$gte"] = start
+        if end is not None:
+            date_range["$lt"] = end
+        match = {"commodity": commodity, **({"date": date_range} if date_range else {})}
+
+        pipeline = [
+            {"$match": match},
+            # $first/$last below need the days in order
+            {"$sort": {"date": 1}},
+            {"$group": {
+                "_id": {"$dateTrunc": {"date": "$date", "unit": interval, "startOfWeek": "monday"}},
+                "open": {"$first": "$price_usd_per_ton"},
+                "high": {"$max": "$price_usd_per_ton"},
+                "low": {"$min": "$price_usd_per_ton"},
+                "close": {"$last": "$price_usd_per_ton"},
+                "volume": {"$sum": "$volume_traded"},
+                "days": {"$sum": 1}
+            }},
+            {"$sort": {"_id": 1}},
+            {"$project": {
+                "_id": 0, "period_start": "$_id",
+                "open": 1, "high": 1, "low": 1, "close": 1, "volume": 1, "days": 1
+            }}
+        ]
+        return await self._to_list(self.commodities_collection.aggregate(pipeline))
+
+    async def get_recent_news(self, country: str, limit: int = 20) -> List[Dict]:
+        """Latest news items with sentiment for a country"""
+        cursor = self.news_collection.find(
+            {"country": country},
+            projection(NEWS_FIELDS),
+            sort=[("date", -1)],
+            limit=limit
+        )
+        return await self._to_list(cursor)
+
+    async def get_changes(self, collection_name: str, base_filter: Dict, fields: List[str],
+                          since: datetime, until: datetime, limit: int) -> List[Dict]:
+        """Documents written in (since, until], oldest first, for delta sync"""
+        cursor = self.db[collection_name].find(
+            {**base_filter, "timestamp": {"$gt": since, "$lte": until}},
+            projection(fields),
+            sort=[("timestamp", 1)],
+            limit=limit
+        )
+        return await self._to_list(cursor)
+
+    async def get_data_versions(self) -> Dict[str, Dict]:
+        """{collection: {"version": int, "updated_at": datetime}} for every versioned collection"""
+        result = {}
+        async for item in self.versions_collection.find({}):
+            result[item.pop("_id")] = item
+        return result
+
+    async def ping(self) -> Dict:
+        """Round trip to the server, raises if MongoDB is unreachable"""
+        return await self.db.command("ismaster")
+
+    async def _keyset_page(self, collection, base_filter: Dict, sort_field: str,
+                           fields: List[str], limit: int, cursor: Optional[str]) -> Dict:
+        """
+        Fetch limit + 1 documents after cursor to learn whether another page exists
+
+        Returns:
+            {"items": [...], "next_cursor": token or None}
+        """
+        documents = await self._to_list(collection.find(
+            keyset_filter(base_filter, sort_field, cursor),
+            {**projection(fields), "_id": 1},
+            sort=keyset_sort(sort_field),
+            limit=limit + 1
+        ))
+
+        next_cursor = None
+        if len(documents) > limit:
+            documents = documents[:limit]
+            next_cursor = encode_cursor(documents[-1], sort_field)
+
+        for document in documents:
+            document.pop("_id", None)
+        return {"items": documents, "next_cursor": next_cursor}
+
+    async def _keyset_stream(self, collection, base_filter: Dict, sort_field: str,
+                             fields: List[str], limit: Optional[int], cursor: Optional[str],
+                             batch_size: int = 500) -> AsyncIterator[Dict]:
+        """Yield documents batch by batch; memory is bounded by batch_size"""
+        documents = collection.find(
+            keyset_filter(base_filter, sort_field, cursor),
+            projection(fields),
+            sort=keyset_sort(sort_field),
+            limit=limit or 0,
+            batch_size=batch_size
+        )
+        async for document in documents:
+            yield document
+
+    @staticmethod
+    async def _to_list(cursor) -> List[Dict]:
+        """Drain a Motor cursor (documents are already projected)"""
+        return [item async for item in cursor]
@@ -0,0 +1,130 @@
+"""
+Delta sync for offline-first clients
+
+A sync token records, per collection, the write-time high-water mark the
+client has seen. /sync returns the documents of one dashboard scope
+(country, crop, commodity) whose timestamp is past the mark, in columnar
+form.
+
+- Collections whose data version was last bumped before the mark are not
+  queried; their mark is carried over unchanged.
+- Only documents older than SYNC_SETTLE_SECONDS are served, so a batch
+  still being written is picked up whole by a later sync.
+- A missing, foreign or expired token, or more than SYNC_MAX_CHANGES
+  changes in one collection, answers full_snapshot_required with a fresh
+  token: the client reloads /dashboard, then syncs from that token.
+"""
+
+import asyncio
+import base64
+import hashlib
+import os
+from datetime import datetime, timedelta
+from typing import Dict, Optional
+
+import orjson
+
+from responses import columnar
+from .repository import NEWS_FIELDS, PRICE_FIELDS, TILE_FIELDS, TILE_SHARED_FIELDS, WEATHER_FIELDS
+
+SYNC_MAX_CHANGES = int(os.getenv("SYNC_MAX_CHANGES", "2000"))
+SYNC_MAX_AGE = timedelta(days=float(os.getenv("SYNC_MAX_AGE_DAYS", "7")))
+SYNC_SETTLE_SECONDS = float(os.getenv("SYNC_SETTLE_SECONDS", "120"))
+
+FUSION_SYNC_FIELDS = ["country", "crop", "fusion_score", "risk_level", "confidence", "components", "timestamp"]
+
+# name: (collection, scope filter builder, fields, fields hoisted when equal)
+SYNC_COLLECTIONS = {
+    "fusion_scores": ("fusion_scores", lambda s: {"country": s["country"], "crop": s["crop"]},
+                      FUSION_SYNC_FIELDS, ["country", "crop"]),
+    "tiles": ("satellites", lambda s: {"country": s["country"], "crop": s["crop"], "type": "NDVI"},
+              TILE_FIELDS, TILE_SHARED_FIELDS),
+    "weather": ("weather", lambda s: {"country": s["country"]},
+                WEATHER_FIELDS, ["country", "city", "latitude", "longitude", "source"]),
+    "prices": ("commodities", lambda s: {"commodity": s["commodity"]},
+               PRICE_FIELDS, ["commodity", "source"]),
+    "news": ("news", lambda s: {"country": s["country"]},
+             NEWS_FIELDS, ["country", "source"]),
+}
+
+
+def scope_id(scope: Dict) -> str:
+    """Short stable id of a (country, crop, commodity) scope"""
+    raw = "|".join(f"{key}={scope[key]}" for key in sorted(scope))
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()[:12]
+
+
+def encode_sync_token(scope: Dict, marks: Dict[str, datetime]) -> str:
+    """Opaque URL-safe token: scope id plus {name: high-water datetime}"""
+    payload = {
+        "s": scope_id(scope),
+        "c": {name: mark.isoformat() for name, mark in marks.items()}
+    }
+    return base64.urlsafe_b64encode(orjson.dumps(payload)).decode("ascii").rstrip("=")
+
+
+def decode_sync_token(token: str, scope: Dict) -> Optional[Dict[str, datetime]]:
+    """Marks from a token, or None when it is malformed or for another scope"""
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        payload = orjson.loads(base64.urlsafe_b64decode(padded))
+        if payload["s"] != scope_id(scope):
+            return None
+        marks = {name: datetime.fromisoformat(mark) for name, mark in payload["c"].items()}
+    except (ValueError, KeyError, TypeError):
+        return None
+    return marks if set(marks) == set(SYNC_COLLECTIONS) else None
+
+
+async def collect_changes(repository, scope: Dict, since: Optional[str], versions: Dict,
+                          now: Optional[datetime] = None) -> Dict:
+    """
+    Changes for scope since the token, and the token to send next time
+
+    Args:
+        repository: MacroDataRepository
+        scope: {"country", "crop", "commodity"}
+        since: Token from the previous sync, or None
+        versions: Current data versions ({collection: {"updated_at": datetime, ...}})
+        now: UTC time, injectable for tests
+    """
+    until = (now or datetime.utcnow()) - timedelta(seconds=SYNC_SETTLE_SECONDS)
+
+    def reset(reason: str) -> Dict:
+        marks = {name: until for name in SYNC_COLLECTIONS}
+        return {"full_snapshot_required": True, "reason": reason,
+                "token": encode_sync_token(scope, marks), "changes": {}}
+
+    marks = decode_sync_token(since, scope) if since else None
+    if marks is None:
+        return reset("invalid_token" if since else "no_token")
+    if min(marks.values()) < until - SYNC_MAX_AGE:
+        return reset("token_expired")
+
+    next_marks, pending = {}, []
+    for name, (collection, _, _, _) in SYNC_COLLECTIONS.items():
+        mark = marks[name]
+        # Writers bump after each batch: nothing newer than the mark has
+        # landed, or it is mid-batch and is picked up after the bump
+        last_write = versions.get(collection, {}).get("updated_at")
+        if mark >= until or (last_write is not None and last_write <= mark):
+            next_marks[name] = mark
+        else:
+            pending.append(name)
+
+    async def load(name: str):
+        collection, build_filter, fields, _ = SYNC_COLLECTIONS[name]
+        return await repository.get_changes(
+            collection, build_filter(scope), fields, marks[name], until, limit=SYNC_MAX_CHANGES + 1
+        )
+
+    changes = {}
+    for name, documents in zip(pending, await asyncio.gather(*(load(name) for name in pending))):
+        if len(documents) > SYNC_MAX_CHANGES:
+            return reset("too_many_changes")
+        if documents:
+            _, _, fields, hoistable = SYNC_COLLECTIONS[name]
+            changes[name] = columnar(documents, fields, hoistable)
+        next_marks[name] = until
+
+    return {"full_snapshot_required": False, "token": encode_sync_token(scope, next_marks), "changes": changes}
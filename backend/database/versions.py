@@ -0,0 +1,27 @@
+"""
+Per-collection data version counters
+
+Writers bump a counter in the data_versions collection after each batch;
+the API derives ETags from these counters so unchanged data can be
+answered with 304 Not Modified.
+"""
+
+import logging
+from datetime import datetime
+
+logger = logging.getLogger(__name__)
+
+VERSIONS_COLLECTION = "data_versions"
+
+
+def bump_version(db, collection_name: str) -> None:
+    """Increment the version of collection_name (never raises)"""
+    try:
+        db[VERSIONS_COLLECTION].update_one(
+            {"_id": collection_name},
+            {"$inc": {"version": 1}, "$set": {"updated_at": datetime.utcnow()}},
+            upsert=True
+        )
+    except Exception as e:
+        # A missed bump only delays 304s turning into 200s until the next write
+        logger.warning(f"Could not bump data version for {collection_name}: {str(e)}")
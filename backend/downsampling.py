@@ -0,0 +1,86 @@
+"""
+Largest-Triangle-Three-Buckets downsampling for chart endpoints
+
+A chart a few hundred pixels wide cannot show more points than it has
+pixels, so /charts/* reduce long daily series to at most max_points
+before serialization. LTTB keeps the first and last points and, from
+each of max_points - 2 equal buckets, the point forming the largest
+triangle with the previously kept point and the next bucket's mean,
+which preserves peaks and troughs that averaging would flatten.
+
+Bucket means come from cumulative sums and each bucket's areas are one
+numpy expression; only the chain of kept points is walked in Python,
+once per output point. numpy is imported here, so the API loads this
+module on first use.
+"""
+
+from typing import Dict, List
+
+import numpy as np
+
+
+def lttb_indices(x: np.ndarray, y: np.ndarray, max_points: int) -> np.ndarray:
+    """
+    Indices of the points LTTB keeps, ascending
+
+    Args:
+        x: Strictly increasing x values (e.g. epoch seconds)
+        y: Finite y values, same length as x
+        max_points: Points to keep, at least 3
+
+    Returns:
+        Every index when the series already fits in max_points
+    """
+    n = len(x)
+    if max_points < 3:
+        raise ValueError("max_points must be at least 3")
+    if n <= max_points:
+        return np.arange(n)
+
+    # Relative x keeps the cumulative sums exact for epoch timestamps
+    x = np.asarray(x, dtype=np.float64) - x[0]
+    y = np.asarray(y, dtype=np.float64)
+
+    # max_points - 2 buckets over the points between the fixed first and last
+    edges = np.linspace(1, n - 1, max_points - 1).astype(np.int64)
+    starts, ends = edges[:-1], edges[1:]
+
+    sum_x = np.concatenate(([0.0], np.cumsum(x)))
+    sum_y = np.concatenate(([0.0], np.cumsum(y)))
+    counts = ends - starts
+    mean_x = (sum_x[ends] - sum_x[starts]) / counts
+    mean_y = (sum_y[ends] - sum_y[starts]) / counts
+    # Each bucket looks ahead to the next bucket's mean; the last one to the final point
+    next_x = np.append(mean_x[1:], x[-1])
+    next_y = np.append(mean_y[1:], y[-1])
+
+    kept = np.empty(max_points, dtype=np.int64)
+    kept[0], kept[-1] = 0, n - 1
+    a = 0
+    for bucket in range(max_points - 2):
+        start, end = starts[bucket], ends[bucket]
+        ax, ay = x[a], y[a]
+        # Twice the triangle area; the constant factor does not change the argmax
+        areas = np.abs((ax - next_x[bucket]) * (y[start:end] - ay) - (ax - x[start:end]) * (next_y[bucket] - ay))
+        a = start + int(areas.argmax())
+        kept[bucket + 1] = a
+    return kept
+
+
+def downsample(points: List[Dict], x_field: str, y_field: str, max_points: int) -> List[Dict]:
+    """
+    Points (ordered by x_field, a datetime) reduced to at most max_points
+
+    Points whose y_field is missing are dropped, since a chart line has
+    nothing to draw for them.
+    """
+    points = [point for point in points if point.get(y_field) is not None]
+    if len(points) <= max_points:
+        return points
+
+    # Seconds since the first point; several times faster than datetime64 conversion
+    first = points[0][x_field]
+    x = np.fromiter(((point[x_field] - first).total_seconds() for point in points),
+                    dtype=np.float64, count=len(points))
+    y = np.fromiter((point[y_field] for point in points), dtype=np.float64, count=len(points))
+    return [points[i] for i in lttb_indices(x, y, max_points)]
@@ -1,6 +1,11 @@
 import logging
 from datetime import datetime
 
+from cache import fusion_score_cache, fusion_score_key
+from database.leaderboard import update_leaderboard
+from database.versions import bump_version
+from push import publish_update
+
 logger = logging.getLogger(__name__)
 
 
@@ -59,6 +64,17 @@ class FusionScoreCalculator:
             {"$set": document},
             upsert=True
         )
+        fusion_score_cache.invalidate(fusion_score_key(country, crop))
+        update_leaderboard(self.db, document)
+        bump_version(self.db, "fusion_scores")
+        publish_update({
+            "type": "fusion_score",
+            "country": country,
+            "crop": crop,
+            "fusion_score": document["fusion_score"],
+            "risk_level": document["risk_level"],
+            "timestamp": document["timestamp"]
+        })
         
         logger.info(f"Saved fusion score for {crop} in {country}: {scores['fusion_score']:.2f}")
         return document
@@ -0,0 +1,132 @@
+"""
+Background dependency prober for the health endpoints
+
+One task per API worker pings MongoDB every HEALTH_PROBE_INTERVAL_SECONDS
+and reads the data_versions counters, whose updated_at is set by every
+writer after each batch (see database.versions). /health, /health/live
+and /health/ready answer from the latest snapshot, so load-balancer
+probes never reach MongoDB.
+
+- liveness: the worker's event loop runs and the prober is not stuck
+- readiness: the last probe reached MongoDB; stale data is reported as
+  "degraded" but keeps the worker in rotation
+"""
+
+import asyncio
+import logging
+import os
+import time
+from datetime import datetime
+from typing import Callable, Dict, Optional
+
+from metrics import DATA_AGE_SECONDS, MONGO_PING_SECONDS
+
+logger = logging.getLogger(__name__)
+
+PROBE_INTERVAL_SECONDS = float(os.getenv("HEALTH_PROBE_INTERVAL_SECONDS", "10"))
+PROBE_TIMEOUT_SECONDS = float(os.getenv("HEALTH_PROBE_TIMEOUT_SECONDS", "2"))
+# Daily refresh plus slack; older data is reported as stale
+FRESHNESS_MAX_AGE_SECONDS = float(os.getenv("HEALTH_FRESHNESS_MAX_AGE_HOURS", "26")) * 3600
+
+# Collections whose writers bump a data version
+MONITORED_COLLECTIONS = ["fusion_scores", "satellites", "weather", "commodities", "news"]
+
+
+class DependencyProber:
+    """Periodic MongoDB latency and data freshness snapshot"""
+
+    def __init__(self, repository, interval: float = PROBE_INTERVAL_SECONDS,
+                 timeout: float = PROBE_TIMEOUT_SECONDS,
+                 max_data_age: float = FRESHNESS_MAX_AGE_SECONDS,
+                 clock: Callable[[], datetime] = datetime.utcnow):
+        """
+        Args:
+            repository: MacroDataRepository to probe
+            interval: Seconds between probes
+            timeout: Seconds before a probe counts as failed
+            max_data_age: Seconds after which a collection is stale
+            clock: UTC clock, injectable for tests
+        """
+        self.repository = repository
+        self.interval = interval
+        self.timeout = timeout
+        self.max_data_age = max_data_age
+        self._clock = clock
+        self.snapshot: Optional[Dict] = None
+        self._last_success: Optional[float] = None
+        self._last_probe: Optional[float] = None
+
+        self.probes = 0
+        self.failures = 0
+
+    async def probe(self) -> Dict:
+        """Measure MongoDB now and replace the snapshot"""
+        started = time.perf_counter()
+        self.probes += 1
+        try:
+            await asyncio.wait_for(self.repository.ping(), self.timeout)
+            latency = time.perf_counter() - started
+            versions = await asyncio.wait_for(self.repository.get_data_versions(), self.timeout)
+        except Exception as e:
+            self.failures += 1
+            self._last_probe = time.monotonic()
+            logger.warning(f"Health probe failed: {str(e) or type(e).__name__}")
+            self.snapshot = {
+                **(self.snapshot or {}),
+                "database": "unreachable",
+                "error": str(e) or type(e).__name__,
+                "checked_at": self._clock().isoformat()
+            }
+            return self.snapshot
+
+        now = self._clock()
+        freshness = {}
+        for collection in MONITORED_COLLECTIONS:
+            updated_at = versions.get(collection, {}).get("updated_at")
+            age = (now - updated_at).total_seconds() if updated_at else None
+            freshness[collection] = {
+                "updated_at": updated_at.isoformat() if updated_at else None,
+                "age_seconds": round(age, 1) if age is not None else None,
+                "stale": age is None or age > self.max_data_age
+            }
+            if age is not None:
+                DATA_AGE_SECONDS.labels(collection).set(age)
+        MONGO_PING_SECONDS.set(latency)
+
+        self._last_success = self._last_probe = time.monotonic()
+        self.snapshot = {
+            "database": "connected",
+            "mongo_latency_ms": round(latency * 1000, 2),
+            "freshness": freshness,
+            "checked_at": now.isoformat()
+        }
+        return self.snapshot
+
+    async def run(self):
+        """Probe every interval; runs until cancelled"""
+        while True:
+            await self.probe()
+            await asyncio.sleep(self.interval)
+
+    def liveness(self) -> Dict:
+        """Alive while probes keep being attempted"""
+        if self._last_probe is None:
+            return {"status": "alive", "prober": "starting"}
+        lag = time.monotonic() - self._last_probe
+        stuck = lag > 3 * self.interval + self.timeout
+        return {"status": "stuck" if stuck else "alive", "last_probe_seconds_ago": round(lag, 1)}
+
+    def readiness(self) -> Dict:
+        """ready / degraded (stale data) / not_ready, from the snapshot"""
+        if self.snapshot is None or self._last_success is None:
+            return {"status": "not_ready", "database": "unknown"}
+
+        since_success = time.monotonic() - self._last_success
+        if self.snapshot["database"] != "connected" or since_success > 3 * self.interval + self.timeout:
+            return {"status": "not_ready", **self.snapshot, "last_success_seconds_ago": round(since_success, 1)}
+
+        stale = [name for name, item in self.snapshot["freshness"].items() if item["stale"]]
+        return {"status": "degraded" if stale else "ready", "stale": stale, **self.snapshot}
+
+    def stats(self) -> Dict:
+        return {"probes": self.probes, "failures": self.failures, "interval": self.interval}
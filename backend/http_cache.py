@@ -0,0 +1,119 @@
+"""
+Conditional GET support for polled endpoints
+
+Rendered bodies are kept under a key made of the per-collection data
+version (see database.versions) plus the request parameters, so repeat
+requests and If-None-Match hits are answered without building or
+serializing the payload. The ETag is a hash of the payload without its
+render time: payloads come from read caches that can lag a version bump,
+and a version-derived ETag could pin such a stale body on clients, while
+unchanged data keeps its ETag across re-renders and workers. Rendered
+bodies live no longer than those read caches and are dropped with them on
+invalidation.
+Cache-Control max-age runs until the next scheduled refresh.
+"""
+
+import hashlib
+import os
+from datetime import datetime, timedelta
+from typing import Awaitable, Callable, Dict, Optional, Tuple
+
+from fastapi import Request, Response
+
+from cache import SingleFlight, TTLCache
+from responses import dumps
+
+# Daily refresh time shared with scheduler_v2
+REFRESH_TIME_UTC = os.getenv("SCHEDULER_TIME_UTC", "02:00")
+# While a refresh may still be writing, clients revalidate every minute
+REFRESH_WINDOW_MINUTES = int(os.getenv("REFRESH_WINDOW_MINUTES", "60"))
+REFRESH_WINDOW_MAX_AGE = 60
+
+# TTL matches the read caches the payloads come from
+rendered_cache = TTLCache(
+    maxsize=int(os.getenv("RENDERED_CACHE_MAXSIZE", "512")),
+    ttl=float(os.getenv("RENDERED_CACHE_TTL_SECONDS", "900"))
+)
+# Concurrent misses for one key render the body once
+render_flight = SingleFlight()
+
+# Top-level payload fields stamped at render time, left out of ETags
+VOLATILE_FIELDS = ("timestamp",)
+
+
+def make_etag(version: Dict, *parts) -> str:
+    """
+    Strong ETag for a resource at a data version
+
+    Only valid for bodies built straight from MongoDB; cached payloads go
+    through conditional_json, which uses it as the render key.
+    """
+    raw = "|".join([str(version.get("version", 0))] + [str(part) for part in parts])
+    return '"' + hashlib.sha1(raw.encode("utf-8")).hexdigest() + '"'
+
+
+def payload_etag(payload) -> str:
+    """Strong ETag of a payload's data, ignoring VOLATILE_FIELDS"""
+    if isinstance(payload, dict):
+        payload = {key: value for key, value in payload.items() if key not in VOLATILE_FIELDS}
+    return '"' + hashlib.sha1(dumps(payload)).hexdigest() + '"'
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """If-None-Match check (weak comparison, as RFC 9110 requires for GET)"""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    candidates = [tag.strip() for tag in header.split(",")]
+    return any(tag.removeprefix("W/") == etag for tag in candidates)
+
+
+def seconds_until_refresh(now: Optional[datetime] = None) -> int:
+    """Seconds until the next daily refresh, or a short max-age inside the refresh window"""
+    now = now or datetime.utcnow()
+    hour, minute = (int(part) for part in REFRESH_TIME_UTC.split(":"))
+    todays_run = now.replace(hour=hour, minute=minute, second=0, microsecond=0)
+
+    if todays_run <= now < todays_run + timedelta(minutes=REFRESH_WINDOW_MINUTES):
+        return REFRESH_WINDOW_MAX_AGE
+
+    next_run = todays_run if now < todays_run else todays_run + timedelta(days=1)
+    return max(REFRESH_WINDOW_MAX_AGE, int((next_run - now).total_seconds()))
+
+
+def cache_headers(etag: str) -> Dict[str, str]:
+    return {
+        "ETag": etag,
+        "Cache-Control": f"public, max-age={seconds_until_refresh()}"
+    }
+
+
+async def conditional_json(request: Request, key: str,
+                           build_payload: Callable[[], Awaitable[Dict]]) -> Response:
+    """
+    304 when the client already holds the body, otherwise the body
+
+    Args:
+        key: Render key, make_etag() of the data version and parameters
+        build_payload: Loads the payload on a render miss
+
+    Bodies are rendered once per key and reused until they expire or the
+    read caches are invalidated.
+    """
+    rendered = rendered_cache.get(key)
+    if rendered is None:
+        async def render() -> Tuple[bytes, str]:
+            payload = await build_payload()
+            entry = (dumps(payload), payload_etag(payload))
+            rendered_cache.set(key, entry)
+            return entry
+
+        rendered = await render_flight.do(key, render)
+
+    body, etag = rendered
+    headers = cache_headers(etag)
+    if etag_matches(request, etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
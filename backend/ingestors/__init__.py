@@ -1,9 +1,25 @@
 """Data ingestors package for Macro-Data Fusion platform"""
 
-from .sentinel2_ingestor import Sentinel2Ingestor, ingest_satellite_data
-from .weather_ingestor import WeatherIngestor, ingest_weather_data
-from .commodity_ingestor import CommodityIngestor, ingest_commodity_data
-from .news_ingestor import NewsIngestor, ingest_news_data
+import importlib
+
+# requests, numpy and feedparser load with the first ingestor used
+_EXPORTS = {
+    'Sentinel2Ingestor': '.sentinel2_ingestor',
+    'ingest_satellite_data': '.sentinel2_ingestor',
+    'WeatherIngestor': '.weather_ingestor',
+    'ingest_weather_data': '.weather_ingestor',
+    'CommodityIngestor': '.commodity_ingestor',
+    'ingest_commodity_data': '.commodity_ingestor',
+    'NewsIngestor': '.news_ingestor',
+    'ingest_news_data': '.news_ingestor'
+}
+
+
+def __getattr__(name):
+    if name in _EXPORTS:
+        return getattr(importlib.import_module(_EXPORTS[name], __name__), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
 __all__ = [
     'Sentinel2Ingestor',
@@ -6,6 +6,8 @@ from typing import List, Dict
 import numpy as np
 from io import StringIO
 
+from database.versions import bump_version
+
 logger = logging.getLogger(__name__)
 
 
@@ -78,6 +80,9 @@ class CommodityIngestor:
                 {"$set": price},
                 upsert=True
             )
+        
+        if prices:
+            bump_version(self.db, "commodities")
     
     def calculate_price_trend(self, prices: List[Dict], period: int = 30) -> Dict:
         """
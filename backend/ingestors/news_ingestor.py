@@ -4,6 +4,8 @@ from datetime import datetime, timedelta
 from typing import List, Dict
 import feedparser
 
+from database.versions import bump_version
+
 logger = logging.getLogger(__name__)
 
 
@@ -78,6 +80,9 @@ class NewsIngestor:
                 {"$set": news},
                 upsert=True
             )
+        
+        if news_items:
+            bump_version(self.db, "news")
     
     def _analyze_sentiment(self, title: str, summary: str) -> float:
         """
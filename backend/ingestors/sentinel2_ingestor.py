@@ -4,6 +4,9 @@ from datetime import datetime, timedelta
 from typing import List, Dict
 import numpy as np
 
+from database.geo import tile_geometry
+from database.versions import bump_version
+
 logger = logging.getLogger(__name__)
 
 
@@ -19,6 +22,7 @@ class Sentinel2Ingestor:
     def __init__(self, db):
         self.db = db
         self.satellites_collection = db["satellites"]
+        self.ndvi_history_collection = db["ndvi_history"]
         # In production, use actual Sentinel Hub API key
         self.sentinel_hub_url = "https://services.sentinel-hub.com/api/v1/process"
     
@@ -67,6 +71,8 @@ class Sentinel2Ingestor:
                     "ndvi_value": ndvi_value,
                     "latitude": tile["center_lat"],
                     "longitude": tile["center_lon"],
+                    # Tile footprint for viewport queries (2dsphere index)
+                    "geometry": tile_geometry(tile["min_lat"], tile["max_lat"], tile["min_lon"], tile["max_lon"]),
                     "area_km2": 10000.0,
                     "confidence": 0.92,
                     "timestamp": datetime.utcnow(),
@@ -131,6 +137,22 @@ class Sentinel2Ingestor:
                 {"$set": tile},
                 upsert=True
             )
+            # satellites keeps the latest value per tile; one point per day
+            # per tile is kept here for /charts/ndvi
+            day = tile["timestamp"].replace(hour=0, minute=0, second=0, microsecond=0)
+            self.ndvi_history_collection.update_one(
+                {
+                    "country": tile["country"],
+                    "crop": tile["crop"],
+                    "region": tile["region"],
+                    "date": day
+                },
+                {"$set": {"ndvi_value": tile["ndvi_value"], "timestamp": tile["timestamp"]}},
+                upsert=True
+            )
+        
+        if tiles:
+            bump_version(self.db, "satellites")
     
     def calculate_crop_health_score(self, ndvi_values: List[float]) -> float:
         """
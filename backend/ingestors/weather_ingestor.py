@@ -4,6 +4,8 @@ from datetime import datetime, timedelta
 from typing import List, Dict
 import os
 
+from database.versions import bump_version
+
 logger = logging.getLogger(__name__)
 
 
@@ -92,6 +94,9 @@ class WeatherIngestor:
                 {"$set": forecast},
                 upsert=True
             )
+        
+        if forecasts:
+            bump_version(self.db, "weather")
     
     def calculate_weather_score(self, forecast_data: List[Dict]) -> float:
         """
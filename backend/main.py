@@ -1,25 +1,179 @@
-from fastapi import FastAPI, HTTPException, Query
+from fastapi import FastAPI, HTTPException, Path, Query, Request, Response
+from fastapi.responses import JSONResponse, StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
-from pymongo import MongoClient
+from fastapi.concurrency import run_in_threadpool
+from contextlib import asynccontextmanager
+from motor.motor_asyncio import AsyncIOMotorClient
 from datetime import datetime, timedelta
+from typing import Dict, Optional
 import os
+import asyncio
+import time
 import logging
 from dotenv import load_dotenv
 
-# Load environment variables
+# Load environment variables before the modules below read their settings
+# (REDIS_URL, cache TTLs, pool and admission limits) at import
 load_dotenv()
 
+from database import MacroDataRepository, bootstrap_indexes, create_async_client, get_database
+from database.geo import CELL_FIELDS, MAP_VIEWPORT_LIMIT, cell_degrees, parse_bbox, zoom_for_bbox
+from database.pagination import decode_cursor
+from database.repository import BAR_INTERVALS, TILE_FIELDS, TILE_SHARED_FIELDS, period_start
+from database.sync import collect_changes
+from responses import FastJSONResponse, columnar, compact_json, ndjson_response, wants_ndjson
+from cache import (
+    TieredCache,
+    fusion_score_cache,
+    api_read_cache,
+    shared_cache,
+    CACHE_TTLS,
+    REDIS_URL,
+    fusion_score_key,
+    crop_health_key,
+    weather_forecast_key,
+    news_risk_key,
+    price_forecast_key,
+    price_bars_key,
+    DATA_VERSIONS_KEY
+)
+from http_cache import cache_headers, conditional_json, etag_matches, make_etag, render_flight, rendered_cache
+from push import sse_stream, update_hub
+from metrics import MetricsMiddleware, MongoCommandMetrics, render_latest
+from model_pool import ModelPool, PoolSaturated
+from admission import AdmissionController, AdmissionMiddleware
+from health import DependencyProber
+from vector_tiles import (
+    MVT_BUFFER, MVT_MAX_FEATURES, MVT_MAX_ZOOM, MVT_MEDIA_TYPE, encode_tile, tile_bounds, tile_store
+)
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# MongoDB connection, created and closed by the app lifespan
+client: Optional[AsyncIOMotorClient] = None
+db = None
+repository: Optional[MacroDataRepository] = None
+# MongoDB latency and data freshness behind the /health endpoints
+prober: Optional[DependencyProber] = None
+
+# Read caches: per-worker tier first, then the optional shared tier
+fusion_score_tier = TieredCache(fusion_score_cache, shared_cache)
+api_read_tier = TieredCache(api_read_cache, shared_cache)
+
+# CPU-bound model calls run here, off the event loop; workers import the
+# forecasting code at startup instead of on the first call
+model_pool = ModelPool(preload=("models.price_predictor",))
+
+# Two years of daily prices; seasonal forecasting needs at least one
+PRICE_HISTORY_POINTS = 730
+# Relative change over the horizon below which the trend is "stable"
+PRICE_TREND_THRESHOLD = 0.02
+# Longest forecast horizon served; each day ahead is model work in the pool
+PRICE_FORECAST_MAX_DAYS = 365
+
+# Chart series: days of history by default and the points a chart gets
+CHART_DEFAULT_DAYS = 3650
+CHART_DEFAULT_POINTS = 600
+# Above this many points LTTB runs in a worker thread
+CHART_INLINE_POINTS = 20000
+
+# Startup cache warm-up: parallel pair loads and overall time budget
+WARMUP_CONCURRENCY = int(os.getenv("WARMUP_CONCURRENCY", "8"))
+WARMUP_TIMEOUT_SECONDS = float(os.getenv("WARMUP_TIMEOUT_SECONDS", "20"))
+
+
+async def ensure_database_indexes():
+    """Create missing indexes and report query shapes still doing collection scans"""
+    try:
+        # Index management uses the sync driver underneath the Motor database
+        scans = await run_in_threadpool(bootstrap_indexes, db.delegate)
+        if scans:
+            logger.warning(f"Queries without index support: {', '.join(scans)}")
+    except Exception as e:
+        logger.error(f"Index bootstrap failed: {str(e)}")
+
+
+async def warm_caches():
+    """
+    Preload the latest fusion score and first tile page of every pair
+
+    Runs before the worker takes traffic so the first dashboard loads after
+    a deploy are cache hits. Pairs come from one aggregation; loads go
+    through the read tiers, so a warm shared tier is reused as is.
+    """
+    started = time.perf_counter()
+    pairs = list(await repository.get_latest_fusion_scores())
+    limit = asyncio.Semaphore(WARMUP_CONCURRENCY)
+    
+    async def warm(country: str, crop: str):
+        async with limit:
+            await _fusion_score_payload(country, crop)
+            await _crop_health_payload(country, crop)
+    
+    results = await asyncio.gather(*(warm(country, crop) for country, crop in pairs), return_exceptions=True)
+    failures = [result for result in results if isinstance(result, Exception)]
+    logger.info(
+        f"Cache warm-up: {len(pairs) - len(failures)}/{len(pairs)} pairs "
+        f"in {(time.perf_counter() - started) * 1000:.0f} ms"
+    )
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Own the MongoDB client, background tasks and model pool for the worker's lifetime"""
+    global client, db, repository, prober
+    client = create_async_client(event_listeners=[MongoCommandMetrics()])
+    db = get_database(client)
+    # All endpoint reads go through the async repository
+    repository = MacroDataRepository(db)
+    prober = DependencyProber(repository)
+    await prober.probe()
+    health_probes = asyncio.create_task(prober.run())
+    
+    await ensure_database_indexes()
+    if not REDIS_URL:
+        logger.info("REDIS_URL not set: shared cache, cross-worker invalidation and update relay disabled")
+    # Drop in-process entries when the scheduler publishes a refresh
+    invalidation_listener = asyncio.create_task(
+        shared_cache.listen_for_invalidations([fusion_score_cache, api_read_cache], [rendered_cache])
+    )
+    # Forward updates published by the scheduler to this worker's streams
+    update_relay = asyncio.create_task(update_hub.relay(REDIS_URL))
+    update_keepalive = asyncio.create_task(update_hub.keepalive())
+    await model_pool.start()
+    
+    try:
+        await asyncio.wait_for(warm_caches(), WARMUP_TIMEOUT_SECONDS)
+    except Exception as e:
+        # A cold cache is slower, not broken
+        logger.warning(f"Cache warm-up incomplete: {str(e) or type(e).__name__}")
+    
+    try:
+        yield
+    finally:
+        model_pool.shutdown()
+        health_probes.cancel()
+        invalidation_listener.cancel()
+        update_relay.cancel()
+        update_keepalive.cancel()
+        await shared_cache.close()
+        client.close()
+
+
 # Initialize FastAPI
 app = FastAPI(
     title="Macro-Data Fusion API",
     description="Agriculture risk prediction platform fusing satellite, weather, commodity, and news data",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
+# Rate limiting and load shedding; inside CORS so rejections stay readable
+admission = AdmissionController()
+app.add_middleware(AdmissionMiddleware, controller=admission)
+
 # CORS middleware for frontend communication
 app.add_middleware(
     CORSMiddleware,
@@ -29,18 +183,18 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# MongoDB Connection
-MONGO_URI = os.getenv("MONGODB_URI", "mongodb://localhost:27017")
-client = MongoClient(MONGO_URI)
-db = client["macro_data_fusion"]
+# Per-route latency, status and in-flight metrics for /metrics
+app.add_middleware(MetricsMiddleware)
+
 
-# Collections
-crops_collection = db["crops"]
-weather_collection = db["weather"]
-commodities_collection = db["commodities"]
-news_collection = db["news"]
-fusion_scores_collection = db["fusion_scores"]
-satellites_collection = db["satellites"]
+@app.exception_handler(PoolSaturated)
+async def model_pool_saturated(request: Request, exc: PoolSaturated):
+    """Shed model work instead of queueing it behind a full pool"""
+    return JSONResponse(
+        status_code=503,
+        content={"detail": str(exc)},
+        headers={"Retry-After": str(exc.retry_after)}
+    )
 
 
 @app.get("/")
@@ -51,195 +205,805 @@ async def root():
         "message": "Macro-Data Fusion Platform API",
         "endpoints": {
             "fusion_score": "/fusion-score?country=IN&crop=wheat",
+            "fusion_scores": "/fusion-scores?pairs=IN:wheat,US:corn",
+            "fusion_leaderboard": "/fusion-score/top?k=20&order=risk",
             "crop_health": "/map/health?country=IN&crop=wheat",
+            "crop_health_tiles": "/map/tiles/{z}/{x}/{y}.mvt?country=IN&crop=wheat",
             "weather_forecast": "/weather/forecast?country=IN",
             "price_prediction": "/predict-price",
-            "news_risk": "/news-risk?country=IN"
+            "news_risk": "/news-risk?country=IN",
+            "price_chart": "/charts/prices?commodity=wheat&max_points=600",
+            "price_bars": "/commodities/wheat/bars?interval=week",
+            "weather_chart": "/charts/weather?country=IN&metric=rainfall_mm",
+            "ndvi_chart": "/charts/ndvi?country=IN&crop=wheat&region=Tile_0_0",
+            "dashboard": "/dashboard?country=IN&crop=wheat",
+            "updates": "/updates?country=IN&crop=wheat",
+            "sync": "/sync?country=IN&crop=wheat&since=<token>",
+            "metrics": "/metrics",
+            "health": "/health (/health/live, /health/ready)"
+        }
+    }
+
+
+async def _data_version(collection_name: str) -> Dict:
+    """Current version counter of a collection, as bumped by its writers"""
+    versions = await api_read_tier.get_or_load(
+        DATA_VERSIONS_KEY,
+        repository.get_data_versions,
+        CACHE_TTLS["data_versions"]
+    )
+    return (versions or {}).get(collection_name, {})
+
+
+async def _fusion_score_payload(country: str, crop: str) -> Dict:
+    # Read-through cache; scores change at most once per scheduler run
+    latest_data = await fusion_score_tier.get_or_load(
+        fusion_score_key(country, crop),
+        lambda: repository.get_latest_fusion_score(country, crop),
+        CACHE_TTLS["fusion_score"]
+    )
+    
+    if not latest_data:
+        return {
+            "error": "No data found",
+            "country": country,
+            "crop": crop,
+            "fusion_score": 0,
+            "components": {
+                "crop_health": 0,
+                "weather_score": 0,
+                "price_trend": 0,
+                "news_risk": 0
+            }
+        }
+    
+    return latest_data
+
+
+async def _crop_health_payload(country: str, crop: str, limit: int = 100,
+                               cursor: Optional[str] = None) -> Dict:
+    if cursor is None and limit == 100:
+        # Only the default first page is cached
+        page = await api_read_tier.get_or_load(
+            crop_health_key(country, crop),
+            lambda: repository.get_crop_health_page(country, crop, limit=100),
+            CACHE_TTLS["crop_health"]
+        )
+    else:
+        page = await repository.get_crop_health_page(country, crop, limit=limit, cursor=cursor)
+    
+    return {
+        "country": country,
+        "crop": crop,
+        "tiles": page["items"],
+        "next_cursor": page["next_cursor"],
+        "timestamp": datetime.utcnow().isoformat()
+    }
+
+
+def _tile_fields(fields: Optional[str], allowed: list = TILE_FIELDS) -> list:
+    """Validated ?fields= selection, every allowed field when absent"""
+    if not fields:
+        return allowed
+    selected = [field.strip() for field in fields.split(",") if field.strip()]
+    unknown = [field for field in selected if field not in allowed]
+    if not selected or unknown:
+        raise ValueError(f"fields must be a comma-separated subset of {', '.join(allowed)}")
+    return selected
+
+
+def _shape_tiles(payload: Dict, format: str, fields: list, allowed: list = TILE_FIELDS) -> Dict:
+    """Apply the format and field selection of /map/health to a tile page"""
+    tiles = payload.pop("tiles")
+    if format == "columnar":
+        payload.update(columnar(tiles, fields, hoistable=TILE_SHARED_FIELDS))
+    elif fields is allowed:
+        payload["tiles"] = tiles
+    else:
+        payload["tiles"] = [{field: tile.get(field) for field in fields} for tile in tiles]
+    return payload
+
+
+async def _viewport_payload(country: str, crop: str, bbox: tuple, zoom: int, limit: int) -> Dict:
+    """Tiles intersecting bbox, averaged into grid cells below the detail zoom"""
+    cell = cell_degrees(zoom)
+    # One extra row tells whether the viewport was cut at limit
+    if cell is None:
+        tiles = await repository.get_tiles_in_bbox(country, crop, bbox, limit=limit + 1)
+    else:
+        tiles = await repository.get_tile_cells_in_bbox(country, crop, bbox, cell, limit=limit + 1)
+    
+    return {
+        "country": country,
+        "crop": crop,
+        "bbox": list(bbox),
+        "zoom": zoom,
+        "resolution": "tile" if cell is None else "cell",
+        "cell_degrees": cell,
+        "tiles": tiles[:limit],
+        "truncated": len(tiles) > limit,
+        "timestamp": datetime.utcnow().isoformat()
+    }
+
+
+async def _chart_payload(collection_name: str, base_filter: Dict, y_field: str, days: int,
+                         max_points: int) -> Dict:
+    """Latest `days` daily points of one series, LTTB-downsampled to max_points"""
+    # numpy loads with the first chart that needs downsampling
+    points = await repository.get_series(collection_name, base_filter, "date", y_field, limit=days)
+    raw_points = len(points)
+    
+    if raw_points > max_points:
+        from downsampling import downsample
+        if raw_points > CHART_INLINE_POINTS:
+            points = await run_in_threadpool(downsample, points, "date", y_field, max_points)
+        else:
+            points = downsample(points, "date", y_field, max_points)
+    
+    return {
+        "metric": y_field,
+        "raw_points": raw_points,
+        "max_points": max_points,
+        "downsampled": raw_points > max_points,
+        "points": points,
+        "timestamp": datetime.utcnow().isoformat()
+    }
+
+
+async def _price_bars_payload(commodity: str, interval: str, periods: int) -> Dict:
+    current = period_start(datetime.utcnow(), interval)
+    version = (await _data_version("commodities")).get("version", 0)
+    
+    # Closed periods are aggregated once per commodity and interval until
+    # the next period opens or prices are written (the refresh can still
+    # add the last day of the period that just closed). Only the current
+    # one is aggregated per request.
+    closed, open_bars = await asyncio.gather(
+        api_read_tier.get_or_load(
+            price_bars_key(commodity, interval, current.date().isoformat(), version),
+            lambda: repository.get_price_bars(commodity, interval, end=current),
+            CACHE_TTLS["price_bars"]
+        ),
+        repository.get_price_bars(commodity, interval, start=current)
+    )
+    bars = [{**bar, "closed": True} for bar in closed or []] + [{**bar, "closed": False} for bar in open_bars]
+    
+    return {
+        "commodity": commodity,
+        "interval": interval,
+        "bars": bars[-periods:],
+        "timestamp": datetime.utcnow().isoformat()
+    }
+
+
+async def _weather_forecast_payload(country: str, days: int, cursor: Optional[str] = None) -> Dict:
+    if cursor is None:
+        page = await api_read_tier.get_or_load(
+            weather_forecast_key(country, days),
+            lambda: repository.get_weather_page(country, days),
+            CACHE_TTLS["weather_forecast"]
+        )
+    else:
+        page = await repository.get_weather_page(country, days, cursor=cursor)
+    
+    return {
+        "country": country,
+        "forecast_days": days,
+        "data": page["items"],
+        "next_cursor": page["next_cursor"],
+        "timestamp": datetime.utcnow().isoformat()
+    }
+
+
+async def _price_prediction_payload(commodity: str, days_ahead: int) -> Dict:
+    # numpy loads with the first forecast; model runs happen in the pool
+    from models.price_predictor import choose_model, run_forecast
+    
+    # Two index-only lookups decide the cache key; the series is fetched
+    # and the model run only on a miss
+    info = await repository.get_price_series_info(commodity, limit=PRICE_HISTORY_POINTS)
+    
+    if not info["points"]:
+        return {
+            "error": "No historical data",
+            "commodity": commodity
         }
+    
+    model = choose_model(info["points"])
+    
+    async def forecast() -> Dict:
+        history, recent = await asyncio.gather(
+            repository.get_price_series(commodity, limit=PRICE_HISTORY_POINTS),
+            repository.get_price_history(commodity, limit=10)
+        )
+        result = await model_pool.run(run_forecast, model, history, days_ahead)
+        return {
+            "commodity": commodity,
+            "days_ahead": days_ahead,
+            "model": model,
+            "history_points": len(history),
+            "latest_price_date": history[-1]["date"],
+            "current_price": history[-1]["price"],
+            "historical_data": recent,  # Last 10 records, newest first
+            "forecast": result,
+            "forecast_trend": _forecast_trend(history[-1]["price"], result),
+            "timestamp": datetime.utcnow().isoformat()
+        }
+    
+    return await api_read_tier.get_or_load(
+        price_forecast_key(commodity, days_ahead, model, info["latest_date"].isoformat()),
+        forecast,
+        CACHE_TTLS["price_forecast"]
+    )
+
+
+def _forecast_trend(current_price: float, result: Dict) -> str:
+    """up/down/stable from the last forecast value against the current price"""
+    values = result.get("forecast_values") or result.get("forecasts") or []
+    if not values or not current_price:
+        return "stable"
+    change = (values[-1] - current_price) / current_price
+    if change > PRICE_TREND_THRESHOLD:
+        return "up"
+    if change < -PRICE_TREND_THRESHOLD:
+        return "down"
+    return "stable"
+
+
+async def _news_risk_payload(country: str) -> Dict:
+    news_items = await api_read_tier.get_or_load(
+        news_risk_key(country),
+        lambda: repository.get_recent_news(country, limit=20),
+        CACHE_TTLS["news_risk"]
+    )
+    
+    # Calculate aggregate sentiment risk
+    total_sentiment = sum(item.get("sentiment_score", 0) for item in news_items)
+    avg_risk = total_sentiment / len(news_items) if news_items else 0
+    
+    return {
+        "country": country,
+        "risk_score": avg_risk,
+        "risk_level": "high" if avg_risk > 0.7 else "medium" if avg_risk > 0.3 else "low",
+        "recent_news": news_items,
+        "timestamp": datetime.utcnow().isoformat()
     }
 
 
 @app.get("/fusion-score")
-async def get_fusion_score(country: str = Query(...), crop: str = Query(...)):
+async def get_fusion_score(request: Request, country: str = Query(...), crop: str = Query(...)):
     """
     Calculate and return Fusion Score
     Fusion Score = (CropHealth + WeatherScore + PriceTrend + NewsRisk) / 4
+    
+    Supports If-None-Match; unchanged scores return 304.
     """
     try:
-        # Fetch latest data for each component
-        latest_data = fusion_scores_collection.find_one(
-            {"country": country, "crop": crop},
-            sort=[("timestamp", -1)]
-        )
-        
-        if not latest_data:
+        key = make_etag(await _data_version("fusion_scores"), "fusion-score", country, crop)
+        return await conditional_json(request, key, lambda: _fusion_score_payload(country, crop))
+    
+    except Exception as e:
+        logger.error(f"Error in fusion-score: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@app.get("/fusion-score/top")
+async def get_fusion_leaderboard(request: Request,
+                                 k: int = Query(20, ge=1, le=500),
+                                 order: str = Query("risk", pattern="^(risk|score)$")):
+    """
+    Top k country/crop pairs across all regions
+    
+    order=risk puts the highest-risk pairs (lowest fusion score) first,
+    order=score the highest scores. Served from the fusion leaderboard,
+    which every fusion score save keeps ordered, so the cost depends on k
+    and not on the number of pairs. Supports If-None-Match.
+    """
+    try:
+        async def payload() -> Dict:
+            entries = await repository.get_top_fusion_scores(k, ascending=order == "risk")
             return {
-                "error": "No data found",
-                "country": country,
-                "crop": crop,
-                "fusion_score": 0,
-                "components": {
-                    "crop_health": 0,
-                    "weather_score": 0,
-                    "price_trend": 0,
-                    "news_risk": 0
-                }
+                "order": order,
+                "k": k,
+                "count": len(entries),
+                "entries": [{"rank": rank, **entry} for rank, entry in enumerate(entries, start=1)],
+                "timestamp": datetime.utcnow().isoformat()
             }
         
-        # Remove MongoDB _id from response
-        latest_data.pop("_id", None)
-        return latest_data
+        key = make_etag(await _data_version("fusion_scores"), "fusion-score/top", k, order)
+        return await conditional_json(request, key, payload)
     
     except Exception as e:
-        logger.error(f"Error in fusion-score: {str(e)}")
+        logger.error(f"Error in fusion leaderboard: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@app.get("/fusion-scores")
+async def get_fusion_scores(pairs: str = Query("all", description="Comma-separated COUNTRY:crop pairs, or 'all'")):
+    """
+    Latest Fusion Score for many country/crop pairs in one round trip
+    Returns a compact map keyed by "COUNTRY:crop"
+    """
+    requested = None
+    if pairs != "all":
+        requested = [tuple(pair.split(":")) for pair in pairs.split(",") if pair]
+        if not requested or any(len(pair) != 2 or not all(pair) for pair in requested):
+            raise HTTPException(status_code=400, detail="pairs must be 'all' or COUNTRY:crop[,COUNTRY:crop...]")
+    
+    try:
+        latest = await repository.get_latest_fusion_scores(requested)
+        
+        scores = {f"{country}:{crop}": score for (country, crop), score in sorted(latest.items())}
+        missing = [f"{country}:{crop}" for country, crop in requested or [] if (country, crop) not in latest]
+        
+        return FastJSONResponse({
+            "count": len(scores),
+            "scores": scores,
+            "missing": missing,
+            "timestamp": datetime.utcnow().isoformat()
+        })
+    
+    except Exception as e:
+        logger.error(f"Error in fusion-scores: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
 
 
 @app.get("/map/health")
-async def get_crop_health_map(country: str = Query(...), crop: str = Query(...)):
+async def get_crop_health_map(request: Request,
+                              country: str = Query(...),
+                              crop: str = Query(...),
+                              limit: Optional[int] = Query(None, ge=1, le=1000, description="Page size (default 100)"),
+                              cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+                              format: str = Query("rows", pattern="^(rows|columnar)$"),
+                              fields: Optional[str] = Query(None, description="Comma-separated tile fields to return"),
+                              bbox: Optional[str] = Query(None, description="Viewport min_lon,min_lat,max_lon,max_lat"),
+                              zoom: Optional[int] = Query(None, ge=0, le=22, description="Map zoom, at most the zoom the bbox implies")):
     """
     Get crop health map data (NDVI from Sentinel-2)
     Returns colored tiles representing crop health by region
+    
+    Pages are keyset-paginated on (timestamp, _id). With
+    Accept: application/x-ndjson every matching tile (or `limit` tiles) is
+    streamed one per line as MongoDB returns them. JSON pages support
+    If-None-Match.
+    
+    format=columnar replaces "tiles" with "shared" (fields equal across
+    the page) and "columns" (one array per remaining field, index i is
+    tile i). fields trims tiles to the listed fields in either format.
+    
+    bbox returns, as JSON, only the tiles whose footprint intersects the
+    viewport (2dsphere index), newest first and at most `limit`. Below
+    zoom MAP_DETAIL_MIN_ZOOM tiles are averaged into grid cells
+    ("resolution": "cell"; fields latitude, longitude, ndvi_value,
+    tile_count, timestamp). "truncated" is true when more matched.
     """
     try:
-        health_data = satellites_collection.find(
-            {"country": country, "crop": crop, "type": "NDVI"},
-            sort=[("timestamp", -1)],
-            limit=100
-        )
+        if bbox is not None:
+            if cursor:
+                raise ValueError("cursor cannot be combined with bbox")
+            box = parse_bbox(bbox)
+            # Finer than the bbox implies would return raw tiles for a wide viewport
+            zoom = zoom_for_bbox(box) if zoom is None else min(zoom, zoom_for_bbox(box))
+            allowed = TILE_FIELDS if cell_degrees(zoom) is None else CELL_FIELDS
+            selected = _tile_fields(fields, allowed)
+            viewport_limit = min(limit or MAP_VIEWPORT_LIMIT, MAP_VIEWPORT_LIMIT)
+            
+            async def viewport() -> Dict:
+                return _shape_tiles(await _viewport_payload(country, crop, box, zoom, viewport_limit),
+                                    format, selected, allowed)
+            
+            key = make_etag(await _data_version("satellites"), "map/health", country, crop, viewport_limit,
+                            ",".join(map(str, box)), zoom, format, ",".join(selected))
+            return await conditional_json(request, key, viewport)
         
-        result = []
-        for item in health_data:
-            item.pop("_id", None)
-            result.append(item)
+        selected = _tile_fields(fields)
         
-        return {
-            "country": country,
-            "crop": crop,
-            "tiles": result,
-            "timestamp": datetime.utcnow().isoformat()
-        }
+        if wants_ndjson(request):
+            if cursor:
+                decode_cursor(cursor)  # reject bad cursors before streaming starts
+            return ndjson_response(repository.stream_crop_health_tiles(country, crop, limit=limit, cursor=cursor))
+        
+        async def payload() -> Dict:
+            return _shape_tiles(await _crop_health_payload(country, crop, limit or 100, cursor), format, selected)
+        
+        key = make_etag(await _data_version("satellites"), "map/health", country, crop, limit or 100, cursor,
+                        format, ",".join(selected))
+        return await conditional_json(request, key, payload)
     
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         logger.error(f"Error in crop health map: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@app.get("/map/tiles/{z}/{x}/{y}.mvt")
+async def get_crop_health_vector_tile(request: Request,
+                                      z: int = Path(..., ge=0, le=MVT_MAX_ZOOM),
+                                      x: int = Path(..., ge=0),
+                                      y: int = Path(..., ge=0),
+                                      country: str = Query(...),
+                                      crop: str = Query(...)):
+    """
+    Crop health as a Mapbox Vector Tile (layer "crop_health")
+    
+    One feature per NDVI tile footprint with region, ndvi_value and date
+    attributes. Tiles are cached in memory and on disk per satellites data
+    version, so repeat pans do not reach MongoDB; If-None-Match is
+    supported. Tiles without data have an empty body.
+    """
+    if x >= 2 ** z or y >= 2 ** z:
+        raise HTTPException(status_code=400, detail=f"x and y must be below {2 ** z} at zoom {z}")
+    
+    try:
+        version = await _data_version("satellites")
+        etag = make_etag(version, "mvt", country, crop, z, x, y)
+        headers = cache_headers(etag)
+        if etag_matches(request, etag):
+            return Response(status_code=304, headers=headers)
+        
+        async def build() -> bytes:
+            features = await repository.get_tile_features(
+                country, crop, tile_bounds(z, x, y, buffer=MVT_BUFFER), limit=MVT_MAX_FEATURES
+            )
+            return encode_tile(features, z, x, y)
+        
+        body = await tile_store.get_or_build((version.get("version", 0), country, crop, z, x, y), build)
+        return Response(content=body, media_type=MVT_MEDIA_TYPE, headers=headers)
+    
+    except Exception as e:
+        logger.error(f"Error in crop health vector tile: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
 @app.get("/weather/forecast")
-async def get_weather_forecast(country: str = Query(...), days: int = Query(30)):
+async def get_weather_forecast(request: Request,
+                               country: str = Query(...),
+                               days: int = Query(30, ge=1, le=1000),
+                               cursor: Optional[str] = Query(None, description="next_cursor from the previous page")):
     """
     Get 30-day weather forecast (rainfall, temperature)
+    
+    Keyset-paginated on (date, _id), `days` records per page. With
+    Accept: application/x-ndjson records are streamed one per line.
     """
     try:
-        forecast_data = weather_collection.find(
-            {"country": country},
-            sort=[("date", -1)],
-            limit=days
-        )
+        if wants_ndjson(request):
+            if cursor:
+                decode_cursor(cursor)  # reject bad cursors before streaming starts
+            return ndjson_response(repository.stream_weather_forecast(country, days=days, cursor=cursor))
         
-        result = []
-        for item in forecast_data:
-            item.pop("_id", None)
-            result.append(item)
-        
-        return {
-            "country": country,
-            "forecast_days": days,
-            "data": result,
-            "timestamp": datetime.utcnow().isoformat()
-        }
+        return FastJSONResponse(await _weather_forecast_payload(country, days, cursor))
     
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         logger.error(f"Error in weather forecast: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
 
 
 @app.post("/predict-price")
-async def predict_commodity_price(commodity: str = Query(...), days_ahead: int = Query(30)):
+async def predict_commodity_price(commodity: str = Query(...),
+                                  days_ahead: int = Query(30, ge=1, le=PRICE_FORECAST_MAX_DAYS)):
     """
     Predict commodity price trends using Prophet/LSTM
+    
+    Seasonal decomposition with a year or more of history, exponential
+    smoothing otherwise. Forecasts run in the model pool and are cached
+    until newer prices arrive.
     """
     try:
-        # Fetch historical price data
-        historical = commodities_collection.find(
-            {"commodity": commodity},
-            sort=[("date", -1)],
-            limit=365
-        )
+        return FastJSONResponse(await _price_prediction_payload(commodity, days_ahead))
+    
+    except PoolSaturated:
+        raise
+    except asyncio.TimeoutError:
+        raise HTTPException(status_code=504, detail="Price forecast timed out")
+    except Exception as e:
+        logger.error(f"Error in price prediction: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@app.get("/commodities/{commodity}/bars")
+async def get_price_bars(request: Request,
+                         commodity: str,
+                         interval: str = Query("week", pattern=f"^({'|'.join(BAR_INTERVALS)})$"),
+                         periods: int = Query(52, ge=1, le=1000, description="Most recent bars to return")):
+    """
+    Weekly (Monday-start, UTC) or monthly OHLC bars of daily prices
+    
+    open/close are the first and last daily price of the period, volume
+    the summed volume_traded, days the number of daily prices. The last
+    bar is the current, still open period ("closed": false). Supports
+    If-None-Match.
+    """
+    try:
+        async def payload() -> Dict:
+            return await _price_bars_payload(commodity, interval, periods)
         
-        history = []
-        for item in historical:
-            item.pop("_id", None)
-            history.append(item)
+        key = make_etag(await _data_version("commodities"), "bars", commodity, interval, periods,
+                        period_start(datetime.utcnow(), interval).date())
+        return await conditional_json(request, key, payload)
+    
+    except Exception as e:
+        logger.error(f"Error in price bars: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@app.get("/charts/prices")
+async def get_price_chart(request: Request,
+                          commodity: str = Query(...),
+                          metric: str = Query("price_usd_per_ton", pattern="^(price_usd_per_ton|volume_traded)$"),
+                          days: int = Query(CHART_DEFAULT_DAYS, ge=1, le=100000),
+                          max_points: int = Query(CHART_DEFAULT_POINTS, ge=3, le=5000)):
+    """
+    Daily commodity prices (or volumes) for a chart
+    
+    The latest `days` points, oldest first, reduced server-side to at most
+    max_points with Largest-Triangle-Three-Buckets so peaks survive.
+    Supports If-None-Match.
+    """
+    try:
+        async def payload() -> Dict:
+            return {"commodity": commodity,
+                    **await _chart_payload("commodities", {"commodity": commodity}, metric, days, max_points)}
         
-        if not history:
-            return {
-                "error": "No historical data",
-                "commodity": commodity
-            }
+        key = make_etag(await _data_version("commodities"), "charts/prices", commodity, metric, days, max_points)
+        return await conditional_json(request, key, payload)
+    
+    except Exception as e:
+        logger.error(f"Error in price chart: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@app.get("/charts/weather")
+async def get_weather_chart(request: Request,
+                            country: str = Query(...),
+                            metric: str = Query("rainfall_mm", pattern=(
+                                "^(rainfall_mm|temperature_min|temperature_max|humidity_percent|wind_speed_kmh)$"
+                            )),
+                            days: int = Query(CHART_DEFAULT_DAYS, ge=1, le=100000),
+                            max_points: int = Query(CHART_DEFAULT_POINTS, ge=3, le=5000)):
+    """
+    One daily weather metric for a chart, LTTB-downsampled to max_points
+    
+    Supports If-None-Match.
+    """
+    try:
+        async def payload() -> Dict:
+            return {"country": country,
+                    **await _chart_payload("weather", {"country": country}, metric, days, max_points)}
         
-        # Placeholder for ML prediction logic
-        # In production, would use Prophet or LSTM model
-        forecast = {
-            "commodity": commodity,
-            "days_ahead": days_ahead,
-            "historical_data": history[:10],  # Last 10 records
-            "forecast_trend": "stable",  # would be calculated by ML model
-            "confidence": 0.85,
-            "timestamp": datetime.utcnow().isoformat()
-        }
+        key = make_etag(await _data_version("weather"), "charts/weather", country, metric, days, max_points)
+        return await conditional_json(request, key, payload)
+    
+    except Exception as e:
+        logger.error(f"Error in weather chart: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@app.get("/charts/ndvi")
+async def get_ndvi_chart(request: Request,
+                         country: str = Query(...),
+                         crop: str = Query(...),
+                         region: str = Query(..., description="Tile name, e.g. Tile_0_0"),
+                         days: int = Query(CHART_DEFAULT_DAYS, ge=1, le=100000),
+                         max_points: int = Query(CHART_DEFAULT_POINTS, ge=3, le=5000)):
+    """
+    Daily NDVI history of one map tile, LTTB-downsampled to max_points
+    
+    Supports If-None-Match.
+    """
+    try:
+        async def payload() -> Dict:
+            series = await _chart_payload("ndvi_history", {"country": country, "crop": crop, "region": region},
+                                          "ndvi_value", days, max_points)
+            return {"country": country, "crop": crop, "region": region, **series}
         
-        return forecast
+        # ndvi_history is written in the same batch as satellites
+        key = make_etag(await _data_version("satellites"), "charts/ndvi", country, crop, region, days, max_points)
+        return await conditional_json(request, key, payload)
     
     except Exception as e:
-        logger.error(f"Error in price prediction: {str(e)}")
+        logger.error(f"Error in NDVI chart: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
 
 
 @app.get("/news-risk")
-async def get_news_risk(country: str = Query(...)):
+async def get_news_risk(request: Request, country: str = Query(...)):
     """
     Get news sentiment risk score for socio-political factors
+    
+    Supports If-None-Match; unchanged news returns 304.
     """
     try:
-        latest_news = news_collection.find(
-            {"country": country},
-            sort=[("date", -1)],
-            limit=20
-        )
-        
-        news_items = []
-        for item in latest_news:
-            item.pop("_id", None)
-            news_items.append(item)
-        
-        # Calculate aggregate sentiment risk
-        total_sentiment = sum(item.get("sentiment_score", 0) for item in news_items)
-        avg_risk = total_sentiment / len(news_items) if news_items else 0
-        
-        return {
-            "country": country,
-            "risk_score": avg_risk,
-            "risk_level": "high" if avg_risk > 0.7 else "medium" if avg_risk > 0.3 else "low",
-            "recent_news": news_items,
-            "timestamp": datetime.utcnow().isoformat()
-        }
+        key = make_etag(await _data_version("news"), "news-risk", country)
+        return await conditional_json(request, key, lambda: _news_risk_payload(country))
     
     except Exception as e:
         logger.error(f"Error in news risk: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@app.get("/health")
-async def health_check():
-    """Check API and database health"""
+@app.get("/dashboard")
+async def get_dashboard(country: str = Query(...),
+                        crop: str = Query(...),
+                        commodity: Optional[str] = Query(None, description="Defaults to the crop"),
+                        days: int = Query(30, ge=1, le=1000, description="Days of weather history"),
+                        days_ahead: int = Query(30, ge=1, le=PRICE_FORECAST_MAX_DAYS,
+                                                description="Price forecast horizon")):
+    """
+    Everything one dashboard render needs in a single round trip
+    
+    Sections are fetched concurrently; a failing section is reported under
+    "errors" instead of failing the whole bundle.
+    """
+    sections = {
+        "fusion_score": lambda: _fusion_score_payload(country, crop),
+        "crop_health": lambda: _crop_health_payload(country, crop),
+        "weather_forecast": lambda: _weather_forecast_payload(country, days),
+        "price_prediction": lambda: _price_prediction_payload(commodity or crop, days_ahead),
+        "news_risk": lambda: _news_risk_payload(country)
+    }
+    timings = {}
+    
+    async def timed(name, build):
+        started = time.perf_counter()
+        try:
+            return await build()
+        finally:
+            timings[name] = round((time.perf_counter() - started) * 1000, 2)
+    
+    started = time.perf_counter()
+    results = await asyncio.gather(
+        *(timed(name, build) for name, build in sections.items()),
+        return_exceptions=True
+    )
+    timings["total"] = round((time.perf_counter() - started) * 1000, 2)
+    
+    payload = {"country": country, "crop": crop, "errors": {}}
+    for name, result in zip(sections, results):
+        if isinstance(result, Exception):
+            logger.error(f"Error in dashboard section {name}: {str(result)}")
+            payload[name] = None
+            payload["errors"][name] = str(result)
+        else:
+            payload[name] = result
+    
+    payload["timings_ms"] = timings
+    payload["timestamp"] = datetime.utcnow().isoformat()
+    
+    # Section timings also show up in browser devtools
+    server_timing = ", ".join(f"{name};dur={ms}" for name, ms in timings.items())
+    return FastJSONResponse(payload, headers={"Server-Timing": server_timing})
+
+
+@app.get("/sync")
+async def sync(request: Request,
+               country: str = Query(...),
+               crop: str = Query(...),
+               commodity: Optional[str] = Query(None, description="Defaults to the crop"),
+               since: Optional[str] = Query(None, description="token from the previous sync")):
+    """
+    Delta sync for offline-first clients
+    
+    Returns fusion scores, tiles, weather, prices and news of the dashboard
+    scope written since the token, in columnar form and gzipped when
+    accepted, plus the token for the next sync. Unchanged collections are
+    omitted. With full_snapshot_required the client reloads /dashboard and
+    keeps the returned token.
+    """
     try:
-        # Test MongoDB connection
-        db.command("ismaster")
-        return {"status": "healthy", "database": "connected"}
+        scope = {"country": country, "crop": crop, "commodity": commodity or crop}
+        versions = await api_read_tier.get_or_load(
+            DATA_VERSIONS_KEY,
+            repository.get_data_versions,
+            CACHE_TTLS["data_versions"]
+        )
+        result = await collect_changes(repository, scope, since, versions or {})
+        result["timestamp"] = datetime.utcnow().isoformat()
+        return compact_json(request, result)
+    
     except Exception as e:
-        logger.error(f"Health check failed: {str(e)}")
+        logger.error(f"Error in sync: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@app.get("/updates")
+async def stream_updates(
+    country: str = Query(..., description="Country code (IN, US, BR, AR)"),
+    crop: Optional[str] = Query(None, description="Crop type; omit for every crop in the country")
+):
+    """
+    Server-Sent Events stream of fusion score deltas and refresh notices
+    
+    Replaces polling: events arrive when the scheduler or
+    FusionScoreCalculator writes new data.
+    """
+    try:
+        subscription = update_hub.subscribe(country, crop)
+    except OverflowError as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "30"})
+    
+    return StreamingResponse(
+        sse_stream(update_hub, subscription),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+@app.get("/updates/stats")
+async def update_stats():
+    """Connection and fan-out counters for the push channel"""
+    return update_hub.stats()
+
+
+@app.get("/model-pool/stats")
+async def model_pool_stats():
+    """Depth and outcome counters for the forecasting process pool"""
+    return model_pool.stats()
+
+
+@app.get("/admission/stats")
+async def admission_stats():
+    """Admitted, rate-limited and shed request counters for this worker"""
+    return admission.stats()
+
+
+@app.get("/metrics", include_in_schema=False)
+async def prometheus_metrics():
+    """Prometheus text format: HTTP, MongoDB command and process metrics"""
+    content, content_type = render_latest()
+    return Response(content=content, media_type=content_type)
+
+
+@app.get("/cache/stats")
+async def cache_stats():
+    """Hit/miss counters for the in-process and shared read caches"""
+    return {
+        "fusion_score": fusion_score_cache.stats(),
+        "api_reads": api_read_cache.stats(),
+        "rendered": rendered_cache.stats(),
+        "vector_tiles": tile_store.stats(),
+        "shared": shared_cache.stats(),
+        "singleflight": {
+            "fusion_score": fusion_score_tier.flight.stats(),
+            "api_reads": api_read_tier.flight.stats(),
+            "rendered": render_flight.stats()
+        }
+    }
+
+
+@app.get("/health")
+async def health_check():
+    """
+    Check API and database health
+    
+    Answered from the background prober's snapshot: MongoDB latency and
+    the age of each collection's latest write. Keeps the original
+    {"status": "healthy", "database": ...} contract, stale data included;
+    ready/degraded/not_ready are reported by /health/ready. 503 when
+    MongoDB was not reachable on recent probes.
+    """
+    readiness = prober.readiness()
+    if readiness["status"] == "not_ready":
         raise HTTPException(status_code=503, detail="Service unavailable")
+    details = {key: value for key, value in readiness.items() if key != "status"}
+    return FastJSONResponse({"status": "healthy", **details})
+
+
+@app.get("/health/live")
+async def liveness_check():
+    """Liveness: the worker is running; never touches MongoDB"""
+    liveness = prober.liveness()
+    return FastJSONResponse(liveness, status_code=503 if liveness["status"] == "stuck" else 200)
+
+
+@app.get("/health/ready")
+async def readiness_check():
+    """Readiness: ready / degraded (stale data) while the last probes reached MongoDB, else not_ready"""
+    readiness = prober.readiness()
+    return FastJSONResponse(readiness, status_code=503 if readiness["status"] == "not_ready" else 200)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,244 @@
+"""
+Prometheus metrics for the API and the scheduler
+
+- MetricsMiddleware: per-route latency histograms, status codes and
+  in-flight requests, labelled by route template (not raw path)
+- MongoCommandMetrics: pymongo/Motor command listener recording latency
+  per collection and command
+- track_phase / track_ingest: scheduler phase and ingestor timings
+- model pool call latency, depth and rejections (see model_pool)
+- admission control rejections and in-flight requests (see admission)
+- health prober MongoDB ping latency and data age (see health)
+
+The API serves these on /metrics; scheduler_v2 serves its process's
+metrics on SCHEDULER_METRICS_PORT. With several uvicorn workers set
+PROMETHEUS_MULTIPROC_DIR so /metrics aggregates across processes.
+"""
+
+import os
+import time
+from contextlib import contextmanager
+from typing import Dict, Tuple
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+)
+from prometheus_client import multiprocess
+from pymongo import monitoring
+
+HTTP_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+MONGO_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 5.0)
+
+# Long-lived streams and the scrape itself would skew the latency histograms
+UNTIMED_ROUTES = {"/metrics", "/updates"}
+
+HTTP_REQUEST_DURATION = Histogram(
+    "mdf_http_request_duration_seconds",
+    "HTTP request latency by route template",
+    ["method", "route"],
+    buckets=HTTP_BUCKETS
+)
+HTTP_REQUESTS = Counter(
+    "mdf_http_requests_total",
+    "HTTP requests by route template and status code",
+    ["method", "route", "status"]
+)
+HTTP_IN_FLIGHT = Gauge(
+    "mdf_http_requests_in_flight",
+    "HTTP requests currently being served",
+    ["method"],
+    multiprocess_mode="livesum"
+)
+
+MONGO_COMMAND_DURATION = Histogram(
+    "mdf_mongo_command_duration_seconds",
+    "MongoDB command latency by collection and command",
+    ["collection", "command"],
+    buckets=MONGO_BUCKETS
+)
+MONGO_COMMAND_FAILURES = Counter(
+    "mdf_mongo_command_failures_total",
+    "Failed MongoDB commands by collection and command",
+    ["collection", "command"]
+)
+
+MODEL_CALL_DURATION = Histogram(
+    "mdf_model_call_duration_seconds",
+    "Model pool call latency including queueing, by function and outcome",
+    ["function", "outcome"],
+    buckets=(0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+)
+MODEL_POOL_PENDING = Gauge(
+    "mdf_model_pool_pending",
+    "Model calls admitted and not yet finished",
+    multiprocess_mode="livesum"
+)
+MODEL_POOL_REJECTED = Counter(
+    "mdf_model_pool_rejected_total",
+    "Model calls rejected because the pool was saturated"
+)
+
+ADMISSION_REJECTED = Counter(
+    "mdf_admission_rejected_total",
+    "Requests refused by admission control, by priority class and reason",
+    ["priority", "reason"]
+)
+ADMISSION_IN_FLIGHT = Gauge(
+    "mdf_admission_in_flight",
+    "Admitted non-critical requests currently running",
+    multiprocess_mode="livesum"
+)
+
+MONGO_PING_SECONDS = Gauge(
+    "mdf_mongo_ping_seconds",
+    "MongoDB round trip measured by the last health probe",
+    multiprocess_mode="max"
+)
+DATA_AGE_SECONDS = Gauge(
+    "mdf_data_age_seconds",
+    "Seconds since a collection's writers last bumped its data version",
+    ["collection"],
+    multiprocess_mode="min"
+)
+
+SCHEDULER_PHASE_DURATION = Histogram(
+    "mdf_scheduler_phase_duration_seconds",
+    "Duration of each daily refresh phase",
+    ["phase"],
+    buckets=(1, 5, 15, 30, 60, 120, 300, 600, 1800)
+)
+SCHEDULER_INGESTS = Counter(
+    "mdf_scheduler_ingests_total",
+    "Ingestor calls by ingestor and outcome",
+    ["ingestor", "outcome"]
+)
+SCHEDULER_INGEST_DURATION = Histogram(
+    "mdf_scheduler_ingest_duration_seconds",
+    "Duration of a single ingestor call",
+    ["ingestor"],
+    buckets=(0.1, 0.5, 1, 2.5, 5, 10, 30, 60, 120)
+)
+SCHEDULER_REFRESHES = Counter(
+    "mdf_scheduler_refreshes_total",
+    "Daily refresh runs by outcome",
+    ["outcome"]
+)
+SCHEDULER_LAST_REFRESH = Gauge(
+    "mdf_scheduler_last_refresh_timestamp_seconds",
+    "Unix time the last daily refresh finished, by outcome",
+    ["outcome"],
+    multiprocess_mode="max"
+)
+
+
+class MetricsMiddleware:
+    """
+    Pure ASGI middleware, so streaming responses pass through untouched
+
+    The route label is the matched path template, which FastAPI stores on
+    the scope during routing; unmatched paths share one label.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        status = 500
+        started = time.perf_counter()
+
+        async def send_with_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        in_flight = HTTP_IN_FLIGHT.labels(method)
+        in_flight.inc()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            in_flight.dec()
+            route = scope.get("route")
+            template = route.path if route is not None else "unmatched"
+            HTTP_REQUESTS.labels(method, template, str(status)).inc()
+            if template not in UNTIMED_ROUTES:
+                HTTP_REQUEST_DURATION.labels(method, template).observe(time.perf_counter() - started)
+
+
+class MongoCommandMetrics(monitoring.CommandListener):
+    """
+    Command listener for MongoClient / AsyncIOMotorClient
+
+    Pass as event_listeners=[MongoCommandMetrics()]. The collection name is
+    only on the started event, so it is kept until the command completes.
+    """
+
+    def __init__(self):
+        self._pending: Dict[Tuple, str] = {}
+
+    @staticmethod
+    def _collection(event: monitoring.CommandStartedEvent) -> str:
+        if event.command_name == "getMore":
+            name = event.command.get("collection")
+        else:
+            name = event.command.get(event.command_name)
+        return name if isinstance(name, str) else "none"
+
+    def started(self, event):
+        self._pending[(event.connection_id, event.request_id)] = self._collection(event)
+
+    def succeeded(self, event):
+        collection = self._pending.pop((event.connection_id, event.request_id), "none")
+        MONGO_COMMAND_DURATION.labels(collection, event.command_name).observe(event.duration_micros / 1e6)
+
+    def failed(self, event):
+        collection = self._pending.pop((event.connection_id, event.request_id), "none")
+        MONGO_COMMAND_DURATION.labels(collection, event.command_name).observe(event.duration_micros / 1e6)
+        MONGO_COMMAND_FAILURES.labels(collection, event.command_name).inc()
+
+
+@contextmanager
+def track_phase(phase: str):
+    """Time one scheduler phase"""
+    with SCHEDULER_PHASE_DURATION.labels(phase).time():
+        yield
+
+
+@contextmanager
+def track_ingest(ingestor: str):
+    """Time one ingestor call and count it as success or failure"""
+    started = time.perf_counter()
+    try:
+        yield
+    except Exception:
+        SCHEDULER_INGESTS.labels(ingestor, "failure").inc()
+        raise
+    else:
+        SCHEDULER_INGESTS.labels(ingestor, "success").inc()
+    finally:
+        SCHEDULER_INGEST_DURATION.labels(ingestor).observe(time.perf_counter() - started)
+
+
+def record_refresh(outcome: str):
+    SCHEDULER_REFRESHES.labels(outcome).inc()
+    SCHEDULER_LAST_REFRESH.labels(outcome).set(time.time())
+
+
+def render_latest() -> Tuple[bytes, str]:
+    """Prometheus text exposition of this process, or of all workers in multiprocess mode"""
+    if os.getenv("PROMETHEUS_MULTIPROC_DIR"):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return generate_latest(registry), CONTENT_TYPE_LATEST
+    return generate_latest(REGISTRY), CONTENT_TYPE_LATEST
@@ -0,0 +1,204 @@
+"""
+Process pool for CPU-bound model calls
+
+Forecasting is numpy work that holds the GIL; run inline it stalls every
+other request on the worker. ModelPool runs such calls in worker
+processes with:
+
+- bounded depth: at most workers + MODEL_POOL_QUEUE_DEPTH calls admitted,
+  further calls fail fast with PoolSaturated (served as 503 + Retry-After)
+- per-call timeouts: the caller gets asyncio.TimeoutError; a call a worker
+  already started cannot be cancelled, so the pool is recycled: new calls
+  go to fresh workers and the old ones are killed (calls still running on
+  them fail), which frees their slots
+- recovery: a crashed worker breaks the pool, which is rebuilt
+
+The API creates one pool at startup and shuts it down on exit.
+"""
+
+import asyncio
+import importlib
+import logging
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Dict, Iterable, Optional
+
+from metrics import MODEL_CALL_DURATION, MODEL_POOL_PENDING, MODEL_POOL_REJECTED
+
+logger = logging.getLogger(__name__)
+
+MODEL_POOL_WORKERS = int(os.getenv("MODEL_POOL_WORKERS", str(min(2, os.cpu_count() or 1))))
+MODEL_POOL_QUEUE_DEPTH = int(os.getenv("MODEL_POOL_QUEUE_DEPTH", "8"))
+MODEL_CALL_TIMEOUT_SECONDS = float(os.getenv("MODEL_CALL_TIMEOUT_SECONDS", "10"))
+MODEL_POOL_RETRY_AFTER = int(os.getenv("MODEL_POOL_RETRY_AFTER", "5"))
+
+
+def _preload(modules: Iterable[str]):
+    """Worker initializer: import heavy modules before the first call"""
+    for module in modules:
+        importlib.import_module(module)
+
+
+class PoolSaturated(Exception):
+    """Raised instead of queueing when the pool is at its admitted depth"""
+
+    def __init__(self, retry_after: int):
+        super().__init__("Model pool saturated, retry later")
+        self.retry_after = retry_after
+
+
+class ModelPool:
+    """Bounded asyncio front end for a ProcessPoolExecutor"""
+
+    def __init__(self, workers: int = MODEL_POOL_WORKERS, queue_depth: int = MODEL_POOL_QUEUE_DEPTH,
+                 timeout: float = MODEL_CALL_TIMEOUT_SECONDS, retry_after: int = MODEL_POOL_RETRY_AFTER,
+                 preload: Iterable[str] = ()):
+        """
+        Args:
+            workers: Worker processes
+            queue_depth: Calls allowed to wait for a free worker
+            timeout: Default seconds a caller waits for one call
+            retry_after: Seconds advertised to rejected clients
+            preload: Modules each worker imports when it starts
+        """
+        self.workers = workers
+        self.preload = tuple(preload)
+        self.max_pending = workers + queue_depth
+        self.timeout = timeout
+        self.retry_after = retry_after
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._pending = 0
+
+        self.submitted = 0
+        self.completed = 0
+        self.failed = 0
+        self.timeouts = 0
+        self.rejected = 0
+        self.recycled = 0
+
+    def _new_executor(self) -> ProcessPoolExecutor:
+        # spawn: forking a process that runs driver threads can deadlock the child
+        return ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_preload,
+            initargs=(self.preload,)
+        )
+
+    async def start(self):
+        """Create the executor and start its workers before the first request"""
+        self._executor = self._new_executor()
+        loop = asyncio.get_running_loop()
+        await asyncio.gather(*(loop.run_in_executor(self._executor, os.getpid) for _ in range(self.workers)))
+        logger.info(f"Model pool started with {self.workers} workers, depth {self.max_pending}")
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    @property
+    def pending(self) -> int:
+        return self._pending
+
+    def _release(self):
+        self._pending -= 1
+        MODEL_POOL_PENDING.dec()
+
+    def _release_threadsafe(self, loop: asyncio.AbstractEventLoop):
+        # Done callbacks run on executor threads
+        try:
+            loop.call_soon_threadsafe(self._release)
+        except RuntimeError:  # loop already closed at shutdown
+            pass
+
+    async def run(self, fn: Callable, *args, timeout: Optional[float] = None) -> Any:
+        """
+        Run fn(*args) in a worker process
+
+        fn and args must be picklable (module-level function, plain data).
+        Raises PoolSaturated, asyncio.TimeoutError, or whatever fn raised.
+        """
+        if self._executor is None:
+            raise RuntimeError("Model pool is not started")
+        if self._pending >= self.max_pending:
+            self.rejected += 1
+            MODEL_POOL_REJECTED.inc()
+            raise PoolSaturated(self.retry_after)
+
+        name = getattr(fn, "__name__", "call")
+        started = time.perf_counter()
+        executor = self._executor
+        try:
+            future = executor.submit(fn, *args)
+        except BrokenProcessPool:
+            self._rebuild(executor)
+            executor = self._executor
+            future = executor.submit(fn, *args)
+
+        self._pending += 1
+        self.submitted += 1
+        MODEL_POOL_PENDING.inc()
+        loop = asyncio.get_running_loop()
+        future.add_done_callback(lambda done: self._release_threadsafe(loop))
+
+        outcome = "error"
+        try:
+            # On timeout the cancel reaches the call only if no worker picked it up yet
+            result = await asyncio.wait_for(asyncio.wrap_future(future), timeout or self.timeout)
+            outcome = "ok"
+            self.completed += 1
+            return result
+        except asyncio.TimeoutError:
+            outcome = "timeout"
+            self.timeouts += 1
+            if not future.done():
+                # Already in a worker, where only killing it stops the call
+                self._recycle(executor)
+            raise
+        except BrokenProcessPool:
+            self.failed += 1
+            self._rebuild(executor)
+            raise
+        except Exception:
+            self.failed += 1
+            raise
+        finally:
+            MODEL_CALL_DURATION.labels(name, outcome).observe(time.perf_counter() - started)
+
+    def _rebuild(self, broken: ProcessPoolExecutor):
+        # Concurrent failures of one broken executor rebuild it once
+        if self._executor is not broken:
+            return
+        logger.error("Model pool worker died; rebuilding the pool")
+        self._executor = self._new_executor()
+        broken.shutdown(wait=False, cancel_futures=True)
+
+    def _recycle(self, overrun: ProcessPoolExecutor):
+        if self._executor is not overrun:
+            return
+        logger.warning("Model call overran its timeout; recycling the pool")
+        self.recycled += 1
+        self._executor = self._new_executor()
+        # ProcessPoolExecutor cannot stop one call, so its workers are terminated;
+        # the executor then fails their futures, which releases the slots
+        processes = list((getattr(overrun, "_processes", None) or {}).values())
+        overrun.shutdown(wait=False, cancel_futures=True)
+        for process in processes:
+            process.terminate()
+
+    def stats(self) -> Dict:
+        return {
+            "workers": self.workers,
+            "max_pending": self.max_pending,
+            "pending": self._pending,
+            "submitted": self.submitted,
+            "completed": self.completed,
+            "failed": self.failed,
+            "timeouts": self.timeouts,
+            "rejected": self.rejected,
+            "recycled": self.recycled
+        }
@@ -1,6 +1,18 @@
 """Machine learning models for agriculture forecasting"""
 
-from .price_predictor import PricePredictor
-from .fusion_calculator import FusionScoreCalculator
+import importlib
+
+# numpy and scikit-learn load on first attribute access, not on import
+_EXPORTS = {
+    'PricePredictor': '.price_predictor',
+    'FusionScoreCalculator': '.fusion_calculator'
+}
+
+
+def __getattr__(name):
+    if name in _EXPORTS:
+        return getattr(importlib.import_module(_EXPORTS[name], __name__), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
 __all__ = ['PricePredictor', 'FusionScoreCalculator']
@@ -1,8 +1,15 @@
 import logging
 from datetime import datetime
-from typing import Dict, List
+from typing import Dict, List, Optional
 import numpy as np
 
+from pymongo import ReturnDocument
+
+from cache import fusion_score_cache, fusion_score_key
+from database.leaderboard import update_leaderboard
+from database.versions import bump_version
+from push import publish_update
+
 logger = logging.getLogger(__name__)
 
 
@@ -11,7 +18,7 @@ class FusionScoreCalculator:
     Advanced Fusion Score calculation with weighted components and confidence intervals
     """
     
-    def __init__(self, db, weights: Dict = None):
+    def __init__(self, db, weights: Dict = None, cache=None):
         """
         Initialize calculator with optional custom weights
         
@@ -19,9 +26,13 @@ class FusionScoreCalculator:
         - Regional importance
         - Seasonal factors
         - Commodity type
+        
+        cache: TTLCache bumped on every save (defaults to the shared
+        fusion score read cache)
         """
         self.db = db
         self.fusion_scores_collection = db["fusion_scores"]
+        self.cache = cache if cache is not None else fusion_score_cache
         
         # Default equal weights
         self.weights = weights or {
@@ -166,16 +177,43 @@ class FusionScoreCalculator:
             "expires_at": datetime.utcnow() + timedelta(days=1)  # TTL index
         }
         
-        self.fusion_scores_collection.update_one(
+        previous = self.fusion_scores_collection.find_one_and_update(
             {"country": country, "crop": crop},
             {"$set": document},
-            upsert=True
+            projection={"_id": 0, "fusion_score": 1, "risk_level": 1},
+            upsert=True,
+            return_document=ReturnDocument.BEFORE
         )
         
+        # Write-through so readers never see the previous score
+        self.cache.set(fusion_score_key(country, crop), dict(document))
+        update_leaderboard(self.db, document)
+        bump_version(self.db, "fusion_scores")
+        publish_update(self._score_delta(document, previous))
+        
         logger.info(f"Saved fusion score for {crop} in {country}: {scores['fusion_score']:.2f} ({scores['risk_level'].upper()})")
         
         return document
     
+    @staticmethod
+    def _score_delta(document: Dict, previous: Optional[Dict]) -> Dict:
+        """
+        Update event pushed to subscribed clients after a save
+        """
+        previous = previous or {}
+        previous_score = previous.get("fusion_score")
+        return {
+            "type": "fusion_score",
+            "country": document["country"],
+            "crop": document["crop"],
+            "fusion_score": document["fusion_score"],
+            "risk_level": document["risk_level"],
+            "previous_score": previous_score,
+            "delta": None if previous_score is None else round(document["fusion_score"] - previous_score, 2),
+            "risk_level_changed": previous.get("risk_level") not in (None, document["risk_level"]),
+            "timestamp": document["timestamp"]
+        }
+    
     def get_historical_scores(self, country: str, crop: str, days: int = 30) -> List[Dict]:
         """
         Retrieve historical fusion scores to track trends
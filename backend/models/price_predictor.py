@@ -2,11 +2,12 @@ import logging
 from datetime import datetime, timedelta
 from typing import List, Dict, Tuple
 import numpy as np
-from sklearn.preprocessing import MinMaxScaler
-import json
 
 logger = logging.getLogger(__name__)
 
+# Seasonal decomposition needs a full annual cycle of daily prices
+SEASONAL_MIN_POINTS = 365
+
 
 class PricePredictor:
     """
@@ -19,13 +20,21 @@ class PricePredictor:
         Initialize price predictor
         
         Args:
-            db: MongoDB connection
+            db: MongoDB connection, or None for forecasting only
             look_back: Number of historical days to use for prediction
         """
         self.db = db
-        self.commodities_collection = db["commodities"]
+        self.commodities_collection = db["commodities"] if db is not None else None
         self.look_back = look_back
-        self.scaler = MinMaxScaler(feature_range=(0, 1))
+        self._scaler = None
+    
+    @property
+    def scaler(self):
+        """MinMaxScaler, built on first use so forecasting never imports scikit-learn"""
+        if self._scaler is None:
+            from sklearn.preprocessing import MinMaxScaler
+            self._scaler = MinMaxScaler(feature_range=(0, 1))
+        return self._scaler
     
     def prepare_training_data(self, prices: List[float]) -> Tuple[np.ndarray, np.ndarray]:
         """
@@ -136,7 +145,7 @@ class PricePredictor:
         
         prices_with_dates: [{'date': datetime, 'price': float}, ...]
         """
-        if len(prices_with_dates) < 365:
+        if len(prices_with_dates) < SEASONAL_MIN_POINTS:
             logger.info("Insufficient data for seasonal decomposition")
             prices = [p['price'] for p in prices_with_dates]
             return self.simple_lstm_predict(prices, days_ahead)
@@ -153,7 +162,8 @@ class PricePredictor:
         seasonal = self._extract_seasonality(detrended, period=365)
         
         # Residuals (random noise)
-        residuals = detrended - seasonal
+        # Repeat the annual pattern across the detrended series
+        residuals = detrended - np.resize(seasonal, len(detrended))
         std_residuals = np.std(residuals)
         
         # Generate forecast
@@ -166,7 +176,7 @@ class PricePredictor:
             proj_trend = last_trend_value + trend_change * day
             
             # Get seasonal component (assume annual cycle)
-            seasonal_idx = (len(seasonal) + day) % 365
+            seasonal_idx = (len(detrended) - 1 + day) % 365
             proj_seasonal = seasonal[seasonal_idx] if seasonal_idx < len(seasonal) else 0
             
             # Random component
@@ -203,6 +213,24 @@ class PricePredictor:
         return seasonal
 
 
+def choose_model(points: int) -> str:
+    """Forecast model for a history of the given length"""
+    return "prophet_style" if points >= SEASONAL_MIN_POINTS else "exponential_smoothing"
+
+
+def run_forecast(model: str, prices_with_dates: List[Dict], days_ahead: int = 30) -> Dict:
+    """
+    Entry point for model_pool workers
+
+    Module-level and free of database handles so it pickles into a worker
+    process. model is "prophet_style" or "exponential_smoothing".
+    """
+    predictor = PricePredictor(db=None)
+    if model == "prophet_style":
+        return predictor.prophet_style_forecast(prices_with_dates, days_ahead)
+    return predictor.simple_lstm_predict([p["price"] for p in prices_with_dates], days_ahead)
+
+
 class SimpleLSTM:
     """
     Simplified LSTM-like model using NumPy (for environments without TensorFlow)
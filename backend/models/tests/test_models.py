@@ -2,7 +2,7 @@ import pytest
 import numpy as np
 from datetime import datetime, timedelta
 from unittest.mock import MagicMock
-from models.price_predictor import PricePredictor
+from models.price_predictor import PricePredictor, choose_model, run_forecast
 from models.fusion_calculator import FusionScoreCalculator
 
 
@@ -51,6 +51,16 @@ class TestPricePredictor:
         # Upper should be >= lower
         for i in range(30):
             assert forecast["confidence_interval"]["upper"][i] >= forecast["confidence_interval"]["lower"][i]
+    
+    def test_model_chosen_by_history_length(self):
+        start = datetime(2023, 1, 1)
+        short = [{"date": start + timedelta(days=i), "price": 300.0 + i} for i in range(100)]
+        year = [{"date": start + timedelta(days=i), "price": 300.0 + np.sin(i / 30)} for i in range(400)]
+        
+        assert choose_model(len(short)) == "exponential_smoothing"
+        assert choose_model(len(year)) == "prophet_style"
+        assert run_forecast(choose_model(len(short)), short, 14)["model"] == "exponential_smoothing"
+        assert len(run_forecast(choose_model(len(year)), year, 14)["forecasts"]) == 14
 
 
 class TestFusionCalculator:
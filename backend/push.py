@@ -0,0 +1,214 @@
+"""
+Push channel for fusion score and data refresh updates
+
+Clients hold a Server-Sent Events stream subscribed to a country (and
+optionally a crop) instead of polling. Writers call publish_update: with
+REDIS_URL set the event goes out on UPDATES_CHANNEL and every API worker
+relays it into its local UpdateHub; without it the event is delivered to
+the hub in the calling process.
+
+Idle connections cost one bounded queue and a parked coroutine. There are
+no per-connection timers: one hub-wide task offers keep-alives to streams
+with nothing queued.
+"""
+
+import asyncio
+import logging
+import os
+from typing import Any, AsyncIterator, Dict, Optional, Set
+
+from bson import json_util
+
+from cache import REDIS_URL
+from serialization import dumps
+
+try:
+    import redis
+    import redis.asyncio as aioredis
+except ImportError:  # optional dependency
+    redis = None
+    aioredis = None
+
+logger = logging.getLogger(__name__)
+
+UPDATES_CHANNEL = "macro_data_fusion:updates"
+# Events buffered per connection before the oldest is dropped
+SUBSCRIBER_QUEUE_SIZE = int(os.getenv("PUSH_QUEUE_SIZE", "32"))
+MAX_SUBSCRIBERS = int(os.getenv("PUSH_MAX_CONNECTIONS", "10000"))
+KEEPALIVE_SECONDS = float(os.getenv("PUSH_KEEPALIVE_SECONDS", "25"))
+
+ALL_CROPS = "*"
+# Queued to idle streams by UpdateHub.keepalive, written as an SSE comment
+KEEPALIVE = {"type": "keepalive"}
+
+
+class Subscription:
+    """One client stream: a topic and a bounded event queue"""
+
+    __slots__ = ("country", "crop", "queue", "dropped")
+
+    def __init__(self, country: str, crop: Optional[str], maxsize: int):
+        self.country = country
+        self.crop = crop or ALL_CROPS
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=maxsize)
+        self.dropped = 0
+
+    def offer(self, event: Dict):
+        """Enqueue without blocking; a slow client loses its oldest event"""
+        if self.queue.full():
+            self.queue.get_nowait()
+            self.dropped += 1
+        self.queue.put_nowait(event)
+
+
+class UpdateHub:
+    """
+    In-process fan-out of update events to subscribed streams
+
+    Subscriptions are indexed by (country, crop), so publishing touches
+    only the streams interested in the event. Events without a country
+    (refresh notices) go to every stream.
+    """
+
+    def __init__(self, queue_size: int = SUBSCRIBER_QUEUE_SIZE, max_subscribers: int = MAX_SUBSCRIBERS):
+        self.queue_size = queue_size
+        self.max_subscribers = max_subscribers
+        self._topics: Dict[tuple, Set[Subscription]] = {}
+        self._count = 0
+        self.published = 0
+        self.delivered = 0
+        self.dropped = 0
+
+    def subscribe(self, country: str, crop: Optional[str] = None) -> Subscription:
+        """Register a stream; raises OverflowError when the hub is full"""
+        if self._count >= self.max_subscribers:
+            raise OverflowError("Too many update subscribers")
+        subscription = Subscription(country, crop, self.queue_size)
+        self._topics.setdefault((subscription.country, subscription.crop), set()).add(subscription)
+        self._count += 1
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription):
+        topic = (subscription.country, subscription.crop)
+        subscribers = self._topics.get(topic)
+        if subscribers is None or subscription not in subscribers:
+            return
+        subscribers.discard(subscription)
+        if not subscribers:
+            del self._topics[topic]
+        self._count -= 1
+        self.dropped += subscription.dropped
+
+    def publish(self, event: Dict) -> int:
+        """Deliver event to matching streams; returns the number reached"""
+        self.published += 1
+        country = event.get("country")
+        if country is None:
+            targets = [s for subscribers in self._topics.values() for s in subscribers]
+        else:
+            targets = list(self._topics.get((country, ALL_CROPS), ()))
+            crop = event.get("crop")
+            if crop is not None:
+                targets.extend(self._topics.get((country, crop), ()))
+
+        for subscription in targets:
+            subscription.offer(event)
+        self.delivered += len(targets)
+        return len(targets)
+
+    async def keepalive(self, interval: float = KEEPALIVE_SECONDS):
+        """Keep idle streams open through proxies; runs until cancelled"""
+        while True:
+            await asyncio.sleep(interval)
+            for subscribers in list(self._topics.values()):
+                for subscription in subscribers:
+                    if subscription.queue.empty():
+                        subscription.queue.put_nowait(KEEPALIVE)
+
+    async def relay(self, url: Optional[str], retry_after: float = 30.0):
+        """
+        Feed events published by other processes into this hub
+
+        Runs until cancelled, resubscribing after connection errors.
+        """
+        if not url or aioredis is None:
+            return
+
+        client = aioredis.from_url(url)
+        try:
+            while True:
+                try:
+                    pubsub = client.pubsub()
+                    await pubsub.subscribe(UPDATES_CHANNEL)
+                    logger.info(f"Subscribed to {UPDATES_CHANNEL}")
+                    async for message in pubsub.listen():
+                        if message["type"] != "message":
+                            continue
+                        self.publish(json_util.loads(message["data"]))
+                except asyncio.CancelledError:
+                    raise
+                except Exception as e:
+                    logger.warning(f"Update relay error: {str(e)}")
+                    await asyncio.sleep(retry_after)
+        finally:
+            await client.aclose()
+
+    def stats(self) -> Dict:
+        return {
+            "connections": self._count,
+            "topics": len(self._topics),
+            "published": self.published,
+            "delivered": self.delivered,
+            "dropped": self.dropped + sum(
+                s.dropped for subscribers in self._topics.values() for s in subscribers
+            )
+        }
+
+
+update_hub = UpdateHub()
+
+_publisher = None
+
+
+def publish_update(event: Dict[str, Any]):
+    """
+    Send an update to subscribed clients; never raises
+
+    Synchronous so the scheduler and FusionScoreCalculator can call it
+    right after their writes.
+    """
+    global _publisher
+
+    if not REDIS_URL or redis is None:
+        update_hub.publish(event)
+        return
+
+    try:
+        if _publisher is None:
+            _publisher = redis.Redis.from_url(REDIS_URL, socket_timeout=2, socket_connect_timeout=2)
+        _publisher.publish(UPDATES_CHANNEL, json_util.dumps(event))
+    except Exception as e:
+        _publisher = None
+        logger.warning(f"Update publish failed: {str(e)}")
+
+
+def format_sse(event: Dict) -> bytes:
+    """One Server-Sent Events frame"""
+    return b"event: " + event.get("type", "message").encode("utf-8") + b"\ndata: " + dumps(event) + b"\n\n"
+
+
+async def sse_stream(hub: UpdateHub, subscription: Subscription) -> AsyncIterator[bytes]:
+    """
+    Yield events for one subscription. The subscription is released when
+    the client disconnects and the response cancels the generator.
+    """
+    try:
+        yield b"retry: 5000\n\n"
+        while True:
+            event = await subscription.queue.get()
+            if event is KEEPALIVE:
+                yield b": keep-alive\n\n"
+            else:
+                yield format_sse(event)
+    finally:
+        hub.unsubscribe(subscription)
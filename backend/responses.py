@@ -0,0 +1,82 @@
+"""
+Fast JSON responses for the API
+
+FastAPI runs jsonable_encoder over every dict an endpoint returns before
+the response class serializes it. Endpoints that return FastJSONResponse
+directly skip that walk and are serialized in one orjson pass.
+List endpoints can also stream newline-delimited JSON (NDJSON) or
+return rows as parallel column arrays (columnar).
+"""
+
+import gzip
+import logging
+from typing import Any, AsyncIterator, Dict, Iterable, List
+
+from fastapi import Request
+from fastapi.responses import JSONResponse, Response, StreamingResponse
+
+from serialization import dumps
+
+logger = logging.getLogger(__name__)
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+
+class FastJSONResponse(JSONResponse):
+    """JSONResponse rendered with orjson"""
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+def compact_json(request: Request, content: Any, min_size: int = 512) -> Response:
+    """
+    orjson body, gzipped when the client accepts it
+
+    For endpoints aimed at slow links. Applied per endpoint rather than as
+    middleware so SSE and NDJSON streams are never buffered by gzip.
+    """
+    body = dumps(content)
+    headers = {"Vary": "Accept-Encoding"}
+    if len(body) >= min_size and "gzip" in request.headers.get("accept-encoding", ""):
+        body = gzip.compress(body, compresslevel=6)
+        headers["Content-Encoding"] = "gzip"
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+def wants_ndjson(request: Request) -> bool:
+    """True when the client asked for newline-delimited JSON"""
+    return NDJSON_MEDIA_TYPE in request.headers.get("accept", "")
+
+
+async def _ndjson_lines(documents: AsyncIterator[Dict]) -> AsyncIterator[bytes]:
+    try:
+        async for document in documents:
+            yield dumps(document) + b"\n"
+    except Exception as e:
+        # Headers are already sent; a truncated stream is all we can signal
+        logger.error(f"NDJSON stream aborted: {str(e)}")
+
+
+def ndjson_response(documents: AsyncIterator[Dict], headers: Dict = None) -> StreamingResponse:
+    """Stream one JSON document per line as the iterator yields them"""
+    return StreamingResponse(_ndjson_lines(documents), media_type=NDJSON_MEDIA_TYPE, headers=headers)
+
+
+def columnar(documents: List[Dict], fields: Iterable[str], hoistable: Iterable[str] = ()) -> Dict:
+    """
+    Rows as parallel arrays, with repeated values sent once
+
+    Fields in hoistable that hold the same value in every document go to
+    "shared"; every other field becomes one array in "columns", indexed
+    like the documents. Missing values are null.
+    """
+    hoistable = set(hoistable)
+    shared, columns = {}, {}
+    for field in fields:
+        values = [document.get(field) for document in documents]
+        if field in hoistable and values and all(value == values[0] for value in values):
+            shared[field] = values[0]
+        else:
+            columns[field] = values
+    return {"count": len(documents), "shared": shared, "columns": columns}
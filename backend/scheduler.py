@@ -2,24 +2,18 @@ import schedule
 import time
 import logging
 from datetime import datetime
-from pymongo import MongoClient
-import os
 
 from ingestors.satellite_ingestor import ingest_satellite_data
 from ingestors.weather_ingestor import ingest_weather_data
 from ingestors.commodity_ingestor import ingest_commodity_data
 from ingestors.news_ingestor import ingest_news_data
 from fusion import calculate_and_save_fusion
+from database import create_sync_client, get_database
 
 logger = logging.getLogger(__name__)
 
-# MongoDB Connection
-MONGO_URI = os.getenv("MONGODB_URI", "mongodb://localhost:27017")
-client = MongoClient(MONGO_URI)
-db = client["macro_data_fusion"]
 
-
-def daily_data_refresh():
+def daily_data_refresh(db):
     """Run daily refresh of all data sources"""
     logger.info(f"Starting daily data refresh at {datetime.utcnow()}")
     
@@ -64,10 +58,10 @@ def daily_data_refresh():
         logger.error(f"Error in daily refresh: {str(e)}")
 
 
-def schedule_jobs():
+def schedule_jobs(db):
     """Schedule cron jobs"""
     # Run daily refresh at 2 AM UTC
-    schedule.every().day.at("02:00").do(daily_data_refresh)
+    schedule.every().day.at("02:00").do(daily_data_refresh, db)
     
     logger.info("Scheduler initialized")
 
@@ -82,5 +76,9 @@ def run_scheduler():
 
 if __name__ == "__main__":
     logging.basicConfig(level=logging.INFO)
-    schedule_jobs()
-    run_scheduler()
+    client = create_sync_client(minPoolSize=0)
+    try:
+        schedule_jobs(get_database(client))
+        run_scheduler()
+    finally:
+        client.close()
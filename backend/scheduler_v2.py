@@ -7,21 +7,23 @@ import schedule
 import time
 import logging
 from datetime import datetime, timedelta
-from pymongo import MongoClient
 import os
 from dotenv import load_dotenv
 
-from ingestors import (
-    ingest_satellite_data,
-    ingest_weather_data,
-    ingest_commodity_data,
-    ingest_news_data
-)
-from models.fusion_calculator import FusionScoreCalculator
-
-# Load environment variables
+# Load environment variables before the modules below read their settings
+# (REDIS_URL and the cache settings) at import
 load_dotenv()
 
+# Ingestors and models load on first use (see the package __init__s), so
+# the scheduler starts without numpy, requests or feedparser
+import ingestors
+import models
+from database import bootstrap_indexes, create_sync_client, get_database, mongo_uri
+from cache import publish_invalidation, REDIS_URL, DATA_VERSIONS_KEY
+from push import publish_update
+from metrics import MongoCommandMetrics, record_refresh, track_ingest, track_phase
+from prometheus_client import start_http_server
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -33,10 +35,8 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-# MongoDB Connection
-MONGO_URI = os.getenv("MONGODB_URI", "mongodb://localhost:27017")
-client = MongoClient(MONGO_URI)
-db = client["macro_data_fusion"]
+# Prometheus scrape port for phase/ingestor metrics; 0 disables it
+METRICS_PORT = int(os.getenv("SCHEDULER_METRICS_PORT", "9101"))
 
 
 class DataRefreshScheduler:
@@ -47,7 +47,13 @@ class DataRefreshScheduler:
         self.countries = ["IN", "US", "BR", "AR"]
         self.crops = ["wheat", "rice", "corn", "soybeans"]
         self.commodities = ["wheat", "corn", "soybeans", "rice"]
-        self.calculator = FusionScoreCalculator(db)
+        self._calculator = None
+    
+    @property
+    def calculator(self):
+        if self._calculator is None:
+            self._calculator = models.FusionScoreCalculator(self.db)
+        return self._calculator
     
     def run_daily_refresh(self):
         """Execute full daily data refresh pipeline"""
@@ -62,23 +68,37 @@ class DataRefreshScheduler:
         try:
             # Phase 1: Ingest satellite data
             logger.info("\n[PHASE 1] Ingesting satellite data...")
-            self._ingest_satellite_phase(errors)
+            with track_phase("satellite"):
+                self._ingest_satellite_phase(errors)
+            self._invalidate_caches("crop_health:")
+            self._notify_clients("satellites")
             
             # Phase 2: Ingest weather data
             logger.info("\n[PHASE 2] Ingesting weather forecasts...")
-            self._ingest_weather_phase(errors)
+            with track_phase("weather"):
+                self._ingest_weather_phase(errors)
+            self._invalidate_caches("weather_forecast:")
+            self._notify_clients("weather")
             
             # Phase 3: Ingest commodity prices
             logger.info("\n[PHASE 3] Ingesting commodity prices...")
-            self._ingest_commodity_phase(errors)
+            with track_phase("commodity"):
+                self._ingest_commodity_phase(errors)
+            self._invalidate_caches("price_forecast:", "price_bars:")
+            self._notify_clients("commodities")
             
             # Phase 4: Ingest news and sentiment
             logger.info("\n[PHASE 4] Ingesting news and sentiment...")
-            self._ingest_news_phase(errors)
+            with track_phase("news"):
+                self._ingest_news_phase(errors)
+            self._invalidate_caches("news_risk:")
+            self._notify_clients("news")
             
             # Phase 5: Calculate fusion scores
             logger.info("\n[PHASE 5] Calculating fusion scores...")
-            self._calculate_fusion_phase(errors)
+            with track_phase("fusion"):
+                self._calculate_fusion_phase(errors)
+            self._invalidate_caches("fusion_score:")
             
             # Summary
             elapsed = time.time() - start_time
@@ -93,9 +113,27 @@ class DataRefreshScheduler:
                     logger.warning(f"  - {error}")
             
             logger.info("="*80 + "\n")
+            record_refresh("partial" if errors else "success")
         
         except Exception as e:
             logger.error(f"CRITICAL ERROR in daily refresh: {str(e)}", exc_info=True)
+            record_refresh("failure")
+    
+    def _invalidate_caches(self, *prefixes: str):
+        """Drop refreshed keys from the shared API cache and notify workers"""
+        # Data version counters changed too, so cached ETag inputs go as well
+        deleted = publish_invalidation(REDIS_URL, prefixes + (DATA_VERSIONS_KEY,))
+        if REDIS_URL:
+            logger.info(f"  Invalidated {', '.join(prefixes)} ({deleted} shared keys)")
+    
+    def _notify_clients(self, collection: str):
+        """Tell subscribed dashboards a collection was refreshed"""
+        # Fusion scores push their own per-pair deltas on save
+        publish_update({
+            "type": "data_updated",
+            "collection": collection,
+            "timestamp": datetime.utcnow()
+        })
     
     def _ingest_satellite_phase(self, errors: list):
         """Satellite data ingestion"""
@@ -103,7 +141,8 @@ class DataRefreshScheduler:
             for country in self.countries:
                 for crop in self.crops:
                     try:
-                        health_score = ingest_satellite_data(self.db, country, crop)
+                        with track_ingest("satellite"):
+                            health_score = ingestors.ingest_satellite_data(self.db, country, crop)
                         logger.info(f"  ✓ {crop.upper()} in {country}: health={health_score:.2f}")
                     except Exception as e:
                         error_msg = f"Satellite ingestion failed for {crop} in {country}: {str(e)}"
@@ -118,7 +157,8 @@ class DataRefreshScheduler:
         try:
             for country in self.countries:
                 try:
-                    weather_score = ingest_weather_data(self.db, country)
+                    with track_ingest("weather"):
+                        weather_score = ingestors.ingest_weather_data(self.db, country)
                     logger.info(f"  ✓ {country}: weather_score={weather_score:.2f}")
                 except Exception as e:
                     error_msg = f"Weather ingestion failed for {country}: {str(e)}"
@@ -133,7 +173,8 @@ class DataRefreshScheduler:
         try:
             for commodity in self.commodities:
                 try:
-                    trend_data = ingest_commodity_data(self.db, commodity)
+                    with track_ingest("commodity"):
+                        trend_data = ingestors.ingest_commodity_data(self.db, commodity)
                     logger.info(f"  ✓ {commodity.upper()}: trend={trend_data['trend']}, volatility={trend_data['volatility']:.2f}")
                 except Exception as e:
                     error_msg = f"Commodity ingestion failed for {commodity}: {str(e)}"
@@ -148,7 +189,8 @@ class DataRefreshScheduler:
         try:
             for country in self.countries:
                 try:
-                    news_risk = ingest_news_data(self.db, country)
+                    with track_ingest("news"):
+                        news_risk = ingestors.ingest_news_data(self.db, country)
                     logger.info(f"  ✓ {country}: news_risk={news_risk:.2f}")
                 except Exception as e:
                     error_msg = f"News ingestion failed for {country}: {str(e)}"
@@ -192,7 +234,7 @@ class DataRefreshScheduler:
             errors.append(f"Fusion phase: {str(e)}")
 
 
-def schedule_jobs():
+def schedule_jobs(db):
     """Configure scheduled jobs"""
     scheduler = DataRefreshScheduler(db)
     
@@ -211,7 +253,11 @@ def schedule_jobs():
 def run_scheduler():
     """Main scheduler loop"""
     logger.info("Starting Macro-Data Fusion Scheduler")
-    logger.info(f"MongoDB: {MONGO_URI}")
+    logger.info(f"MongoDB: {mongo_uri()}")
+    
+    # One refresh runs at a time, so a small pool is enough
+    client = create_sync_client(event_listeners=[MongoCommandMetrics()], minPoolSize=0)
+    db = get_database(client)
     
     try:
         # Test connection
@@ -219,9 +265,18 @@ def run_scheduler():
         logger.info("MongoDB connection successful")
     except Exception as e:
         logger.error(f"MongoDB connection failed: {str(e)}")
+        client.close()
         raise
     
-    schedule_jobs()
+    scans = bootstrap_indexes(db)
+    if scans:
+        logger.warning(f"Queries without index support: {', '.join(scans)}")
+    
+    if METRICS_PORT:
+        start_http_server(METRICS_PORT)
+        logger.info(f"Metrics on :{METRICS_PORT}/metrics")
+    
+    schedule_jobs(db)
     
     logger.info("Scheduler ready. Waiting for scheduled tasks...")
     
@@ -234,6 +289,8 @@ def run_scheduler():
     except Exception as e:
         logger.error(f"Scheduler error: {str(e)}", exc_info=True)
         raise
+    finally:
+        client.close()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,29 @@
+"""
+JSON serialization shared by API responses and the push channel
+
+Kept free of FastAPI so processes that only publish updates (the
+scheduler) can serialize payloads without importing the web stack.
+"""
+
+from typing import Any
+
+import orjson
+from bson import ObjectId
+
+
+def _default(value: Any) -> Any:
+    """Types orjson does not handle natively"""
+    if isinstance(value, ObjectId):
+        return str(value)
+    if isinstance(value, (set, frozenset)):
+        return list(value)
+    raise TypeError(f"Type is not JSON serializable: {type(value).__name__}")
+
+
+def dumps(content: Any) -> bytes:
+    """Serialize API payloads (datetimes, numpy values, ObjectIds) to JSON bytes"""
+    return orjson.dumps(
+        content,
+        default=_default,
+        option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+    )
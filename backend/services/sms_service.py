@@ -1,4 +1,3 @@
-from twilio.rest import Client
 from typing import Optional
 import os
 import logging
@@ -15,6 +14,8 @@ class SMSService:
         
         # Initialize Twilio only if credentials are real
         if self.account_sid != "test_sid":
+            # twilio is only imported when SMS can actually be sent
+            from twilio.rest import Client
             self.client = Client(self.account_sid, self.auth_token)
         else:
             self.client = None
@@ -0,0 +1,128 @@
+import re
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from admission import (
+    AdmissionController, AdmissionMiddleware, BucketTable, priority_class,
+    CRITICAL_PATHS, EXEMPT_PATHS, HEAVY_PATHS, NORMAL_PATHS, PREFIX_CLASSES
+)
+
+
+class FakeClock:
+    """Manually advanced monotonic clock"""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestBucketTable:
+    """Test in-memory token buckets"""
+
+    def test_burst_then_refill(self):
+        clock = FakeClock()
+        table = BucketTable(rate=2, burst=3, timer=clock)
+
+        assert [table.take("a") for _ in range(3)] == [0, 0, 0]
+        assert table.take("a") == pytest.approx(0.5)
+
+        clock.now = 0.5
+        assert table.take("a") == 0
+        assert table.take("b") == 0
+
+    def test_lru_bound(self):
+        table = BucketTable(rate=1, burst=1, maxsize=2, timer=FakeClock())
+        for key in ("a", "b", "c"):
+            table.take(key)
+
+        assert len(table) == 2
+
+
+class TestAdmissionController:
+    """Test priority classes, rate limits and shedding"""
+
+    def test_priority_classes(self):
+        assert priority_class("/health") == "critical"
+        assert priority_class("/fusion-score") == "critical"
+        assert priority_class("/weather/forecast") == "heavy"
+        assert priority_class("/news-risk") == "normal"
+        assert priority_class("/map/tiles/6/44/28.mvt") == "tile"
+
+    def test_fan_out_routes_are_heavy(self):
+        assert priority_class("/sync") == "heavy"
+        assert priority_class("/fusion-score/top") == "heavy"
+        assert priority_class("/commodities/wheat/bars") == "heavy"
+
+    def test_every_route_has_an_explicit_class(self):
+        from main import app
+
+        listed = CRITICAL_PATHS | HEAVY_PATHS | NORMAL_PATHS | EXEMPT_PATHS
+        for route in app.routes:
+            path = re.sub(r"\{[^}]+\}", "1", route.path)
+            assert path in listed or any(path.startswith(prefix) for prefix, _ in PREFIX_CLASSES), route.path
+
+    def test_map_pan_is_not_rate_limited(self):
+        controller = AdmissionController(timer=FakeClock())
+
+        # A pan over a 4K viewport requests a few dozen tiles at once
+        for x in range(40):
+            assert controller.admit("viewer", f"/map/tiles/6/{x}/28.mvt") is None
+            controller.release()
+        assert controller.rate_limited == 0
+
+    def test_heavy_requests_shed_before_critical(self):
+        controller = AdmissionController(heavy_inflight=1, max_inflight=2, timer=FakeClock())
+
+        assert controller.admit("a", "/map/health") is None
+        status, retry_after, _ = controller.admit("b", "/weather/forecast")
+        assert (status, retry_after) == (503, controller.shed_retry_after)
+        assert controller.admit("b", "/news-risk") is None
+        assert controller.admit("c", "/news-risk")[0] == 503
+        assert controller.admit("c", "/fusion-score") is None
+
+        controller.release()
+        controller.release()
+        assert controller.admit("b", "/weather/forecast") is None
+        assert controller.stats()["shed"] == 2
+
+    def test_rate_limit_is_per_client(self):
+        controller = AdmissionController(timer=FakeClock())
+        burst = int(controller.client_buckets["heavy"].burst)
+
+        for _ in range(burst):
+            assert controller.admit("noisy", "/weather/forecast") is None
+            controller.release()
+
+        status, retry_after, _ = controller.admit("noisy", "/weather/forecast")
+        assert status == 429 and retry_after >= 1
+        assert controller.admit("quiet", "/weather/forecast") is None
+        assert controller.admit("noisy", "/health") is None
+
+
+class TestAdmissionMiddleware:
+    """Test rejected requests over HTTP"""
+
+    def test_429_with_retry_after(self):
+        app = FastAPI()
+        controller = AdmissionController(timer=FakeClock())
+        app.add_middleware(AdmissionMiddleware, controller=controller, enabled=True)
+
+        @app.get("/weather/forecast")
+        async def forecast():
+            return {"ok": True}
+
+        @app.get("/health")
+        async def health():
+            return {"status": "healthy"}
+
+        client = TestClient(app)
+        statuses = [client.get("/weather/forecast").status_code for _ in range(10)]
+
+        assert statuses.count(429) > 0
+        limited = client.get("/weather/forecast")
+        assert limited.status_code == 429
+        assert int(limited.headers["retry-after"]) >= 1
+        assert client.get("/health").status_code == 200
+        assert controller.in_flight == 0
@@ -0,0 +1,281 @@
+import asyncio
+import pytest
+from datetime import datetime
+from unittest.mock import AsyncMock, MagicMock
+from cache import TTLCache, SharedCache, SingleFlight, TieredCache, fusion_score_key, price_bars_key
+from cache.shared import serialize, deserialize
+from models.fusion_calculator import FusionScoreCalculator
+from http_cache import conditional_json, etag_matches, make_etag, rendered_cache, seconds_until_refresh
+
+
+class FakeClock:
+    """Manually advanced monotonic clock"""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestTTLCache:
+    """Test in-process TTL/LRU cache"""
+
+    @pytest.fixture
+    def clock(self):
+        return FakeClock()
+
+    def test_hit_and_miss_counters(self, clock):
+        cache = TTLCache(maxsize=4, ttl=60, timer=clock)
+        cache.set("a", 1)
+
+        assert cache.get("a") == 1
+        assert cache.get("b") is None
+
+        stats = cache.stats()
+        assert stats["hits"] == 1
+        assert stats["misses"] == 1
+        assert stats["hit_ratio"] == 0.5
+
+    def test_entries_expire_after_ttl(self, clock):
+        cache = TTLCache(maxsize=4, ttl=60, timer=clock)
+        cache.set("a", 1)
+        cache.set("b", 2, ttl=300)
+
+        clock.now = 61
+        assert cache.get("a") is None
+        assert cache.get("b") == 2
+        assert cache.stats()["expirations"] == 1
+
+    def test_lru_eviction(self, clock):
+        cache = TTLCache(maxsize=2, ttl=60, timer=clock)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")  # "b" is now least recently used
+        cache.set("c", 3)
+
+        assert "b" not in cache
+        assert cache.get("a") == 1
+        assert cache.get("c") == 3
+        assert cache.stats()["evictions"] == 1
+
+    def test_save_fusion_score_bumps_cache(self, clock):
+        cache = TTLCache(maxsize=4, ttl=60, timer=clock)
+        key = fusion_score_key("IN", "wheat")
+        cache.set(key, {"fusion_score": 10.0})
+
+        calculator = FusionScoreCalculator(MagicMock(), cache=cache)
+        scores = calculator.calculate_fusion_score(80, 80, 80, 80)
+        calculator.save_fusion_score("IN", "wheat", scores)
+
+        assert cache.get(key)["fusion_score"] == 80.0
+
+
+class TestTieredCache:
+    """Test in-process + shared read-through tiers"""
+
+    @pytest.fixture
+    def shared(self):
+        shared = SharedCache(None)
+        shared._client = MagicMock()
+        shared._client.get = AsyncMock(return_value=None)
+        shared._client.set = AsyncMock()
+        return shared
+
+    def test_serialization_keeps_datetimes(self):
+        value = {"timestamp": datetime(2024, 1, 1, 2, 0), "fusion_score": 71.5}
+        assert deserialize(serialize(value)) == value
+
+    @pytest.mark.asyncio
+    async def test_miss_loads_and_fills_both_tiers(self, shared):
+        tier = TieredCache(TTLCache(), shared)
+        loader = AsyncMock(return_value={"fusion_score": 71.5})
+
+        assert await tier.get_or_load("fusion_score:IN:wheat", loader, 60) == {"fusion_score": 71.5}
+        assert await tier.get_or_load("fusion_score:IN:wheat", loader, 60) == {"fusion_score": 71.5}
+
+        loader.assert_awaited_once()
+        shared._client.set.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_shared_hit_fills_local_tier(self, shared):
+        shared._client.get = AsyncMock(return_value=serialize([{"ndvi_value": 0.7}]))
+        local = TTLCache()
+        tier = TieredCache(local, shared)
+        loader = AsyncMock()
+
+        assert await tier.get_or_load("crop_health:IN:wheat", loader, 60) == [{"ndvi_value": 0.7}]
+        assert local.get("crop_health:IN:wheat") == [{"ndvi_value": 0.7}]
+        loader.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_store_down_falls_back_to_local_tier(self, shared):
+        shared._client.get = AsyncMock(side_effect=ConnectionError("refused"))
+        tier = TieredCache(TTLCache(), shared)
+        loader = AsyncMock(return_value=[{"rainfall_mm": 4.0}])
+
+        await tier.get_or_load("weather_forecast:IN:30", loader, 60)
+        await tier.get_or_load("weather_forecast:IN:30", loader, 60)
+
+        assert not shared.available
+        assert shared.errors == 1
+        loader.assert_awaited_once()
+
+    def test_invalidate_prefix(self):
+        cache = TTLCache()
+        cache.set("news_risk:IN", [1])
+        cache.set("news_risk:US", [2])
+        cache.set("fusion_score:IN:wheat", {})
+
+        assert cache.invalidate_prefix("news_risk:") == 2
+        assert "fusion_score:IN:wheat" in cache
+
+    def test_closed_price_bars_miss_after_new_prices(self):
+        # The refresh can add the last day of a period that has just closed
+        before = price_bars_key("wheat", "week", "2024-03-04", 7)
+        after = price_bars_key("wheat", "week", "2024-03-04", 8)
+
+        assert before != after
+        assert before.startswith("price_bars:") and after.startswith("price_bars:")
+
+
+class TestSingleFlight:
+    """Test coalescing of concurrent cache misses"""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_calls_share_one_execution(self):
+        flight = SingleFlight()
+        calls = 0
+
+        async def load():
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.01)
+            return {"fusion_score": 71.5}
+
+        results = await asyncio.gather(*(flight.do("fusion_score:IN:wheat", load) for _ in range(10)))
+
+        assert calls == 1
+        assert all(result == {"fusion_score": 71.5} for result in results)
+        assert flight.stats()["executions"] == 1
+        assert flight.stats()["coalesced"] == 9
+        assert flight.in_flight == 0
+
+    @pytest.mark.asyncio
+    async def test_errors_reach_every_waiter_and_are_not_kept(self):
+        flight = SingleFlight()
+        loader = AsyncMock(side_effect=ConnectionError("refused"))
+
+        results = await asyncio.gather(
+            flight.do("news_risk:IN", loader),
+            flight.do("news_risk:IN", loader),
+            return_exceptions=True
+        )
+
+        assert all(isinstance(result, ConnectionError) for result in results)
+        loader.assert_awaited_once()
+
+        loader.side_effect = None
+        loader.return_value = [{"title": "Drought"}]
+        assert await flight.do("news_risk:IN", loader) == [{"title": "Drought"}]
+
+    @pytest.mark.asyncio
+    async def test_cancelled_caller_does_not_cancel_waiters(self):
+        flight = SingleFlight()
+
+        async def load():
+            await asyncio.sleep(0.02)
+            return [{"ndvi_value": 0.7}]
+
+        leader = asyncio.ensure_future(flight.do("crop_health:IN:wheat", load))
+        await asyncio.sleep(0)
+        follower = asyncio.ensure_future(flight.do("crop_health:IN:wheat", load))
+        await asyncio.sleep(0)
+        leader.cancel()
+
+        assert await follower == [{"ndvi_value": 0.7}]
+
+    @pytest.mark.asyncio
+    async def test_tiered_cache_coalesces_misses(self):
+        shared = SharedCache(None)
+        tier = TieredCache(TTLCache(), shared)
+        loader = AsyncMock(return_value=[{"rainfall_mm": 4.0}])
+
+        await asyncio.gather(*(tier.get_or_load("weather_forecast:IN:30", loader, 60) for _ in range(5)))
+
+        loader.assert_awaited_once()
+        assert tier.flight.coalesced == 4
+
+
+class TestConditionalGet:
+    """Test ETag and Cache-Control helpers"""
+
+    def request(self, if_none_match=None):
+        request = MagicMock()
+        request.headers = {"if-none-match": if_none_match} if if_none_match else {}
+        return request
+
+    def test_etag_changes_with_version_and_params(self):
+        etag = make_etag({"version": 3}, "fusion-score", "IN", "wheat")
+
+        assert etag == make_etag({"version": 3}, "fusion-score", "IN", "wheat")
+        assert etag != make_etag({"version": 4}, "fusion-score", "IN", "wheat")
+        assert etag != make_etag({"version": 3}, "fusion-score", "US", "wheat")
+        assert etag.startswith('"') and etag.endswith('"')
+
+    def test_if_none_match(self):
+        etag = make_etag({"version": 1}, "news-risk", "IN")
+
+        assert etag_matches(self.request(etag), etag)
+        assert etag_matches(self.request(f'"other", W/{etag}'), etag)
+        assert etag_matches(self.request("*"), etag)
+        assert not etag_matches(self.request('"other"'), etag)
+        assert not etag_matches(self.request(), etag)
+
+    @pytest.mark.asyncio
+    async def test_etag_follows_rendered_body(self):
+        rendered_cache.clear()
+        key = make_etag({"version": 2}, "fusion-score", "IN", "wheat")
+        scores = [{"fusion_score": 10.0}, {"fusion_score": 80.0}]
+
+        async def payload():
+            return scores[0]
+
+        # First render under the new version came from a stale read cache
+        stale = await conditional_json(self.request(), key, payload)
+        assert (await conditional_json(self.request(stale.headers["etag"]), key, payload)).status_code == 304
+
+        # Once the rendered body expires the fresh payload gets its own ETag,
+        # so clients holding the stale one are not answered 304
+        rendered_cache.clear()
+        scores.pop(0)
+        fresh = await conditional_json(self.request(stale.headers["etag"]), key, payload)
+
+        assert fresh.status_code == 200
+        assert fresh.headers["etag"] != stale.headers["etag"]
+        rendered_cache.clear()
+
+    @pytest.mark.asyncio
+    async def test_etag_survives_rerender_of_unchanged_data(self):
+        rendered_cache.clear()
+        key = make_etag({"version": 2}, "news-risk", "IN")
+        renders = []
+
+        async def payload():
+            renders.append(1)
+            return {"country": "IN", "risk_score": 40.0, "timestamp": f"2024-06-01T12:00:0{len(renders)}"}
+
+        first = await conditional_json(self.request(), key, payload)
+        # Render cache expired, or another worker renders the same data
+        rendered_cache.clear()
+        again = await conditional_json(self.request(first.headers["etag"]), key, payload)
+
+        assert len(renders) == 2
+        assert again.status_code == 304
+        rendered_cache.clear()
+
+    def test_max_age_runs_until_next_refresh(self):
+        # Default refresh at 02:00 UTC with a 60 minute window
+        assert seconds_until_refresh(datetime(2024, 1, 1, 1, 0)) == 3600
+        assert seconds_until_refresh(datetime(2024, 1, 1, 2, 30)) == 60
+        assert seconds_until_refresh(datetime(2024, 1, 1, 4, 0)) == 22 * 3600
@@ -0,0 +1,34 @@
+from unittest.mock import MagicMock
+from database.connection import client_options, create_sync_client, get_database
+
+
+class TestConnection:
+    """Test shared client settings"""
+
+    def test_client_options_from_env(self, monkeypatch):
+        monkeypatch.setenv("MONGO_MAX_POOL_SIZE", "25")
+
+        options = client_options()
+
+        assert options["maxPoolSize"] == 25
+        assert options["serverSelectionTimeoutMS"] == 5000
+
+    def test_overrides_win(self):
+        listener = MagicMock()
+
+        options = client_options(minPoolSize=0, event_listeners=[listener])
+
+        assert options["minPoolSize"] == 0
+        assert options["event_listeners"] == [listener]
+
+    def test_uri_and_database_read_when_client_is_built(self, monkeypatch):
+        # Entry points load .env after importing the database package
+        monkeypatch.setenv("MONGODB_URI", "mongodb://db.internal:27018")
+        monkeypatch.setenv("MONGODB_DB_NAME", "fusion_staging")
+
+        client = create_sync_client(connect=False)
+        try:
+            assert client.topology_description.server_descriptions().keys() == {("db.internal", 27018)}
+            assert get_database(client).name == "fusion_staging"
+        finally:
+            client.close()
@@ -0,0 +1,81 @@
+from datetime import datetime, timedelta
+
+import numpy as np
+import pytest
+
+from downsampling import downsample, lttb_indices
+
+
+def reference_lttb(x, y, max_points):
+    """Textbook loop implementation (Steinarsson 2013) over the same buckets"""
+    n = len(x)
+    edges = np.linspace(1, n - 1, max_points - 1).astype(int)
+    kept, a = [0], 0
+    for bucket in range(max_points - 2):
+        start, end = edges[bucket], edges[bucket + 1]
+        if bucket + 2 < len(edges):
+            following = range(edges[bucket + 1], edges[bucket + 2])
+            cx = sum(x[i] for i in following) / len(following)
+            cy = sum(y[i] for i in following) / len(following)
+        else:
+            cx, cy = x[-1], y[-1]
+        best, best_area = start, -1.0
+        for i in range(start, end):
+            area = abs((x[a] - cx) * (y[i] - y[a]) - (x[a] - x[i]) * (cy - y[a]))
+            if area > best_area:
+                best, best_area = i, area
+        kept.append(best)
+        a = best
+    return kept + [n - 1]
+
+
+class TestLttb:
+    """Test the vectorized LTTB against the loop definition"""
+
+    def test_matches_reference(self):
+        rng = np.random.default_rng(7)
+        x = np.arange(5000, dtype=float)
+        y = np.cumsum(rng.normal(size=5000))
+
+        assert lttb_indices(x, y, 100).tolist() == reference_lttb(x, y, 100)
+
+    def test_keeps_endpoints_and_size(self):
+        x = np.arange(1000, dtype=float)
+        kept = lttb_indices(x, np.sin(x / 20), 50)
+
+        assert len(kept) == 50
+        assert kept[0] == 0 and kept[-1] == 999
+        assert np.all(np.diff(kept) > 0)
+
+    def test_keeps_spike(self):
+        y = np.zeros(10000)
+        y[6543] = 100.0
+
+        assert 6543 in lttb_indices(np.arange(10000, dtype=float), y, 20)
+
+    def test_short_series_unchanged(self):
+        assert lttb_indices(np.arange(10.0), np.arange(10.0), 50).tolist() == list(range(10))
+
+    def test_rejects_fewer_than_three_points(self):
+        with pytest.raises(ValueError):
+            lttb_indices(np.arange(10.0), np.arange(10.0), 2)
+
+
+class TestDownsample:
+    """Test downsampling of date-keyed documents"""
+
+    def test_documents_by_date(self):
+        start = datetime(2020, 1, 1)
+        points = [{"date": start + timedelta(days=i), "price_usd_per_ton": 200 + (i % 30)} for i in range(2000)]
+
+        result = downsample(points, "date", "price_usd_per_ton", 100)
+
+        assert len(result) == 100
+        assert result[0] is points[0] and result[-1] is points[-1]
+        assert [p["date"] for p in result] == sorted(p["date"] for p in result)
+
+    def test_missing_values_dropped(self):
+        points = [{"date": datetime(2024, 1, 1) + timedelta(days=i), "rainfall_mm": None if i % 2 else 1.0}
+                  for i in range(10)]
+
+        assert len(downsample(points, "date", "rainfall_mm", 100)) == 5
@@ -0,0 +1,35 @@
+import pytest
+from database.geo import bbox_polygon, cell_degrees, parse_bbox, tile_geometry, zoom_for_bbox, MAP_DETAIL_MIN_ZOOM
+
+
+class TestGeo:
+    """Test viewport parsing and zoom-dependent resolution"""
+
+    def test_parse_bbox(self):
+        assert parse_bbox("68,8,97.5,35") == (68.0, 8.0, 97.5, 35.0)
+
+    @pytest.mark.parametrize("value", ["68,8,97", "a,b,c,d", "97,8,68,35", "68,-91,97,35", "-181,8,97,35"])
+    def test_parse_bbox_rejects_invalid(self, value):
+        with pytest.raises(ValueError):
+            parse_bbox(value)
+
+    def test_bbox_polygon_is_closed_counter_clockwise_ring(self):
+        ring = bbox_polygon((70, 10, 80, 20))["coordinates"][0]
+        assert ring[0] == ring[-1]
+        # Shoelace sum is positive for counter-clockwise rings
+        area = sum(x1 * y2 - x2 * y1 for (x1, y1), (x2, y2) in zip(ring, ring[1:]))
+        assert area > 0
+
+    def test_tile_geometry_matches_tile_bounds(self):
+        ring = tile_geometry(8, 13.4, 68, 73.8)["coordinates"][0]
+        assert min(x for x, _ in ring) == 68 and max(x for x, _ in ring) == 73.8
+        assert min(y for _, y in ring) == 8 and max(y for _, y in ring) == 13.4
+
+    def test_zoom_for_bbox(self):
+        assert zoom_for_bbox((-180, -85, 180, 85)) == 0
+        assert zoom_for_bbox((70, 10, 80, 20)) == 5
+
+    def test_cell_degrees_shrinks_with_zoom_until_detail(self):
+        assert cell_degrees(0) == 90
+        assert cell_degrees(1) == 45
+        assert cell_degrees(MAP_DETAIL_MIN_ZOOM) is None
@@ -0,0 +1,94 @@
+import orjson
+import pytest
+from datetime import datetime, timedelta
+from unittest.mock import AsyncMock, MagicMock
+from health import DependencyProber, MONITORED_COLLECTIONS
+
+NOW = datetime(2024, 6, 1, 12, 0)
+
+
+def repository(versions=None, ping_error=None):
+    repo = MagicMock()
+    repo.ping = AsyncMock(side_effect=ping_error, return_value={"ok": 1})
+    repo.get_data_versions = AsyncMock(return_value=versions or {})
+    return repo
+
+
+class TestDependencyProber:
+    """Test health snapshots built by the background prober"""
+
+    @pytest.mark.asyncio
+    async def test_ready_with_fresh_data(self):
+        versions = {name: {"version": 3, "updated_at": NOW - timedelta(hours=2)} for name in MONITORED_COLLECTIONS}
+        prober = DependencyProber(repository(versions), clock=lambda: NOW)
+
+        await prober.probe()
+        readiness = prober.readiness()
+
+        assert readiness["status"] == "ready"
+        assert readiness["database"] == "connected"
+        assert readiness["freshness"]["weather"]["age_seconds"] == 7200
+
+    @pytest.mark.asyncio
+    async def test_stale_collection_degrades(self):
+        versions = {name: {"version": 1, "updated_at": NOW} for name in MONITORED_COLLECTIONS}
+        versions["news"]["updated_at"] = NOW - timedelta(days=3)
+        del versions["commodities"]
+        prober = DependencyProber(repository(versions), clock=lambda: NOW)
+
+        await prober.probe()
+        readiness = prober.readiness()
+
+        assert readiness["status"] == "degraded"
+        assert sorted(readiness["stale"]) == ["commodities", "news"]
+
+    @pytest.mark.asyncio
+    async def test_unreachable_database_is_not_ready(self):
+        repo = repository(ping_error=ConnectionError("no servers"))
+        prober = DependencyProber(repo, clock=lambda: NOW)
+
+        assert prober.readiness()["status"] == "not_ready"
+        await prober.probe()
+
+        assert prober.readiness()["status"] == "not_ready"
+        assert prober.liveness()["status"] == "alive"
+        assert prober.stats()["failures"] == 1
+
+    @pytest.mark.asyncio
+    async def test_health_reads_do_not_query(self):
+        repo = repository()
+        prober = DependencyProber(repo, clock=lambda: NOW)
+        await prober.probe()
+
+        for _ in range(100):
+            prober.readiness()
+            prober.liveness()
+
+        assert repo.ping.await_count == 1
+
+
+class TestHealthEndpoints:
+    """Test the /health contract the frontend relies on"""
+
+    @pytest.fixture
+    def degraded(self, monkeypatch):
+        import main
+
+        prober = MagicMock()
+        prober.readiness.return_value = {"status": "degraded", "stale": ["news"], "database": "connected"}
+        monkeypatch.setattr(main, "prober", prober)
+        return main
+
+    @pytest.mark.asyncio
+    async def test_health_stays_healthy_with_stale_data(self, degraded):
+        body = orjson.loads((await degraded.health_check()).body)
+
+        assert body["status"] == "healthy"
+        assert body["database"] == "connected"
+
+    @pytest.mark.asyncio
+    async def test_ready_reports_degraded(self, degraded):
+        response = await degraded.readiness_check()
+
+        assert response.status_code == 200
+        assert orjson.loads(response.body)["status"] == "degraded"
@@ -0,0 +1,51 @@
+import os
+import subprocess
+import sys
+import pytest
+
+BACKEND = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@pytest.mark.parametrize("module", ["main", "scheduler_v2"])
+def test_entry_points_do_not_import_heavy_dependencies(module, tmp_path):
+    # Fresh interpreter: other tests have already imported numpy here
+    code = (
+        f"import sys, {module}; "
+        "print(','.join(m for m in ('numpy', 'sklearn', 'feedparser', 'twilio', 'requests') if m in sys.modules))"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=tmp_path, env=dict(os.environ, PYTHONPATH=BACKEND), capture_output=True, text=True
+    )
+
+    assert result.returncode == 0, result.stderr
+    assert result.stdout.strip() == ""
+
+
+def test_scheduler_does_not_import_web_stack(tmp_path):
+    code = "import sys, scheduler_v2; print('fastapi' in sys.modules, 'starlette' in sys.modules)"
+    result = subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=tmp_path, env=dict(os.environ, PYTHONPATH=BACKEND), capture_output=True, text=True
+    )
+
+    assert result.returncode == 0, result.stderr
+    assert result.stdout.strip() == "False False"
+
+
+@pytest.mark.parametrize("module", ["main", "scheduler_v2"])
+def test_env_file_loaded_before_settings_are_read(module, tmp_path):
+    # Stand-in for load_dotenv() finding REDIS_URL in backend/.env
+    code = (
+        "import os, dotenv; "
+        "dotenv.load_dotenv = lambda *args, **kwargs: os.environ.update(REDIS_URL='redis://cache.internal:6379/0'); "
+        f"import {module}, cache; print(cache.REDIS_URL, cache.shared_cache.url)"
+    )
+    env = {key: value for key, value in os.environ.items() if key != "REDIS_URL"}
+    result = subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=tmp_path, env=dict(env, PYTHONPATH=BACKEND), capture_output=True, text=True
+    )
+
+    assert result.returncode == 0, result.stderr
+    assert result.stdout.strip() == "redis://cache.internal:6379/0 redis://cache.internal:6379/0"
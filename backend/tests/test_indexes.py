@@ -0,0 +1,69 @@
+import pytest
+from pymongo.errors import OperationFailure
+from unittest.mock import MagicMock
+from database.indexes import INDEXES, SUPERSEDED_INDEXES, ensure_indexes, find_collection_scans, _plan_stages
+
+
+class TestIndexes:
+    """Test index bootstrap and collection scan detection"""
+
+    @pytest.fixture
+    def db(self):
+        collections = {}
+
+        def get_collection(name):
+            return collections.setdefault(name, MagicMock())
+
+        db = MagicMock()
+        db.__getitem__.side_effect = get_collection
+        return db
+
+    def test_ensure_indexes_covers_every_collection(self, db):
+        ensure_indexes(db)
+
+        for name in INDEXES:
+            db[name].create_indexes.assert_called_once_with(INDEXES[name])
+
+    def test_ensure_indexes_drops_superseded_names(self, db):
+        for name in INDEXES:
+            db[name].create_indexes.return_value = [index.document["name"] for index in INDEXES[name]]
+        db["weather"].drop_index.side_effect = OperationFailure("index not found with name [country_date]")
+
+        ensure_indexes(db)
+
+        db["satellites"].drop_index.assert_called_once_with("country_crop_type_timestamp")
+        db["weather"].drop_index.assert_called_once_with("country_date")
+        db["news"].drop_index.assert_not_called()
+
+    def test_superseded_index_kept_until_replacement_exists(self, db):
+        db["satellites"].create_indexes.side_effect = OperationFailure("conflict")
+
+        ensure_indexes(db)
+
+        db["satellites"].drop_index.assert_not_called()
+
+    def test_superseded_names_are_not_declared(self):
+        for collection_name, names in SUPERSEDED_INDEXES.items():
+            declared = {index.document["name"] for index in INDEXES[collection_name]}
+            assert declared.isdisjoint(names)
+
+    def test_fusion_scores_ttl_index(self):
+        ttl = [i.document for i in INDEXES["fusion_scores"] if "expireAfterSeconds" in i.document]
+
+        assert len(ttl) == 1
+        assert ttl[0]["key"] == {"expires_at": 1}
+
+    def test_plan_stages_nested(self):
+        plan = {"stage": "LIMIT", "inputStage": {"stage": "FETCH", "inputStage": {"stage": "IXSCAN"}}}
+
+        assert _plan_stages(plan) == ["LIMIT", "FETCH", "IXSCAN"]
+
+    def test_find_collection_scans_reports_collscan(self, db):
+        collscan = {"queryPlanner": {"winningPlan": {"stage": "SORT", "inputStage": {"stage": "COLLSCAN"}}}}
+        ixscan = {"queryPlanner": {"winningPlan": {"stage": "FETCH", "inputStage": {"stage": "IXSCAN"}}}}
+        for name in INDEXES:
+            db[name].find.return_value.sort.return_value.explain.return_value = ixscan
+            db[name].find.return_value.explain.return_value = ixscan
+        db["news"].find.return_value.sort.return_value.explain.return_value = collscan
+
+        assert find_collection_scans(db) == ["GET /news-risk", "GET /sync news"]
@@ -0,0 +1,33 @@
+from datetime import datetime
+from unittest.mock import MagicMock
+from database.leaderboard import LEADERBOARD_COLLECTION, seed_leaderboard, update_leaderboard
+
+
+class TestLeaderboard:
+    """Test incremental leaderboard maintenance"""
+
+    def test_update_upserts_pair_entry(self):
+        db = MagicMock()
+        document = {"country": "IN", "crop": "wheat", "fusion_score": 42.0, "risk_level": "high",
+                    "components": {}, "timestamp": datetime(2024, 1, 1)}
+
+        update_leaderboard(db, document)
+
+        query, update = db[LEADERBOARD_COLLECTION].update_one.call_args.args
+        assert query == {"country": "IN", "crop": "wheat"}
+        assert update["$set"] == {"country": "IN", "crop": "wheat", "fusion_score": 42.0,
+                                  "risk_level": "high", "timestamp": datetime(2024, 1, 1)}
+        assert db[LEADERBOARD_COLLECTION].update_one.call_args.kwargs["upsert"] is True
+
+    def test_update_never_raises(self):
+        db = MagicMock()
+        db[LEADERBOARD_COLLECTION].update_one.side_effect = RuntimeError("down")
+
+        update_leaderboard(db, {"country": "IN", "crop": "wheat", "fusion_score": 42.0})
+
+    def test_seed_skipped_when_populated(self):
+        db = MagicMock()
+        db[LEADERBOARD_COLLECTION].find_one.return_value = {"_id": 1}
+
+        assert seed_leaderboard(db) == 0
+        db["fusion_scores"].aggregate.assert_not_called()
@@ -0,0 +1,99 @@
+import pytest
+from unittest.mock import MagicMock
+from fastapi import FastAPI, HTTPException
+from fastapi.testclient import TestClient
+from prometheus_client import REGISTRY
+from metrics import MetricsMiddleware, MongoCommandMetrics, render_latest, track_ingest
+
+
+def sample(name, **labels):
+    return REGISTRY.get_sample_value(name, labels) or 0.0
+
+
+class TestMetricsMiddleware:
+    """Test per-route HTTP metrics"""
+
+    @pytest.fixture
+    def client(self):
+        app = FastAPI()
+        app.add_middleware(MetricsMiddleware)
+
+        @app.get("/items/{item_id}")
+        async def get_item(item_id: str):
+            if item_id == "missing":
+                raise HTTPException(status_code=404)
+            return {"item_id": item_id}
+
+        return TestClient(app)
+
+    def test_route_template_and_status_labels(self, client):
+        before_ok = sample("mdf_http_requests_total", method="GET", route="/items/{item_id}", status="200")
+        before_missing = sample("mdf_http_requests_total", method="GET", route="/items/{item_id}", status="404")
+        before_count = sample("mdf_http_request_duration_seconds_count", method="GET", route="/items/{item_id}")
+
+        client.get("/items/a")
+        client.get("/items/b")
+        client.get("/items/missing")
+
+        assert sample("mdf_http_requests_total", method="GET", route="/items/{item_id}", status="200") == before_ok + 2
+        assert sample("mdf_http_requests_total", method="GET", route="/items/{item_id}", status="404") == before_missing + 1
+        assert sample("mdf_http_request_duration_seconds_count", method="GET", route="/items/{item_id}") == before_count + 3
+        assert sample("mdf_http_requests_in_flight", method="GET") == 0
+
+    def test_unmatched_paths_share_one_label(self, client):
+        before = sample("mdf_http_requests_total", method="GET", route="unmatched", status="404")
+
+        client.get("/nope/1")
+        client.get("/nope/2")
+
+        assert sample("mdf_http_requests_total", method="GET", route="unmatched", status="404") == before + 2
+
+
+class TestMongoCommandMetrics:
+    """Test the pymongo command listener"""
+
+    def event(self, command_name, command, request_id=1):
+        return MagicMock(command_name=command_name, command=command, connection_id=("localhost", 27017),
+                         request_id=request_id, duration_micros=2500)
+
+    def test_latency_by_collection_and_command(self):
+        listener = MongoCommandMetrics()
+        before = sample("mdf_mongo_command_duration_seconds_count", collection="satellites", command="find")
+
+        listener.started(self.event("find", {"find": "satellites", "filter": {}}))
+        listener.succeeded(self.event("find", {}))
+
+        assert sample("mdf_mongo_command_duration_seconds_count", collection="satellites", command="find") == before + 1
+
+    def test_get_more_and_failures(self):
+        listener = MongoCommandMetrics()
+        before = sample("mdf_mongo_command_failures_total", collection="weather", command="getMore")
+
+        listener.started(self.event("getMore", {"getMore": 123, "collection": "weather"}, request_id=2))
+        listener.failed(self.event("getMore", {}, request_id=2))
+
+        assert sample("mdf_mongo_command_failures_total", collection="weather", command="getMore") == before + 1
+        assert listener._pending == {}
+
+
+class TestSchedulerMetrics:
+    """Test scheduler ingestor counters"""
+
+    def test_track_ingest_counts_outcomes(self):
+        before_ok = sample("mdf_scheduler_ingests_total", ingestor="weather", outcome="success")
+        before_failed = sample("mdf_scheduler_ingests_total", ingestor="weather", outcome="failure")
+
+        with track_ingest("weather"):
+            pass
+        with pytest.raises(ValueError):
+            with track_ingest("weather"):
+                raise ValueError("bad payload")
+
+        assert sample("mdf_scheduler_ingests_total", ingestor="weather", outcome="success") == before_ok + 1
+        assert sample("mdf_scheduler_ingests_total", ingestor="weather", outcome="failure") == before_failed + 1
+
+    def test_exposition_format(self):
+        content, content_type = render_latest()
+
+        assert content_type.startswith("text/plain")
+        assert b"# TYPE mdf_http_request_duration_seconds histogram" in content
@@ -0,0 +1,62 @@
+import asyncio
+import os
+import time
+import pytest
+import pytest_asyncio
+from model_pool import ModelPool, PoolSaturated
+
+
+def slow_square(value, seconds):
+    time.sleep(seconds)
+    return value * value
+
+
+def crash():
+    os._exit(1)
+
+
+class TestModelPool:
+    """Test bounded offloading of model calls to worker processes"""
+
+    @pytest_asyncio.fixture
+    async def pool(self):
+        pool = ModelPool(workers=1, queue_depth=1, timeout=5, retry_after=7)
+        await pool.start()
+        yield pool
+        pool.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_runs_call_in_worker(self, pool):
+        assert await pool.run(slow_square, 4, 0) == 16
+        assert pool.stats()["completed"] == 1
+
+    @pytest.mark.asyncio
+    async def test_rejects_beyond_depth(self, pool):
+        running = [asyncio.ensure_future(pool.run(slow_square, 2, 0.5)) for _ in range(2)]
+        await asyncio.sleep(0)
+
+        with pytest.raises(PoolSaturated) as rejected:
+            await pool.run(slow_square, 3, 0)
+
+        assert rejected.value.retry_after == 7
+        assert await asyncio.gather(*running) == [4, 4]
+        assert pool.stats()["rejected"] == 1
+
+    @pytest.mark.asyncio
+    async def test_timeout_recycles_overrunning_worker(self, pool):
+        with pytest.raises(asyncio.TimeoutError):
+            await pool.run(slow_square, 2, 30, timeout=0.2)
+
+        # The worker is killed rather than left running for 30 s
+        await asyncio.sleep(0.5)
+        assert pool.pending == 0
+        assert await pool.run(slow_square, 3, 0) == 9
+        assert pool.stats()["timeouts"] == 1
+        assert pool.stats()["recycled"] == 1
+
+    @pytest.mark.asyncio
+    async def test_rebuilds_after_worker_crash(self, pool):
+        with pytest.raises(Exception):
+            await pool.run(crash)
+
+        assert await pool.run(slow_square, 3, 0) == 9
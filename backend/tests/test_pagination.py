@@ -0,0 +1,30 @@
+import pytest
+from datetime import datetime
+from bson import ObjectId
+from database.pagination import encode_cursor, decode_cursor, keyset_filter
+
+
+class TestPagination:
+    """Test keyset cursor encoding"""
+
+    def test_cursor_round_trip(self):
+        document = {"_id": ObjectId(), "timestamp": datetime(2024, 3, 1, 12, 30)}
+
+        token = encode_cursor(document, "timestamp")
+
+        assert decode_cursor(token) == (document["timestamp"], document["_id"])
+
+    def test_invalid_cursor_raises_value_error(self):
+        with pytest.raises(ValueError):
+            decode_cursor("not-a-cursor")
+
+    def test_keyset_filter_is_strictly_after_cursor(self):
+        document = {"_id": ObjectId(), "date": datetime(2024, 3, 1)}
+
+        query = keyset_filter({"country": "IN"}, "date", encode_cursor(document, "date"))
+
+        assert query["country"] == "IN"
+        assert query["$or"] == [
+            {"date": {"$lt": document["date"]}},
+            {"date": document["date"], "_id": {"$lt": document["_id"]}}
+        ]
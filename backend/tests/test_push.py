@@ -0,0 +1,93 @@
+import asyncio
+import pytest
+from unittest.mock import MagicMock, patch
+from cache import TTLCache
+from models.fusion_calculator import FusionScoreCalculator
+from push import KEEPALIVE, UpdateHub, sse_stream
+
+
+class TestUpdateHub:
+    """Test fan-out of update events to subscribed streams"""
+
+    def test_publish_reaches_matching_topics_only(self):
+        hub = UpdateHub()
+        wheat = hub.subscribe("IN", "wheat")
+        india = hub.subscribe("IN")
+        corn = hub.subscribe("IN", "corn")
+        us = hub.subscribe("US", "wheat")
+
+        reached = hub.publish({"type": "fusion_score", "country": "IN", "crop": "wheat"})
+
+        assert reached == 2
+        assert wheat.queue.qsize() == 1
+        assert india.queue.qsize() == 1
+        assert corn.queue.empty()
+        assert us.queue.empty()
+
+    def test_events_without_country_go_to_every_stream(self):
+        hub = UpdateHub()
+        subscriptions = [hub.subscribe("IN", "wheat"), hub.subscribe("US"), hub.subscribe("BR", "corn")]
+
+        assert hub.publish({"type": "data_updated", "collection": "weather"}) == 3
+        assert all(s.queue.qsize() == 1 for s in subscriptions)
+
+    def test_slow_subscriber_drops_oldest_event(self):
+        hub = UpdateHub(queue_size=2)
+        subscription = hub.subscribe("IN", "wheat")
+
+        for score in (60, 61, 62):
+            hub.publish({"type": "fusion_score", "country": "IN", "crop": "wheat", "fusion_score": score})
+
+        assert subscription.queue.get_nowait()["fusion_score"] == 61
+        assert hub.stats()["dropped"] == 1
+
+    def test_connection_limit(self):
+        hub = UpdateHub(max_subscribers=1)
+        hub.subscribe("IN")
+
+        with pytest.raises(OverflowError):
+            hub.subscribe("US")
+
+    @pytest.mark.asyncio
+    async def test_stream_releases_subscription_on_close(self):
+        hub = UpdateHub()
+        subscription = hub.subscribe("IN", "wheat")
+        stream = sse_stream(hub, subscription)
+
+        assert await stream.__anext__() == b"retry: 5000\n\n"
+        hub.publish({"type": "fusion_score", "country": "IN", "crop": "wheat", "fusion_score": 71.5})
+        frame = await stream.__anext__()
+        await stream.aclose()
+
+        assert frame.startswith(b"event: fusion_score\ndata: ")
+        assert b'"fusion_score":71.5' in frame
+        assert hub.stats()["connections"] == 0
+
+    @pytest.mark.asyncio
+    async def test_keepalive_only_reaches_idle_streams(self):
+        hub = UpdateHub()
+        idle = hub.subscribe("IN", "wheat")
+        busy = hub.subscribe("US", "corn")
+        hub.publish({"type": "fusion_score", "country": "US", "crop": "corn"})
+
+        task = asyncio.ensure_future(hub.keepalive(interval=0))
+        await asyncio.sleep(0)
+        await asyncio.sleep(0)
+        task.cancel()
+
+        assert idle.queue.get_nowait() is KEEPALIVE
+        assert busy.queue.qsize() == 1
+
+    def test_save_fusion_score_publishes_delta(self):
+        db = MagicMock()
+        db["fusion_scores"].find_one_and_update.return_value = {"fusion_score": 45.0, "risk_level": "high"}
+        calculator = FusionScoreCalculator(db, cache=TTLCache())
+        scores = calculator.calculate_fusion_score(80, 80, 80, 80)
+
+        with patch("models.fusion_calculator.publish_update") as publish:
+            calculator.save_fusion_score("IN", "wheat", scores)
+
+        event = publish.call_args[0][0]
+        assert event["type"] == "fusion_score"
+        assert event["delta"] == 35.0
+        assert event["risk_level_changed"] is True
@@ -0,0 +1,176 @@
+import pytest
+from datetime import datetime
+from bson import ObjectId
+from unittest.mock import AsyncMock, MagicMock
+from database import MacroDataRepository
+from database.repository import period_start
+from database.pagination import decode_cursor
+from database.leaderboard import LEADERBOARD_COLLECTION
+
+
+class FakeCursor:
+    """Minimal stand-in for a Motor cursor"""
+
+    def __init__(self, documents):
+        self.documents = list(documents)
+
+    def __aiter__(self):
+        self._iter = iter(self.documents)
+        return self
+
+    async def __anext__(self):
+        try:
+            return next(self._iter)
+        except StopIteration:
+            raise StopAsyncIteration
+
+
+class TestMacroDataRepository:
+    """Test async repository reads"""
+
+    @pytest.fixture
+    def db(self):
+        collections = {}
+
+        def get_collection(name):
+            return collections.setdefault(name, MagicMock())
+
+        db = MagicMock()
+        db.__getitem__.side_effect = get_collection
+        return db
+
+    @pytest.mark.asyncio
+    async def test_latest_fusion_score_excludes_id(self, db):
+        db["fusion_scores"].find_one = AsyncMock(return_value={"fusion_score": 72.5})
+        repository = MacroDataRepository(db)
+
+        document = await repository.get_latest_fusion_score("IN", "wheat")
+
+        assert document == {"fusion_score": 72.5}
+        db["fusion_scores"].find_one.assert_awaited_once_with(
+            {"country": "IN", "crop": "wheat"},
+            {"_id": 0},
+            sort=[("timestamp", -1)]
+        )
+
+    @pytest.mark.asyncio
+    async def test_latest_fusion_score_missing(self, db):
+        db["fusion_scores"].find_one = AsyncMock(return_value=None)
+        repository = MacroDataRepository(db)
+
+        assert await repository.get_latest_fusion_score("IN", "wheat") is None
+
+    @pytest.mark.asyncio
+    async def test_weather_forecast_projection_and_limit(self, db):
+        db["weather"].find.return_value = FakeCursor([{"rainfall_mm": i} for i in range(3)])
+        repository = MacroDataRepository(db)
+
+        result = await repository.get_weather_forecast("IN", days=3)
+
+        assert result == [{"rainfall_mm": 0}, {"rainfall_mm": 1}, {"rainfall_mm": 2}]
+        fields = db["weather"].find.call_args.args[1]
+        assert fields["_id"] == 0 and fields["rainfall_mm"] == 1
+        assert db["weather"].find.call_args.kwargs["limit"] == 3
+
+    @pytest.mark.asyncio
+    async def test_price_history_keeps_full_documents_newest_first(self, db):
+        db["commodities"].find.return_value = FakeCursor([{"price_usd_per_ton": 210.0}])
+        repository = MacroDataRepository(db)
+
+        await repository.get_price_history("wheat", limit=10)
+
+        fields = db["commodities"].find.call_args.args[1]
+        assert fields["price_usd_per_ton"] == 1 and fields["volume_traded"] == 1
+        assert db["commodities"].find.call_args.kwargs["sort"] == [("date", -1)]
+        assert db["commodities"].find.call_args.kwargs["limit"] == 10
+
+    @pytest.mark.asyncio
+    async def test_crop_health_page_returns_next_cursor(self, db):
+        tiles = [{"_id": ObjectId(), "region": f"Tile_0_{i}", "timestamp": datetime(2024, 1, 1, 0, 5 - i)}
+                 for i in range(3)]
+        second_id = tiles[1]["_id"]
+        db["satellites"].find.return_value = FakeCursor(tiles)
+        repository = MacroDataRepository(db)
+
+        page = await repository.get_crop_health_page("IN", "wheat", limit=2)
+
+        assert [t["region"] for t in page["items"]] == ["Tile_0_0", "Tile_0_1"]
+        assert all("_id" not in t for t in page["items"])
+        assert decode_cursor(page["next_cursor"]) == (datetime(2024, 1, 1, 0, 4), second_id)
+        assert db["satellites"].find.call_args.kwargs["limit"] == 3
+
+    @pytest.mark.asyncio
+    async def test_latest_fusion_scores_single_aggregation(self, db):
+        db["fusion_scores"].aggregate.return_value = FakeCursor([
+            {"_id": {"country": "IN", "crop": "wheat"}, "fusion_score": 71.0},
+            {"_id": {"country": "US", "crop": "corn"}, "fusion_score": 64.0},
+        ])
+        repository = MacroDataRepository(db)
+
+        result = await repository.get_latest_fusion_scores([("IN", "wheat"), ("US", "corn")])
+
+        assert result == {("IN", "wheat"): {"fusion_score": 71.0}, ("US", "corn"): {"fusion_score": 64.0}}
+        pipeline = db["fusion_scores"].aggregate.call_args.args[0]
+        assert [list(stage)[0] for stage in pipeline] == ["$match", "$sort", "$group"]
+        assert len(pipeline[0]["$match"]["$or"]) == 2
+
+    @pytest.mark.asyncio
+    async def test_tiles_in_bbox_uses_geo_intersects(self, db):
+        db["satellites"].find.return_value = FakeCursor([{"region": "Tile_0_0"}])
+        repository = MacroDataRepository(db)
+
+        tiles = await repository.get_tiles_in_bbox("IN", "wheat", (70, 10, 80, 20), limit=5)
+
+        assert tiles == [{"region": "Tile_0_0"}]
+        query = db["satellites"].find.call_args.args[0]
+        assert query["geometry"]["$geoIntersects"]["$geometry"]["type"] == "Polygon"
+        assert db["satellites"].find.call_args.kwargs["limit"] == 5
+
+    @pytest.mark.asyncio
+    async def test_tile_cells_capped_densest_first(self, db):
+        db["satellites"].aggregate.return_value = FakeCursor([])
+        repository = MacroDataRepository(db)
+
+        await repository.get_tile_cells_in_bbox("IN", "wheat", (70, 10, 80, 20), cell=1.0, limit=50)
+
+        pipeline = db["satellites"].aggregate.call_args.args[0]
+        stages = [list(stage)[0] for stage in pipeline]
+        assert stages == ["$match", "$group", "$sort", "$limit", "$project"]
+        assert list(pipeline[2]["$sort"].items())[0] == ("tile_count", -1)
+        assert pipeline[3]["$limit"] == 50
+
+    @pytest.mark.asyncio
+    async def test_price_bars_aggregated_in_mongo(self, db):
+        bar = {"period_start": datetime(2024, 3, 4), "open": 200.0, "high": 210.0, "low": 195.0,
+               "close": 205.0, "volume": 500000, "days": 5}
+        db["commodities"].aggregate.return_value = FakeCursor([bar])
+        repository = MacroDataRepository(db)
+
+        bars = await repository.get_price_bars("wheat", "week", end=datetime(2024, 3, 11))
+
+        assert bars == [bar]
+        pipeline = db["commodities"].aggregate.call_args.args[0]
+        assert pipeline[0]["$match"] == {"commodity": "wheat", "date": {"$lt": datetime(2024, 3, 11)}}
+        assert pipeline[1] == {"$sort": {"date": 1}}
+        assert pipeline[2]["$group"]["_id"]["$dateTrunc"]["unit"] == "week"
+
+    def test_period_start(self):
+        # 2024-03-07 is a Thursday
+        moment = datetime(2024, 3, 7, 15, 30)
+
+        assert period_start(moment, "week") == datetime(2024, 3, 4)
+        assert period_start(moment, "month") == datetime(2024, 3, 1)
+        with pytest.raises(ValueError):
+            period_start(moment, "day")
+
+    @pytest.mark.asyncio
+    async def test_top_fusion_scores_read_from_leaderboard_end(self, db):
+        db[LEADERBOARD_COLLECTION].find.return_value = FakeCursor([{"country": "AR", "fusion_score": 31.0}])
+        repository = MacroDataRepository(db)
+
+        await repository.get_top_fusion_scores(5, ascending=False)
+
+        kwargs = db[LEADERBOARD_COLLECTION].find.call_args.kwargs
+        assert kwargs["sort"] == [("fusion_score", -1), ("country", -1), ("crop", -1)]
+        assert kwargs["limit"] == 5
+        db["fusion_scores"].find.assert_not_called()
@@ -0,0 +1,47 @@
+import orjson
+import pytest
+from datetime import datetime
+from responses import columnar, dumps
+
+
+class TestColumnar:
+    """Test the columnar payload shape for list endpoints"""
+
+    @pytest.fixture
+    def tiles(self):
+        return [
+            {"country": "IN", "crop": "wheat", "region": f"Tile_0_{i}", "ndvi_value": 0.5 + i / 10,
+             "confidence": 0.92, "timestamp": datetime(2024, 1, 1)}
+            for i in range(3)
+        ]
+
+    def test_constant_fields_are_hoisted(self, tiles):
+        payload = columnar(tiles, ["country", "crop", "region", "ndvi_value", "confidence"],
+                           hoistable=["country", "crop", "confidence"])
+
+        assert payload["count"] == 3
+        assert payload["shared"] == {"country": "IN", "crop": "wheat", "confidence": 0.92}
+        assert payload["columns"]["region"] == ["Tile_0_0", "Tile_0_1", "Tile_0_2"]
+        assert payload["columns"]["ndvi_value"] == [0.5, 0.6, 0.7]
+
+    def test_varying_hoistable_field_stays_a_column(self, tiles):
+        tiles[1]["confidence"] = 0.8
+        del tiles[2]["confidence"]
+
+        payload = columnar(tiles, ["confidence"], hoistable=["confidence"])
+
+        assert payload["shared"] == {}
+        assert payload["columns"]["confidence"] == [0.92, 0.8, None]
+
+    def test_smaller_than_rows(self, tiles):
+        tiles = tiles * 100
+        fields = list(tiles[0])
+
+        rows = dumps({"tiles": tiles})
+        compact = dumps(columnar(tiles, fields, hoistable=["country", "crop", "confidence"]))
+
+        assert len(compact) < len(rows) / 2
+        assert orjson.loads(compact)["count"] == 300
+
+    def test_empty_page(self):
+        assert columnar([], ["region"], hoistable=["region"]) == {"count": 0, "shared": {}, "columns": {"region": []}}
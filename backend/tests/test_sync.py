@@ -0,0 +1,73 @@
+import pytest
+from datetime import datetime, timedelta
+from unittest.mock import AsyncMock, MagicMock
+from database.sync import SYNC_COLLECTIONS, SYNC_MAX_CHANGES, collect_changes, decode_sync_token, encode_sync_token
+
+
+class TestSync:
+    """Test delta sync tokens and change collection"""
+
+    NOW = datetime(2024, 6, 1, 12, 0)
+    SCOPE = {"country": "IN", "crop": "wheat", "commodity": "wheat"}
+
+    @pytest.fixture
+    def repo(self):
+        repo = MagicMock()
+        repo.get_changes = AsyncMock(return_value=[])
+        return repo
+
+    async def first_token(self, repo):
+        result = await collect_changes(repo, self.SCOPE, None, {}, now=self.NOW - timedelta(hours=1))
+        assert result["full_snapshot_required"] is True
+        assert result["reason"] == "no_token"
+        return result["token"]
+
+    @pytest.mark.asyncio
+    async def test_only_bumped_collections_are_queried(self, repo):
+        token = await self.first_token(repo)
+        versions = {"news": {"version": 4, "updated_at": self.NOW - timedelta(minutes=30)},
+                    "weather": {"version": 2, "updated_at": self.NOW - timedelta(days=1)}}
+        repo.get_changes.return_value = [
+            {"country": "IN", "title": f"Item {i}", "source": "Google News", "sentiment_score": 0.1 * i}
+            for i in range(3)
+        ]
+
+        result = await collect_changes(repo, self.SCOPE, token, versions, now=self.NOW)
+
+        queried = [call.args[0] for call in repo.get_changes.await_args_list]
+        assert "news" in queried and "weather" not in queried
+        assert result["full_snapshot_required"] is False
+        assert result["changes"]["news"]["shared"]["source"] == "Google News"
+        assert result["changes"]["news"]["columns"]["title"] == ["Item 0", "Item 1", "Item 2"]
+
+    @pytest.mark.asyncio
+    async def test_next_token_resumes_after_served_window(self, repo):
+        token = await self.first_token(repo)
+        versions = {"news": {"version": 4, "updated_at": self.NOW - timedelta(minutes=30)}}
+
+        first = await collect_changes(repo, self.SCOPE, token, versions, now=self.NOW)
+        repo.get_changes.reset_mock()
+        second = await collect_changes(repo, self.SCOPE, first["token"], versions, now=self.NOW + timedelta(minutes=5))
+
+        # news was served up to the settle line, which is past its last write
+        assert "news" not in [call.args[0] for call in repo.get_changes.await_args_list]
+        assert second["changes"] == {}
+
+    @pytest.mark.asyncio
+    async def test_too_far_behind_requires_snapshot(self, repo):
+        token = await self.first_token(repo)
+        versions = {"news": {"version": 9, "updated_at": self.NOW}}
+
+        expired = await collect_changes(repo, self.SCOPE, token, versions, now=self.NOW + timedelta(days=30))
+        repo.get_changes.return_value = [{"country": "IN"}] * (SYNC_MAX_CHANGES + 1)
+        flooded = await collect_changes(repo, self.SCOPE, token, versions, now=self.NOW)
+
+        assert (expired["full_snapshot_required"], expired["reason"]) == (True, "token_expired")
+        assert (flooded["full_snapshot_required"], flooded["reason"]) == (True, "too_many_changes")
+
+    def test_token_is_bound_to_scope(self):
+        token = encode_sync_token(self.SCOPE, {name: self.NOW for name in SYNC_COLLECTIONS})
+
+        assert decode_sync_token(token, self.SCOPE) is not None
+        assert decode_sync_token(token, {**self.SCOPE, "country": "US"}) is None
+        assert decode_sync_token("not-a-token", self.SCOPE) is None
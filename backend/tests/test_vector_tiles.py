@@ -0,0 +1,176 @@
+import os
+from datetime import datetime
+
+import pytest
+
+from vector_tiles import (
+    CLOSE_PATH, LINE_TO, MOVE_TO, MVT_EXTENT, TileStore, encode_tile, point_commands,
+    polygon_commands, tile_bounds, _ring_area
+)
+
+
+def read_varint(data, pos):
+    result, shift = 0, 0
+    while True:
+        byte = data[pos]
+        result |= (byte & 0x7F) << shift
+        pos += 1
+        if not byte & 0x80:
+            return result, pos
+        shift += 7
+
+
+def read_fields(data):
+    """[(field number, wire type, value)] of one protobuf message"""
+    fields, pos = [], 0
+    while pos < len(data):
+        key, pos = read_varint(data, pos)
+        number, wire = key >> 3, key & 0x7
+        if wire == 0:
+            value, pos = read_varint(data, pos)
+        elif wire == 1:
+            value, pos = data[pos:pos + 8], pos + 8
+        else:
+            length, pos = read_varint(data, pos)
+            value, pos = data[pos:pos + length], pos + length
+        fields.append((number, wire, value))
+    return fields
+
+
+def decode_commands(commands):
+    """Absolute rings from polygon geometry commands"""
+    rings, ring, cursor, i = [], [], (0, 0), 0
+    while i < len(commands):
+        command, count = commands[i] & 0x7, commands[i] >> 3
+        i += 1
+        if command == CLOSE_PATH:
+            rings.append(ring)
+            ring = []
+            continue
+        for _ in range(count):
+            dx, dy = ((v >> 1) ^ -(v & 1) for v in commands[i:i + 2])
+            cursor = (cursor[0] + dx, cursor[1] + dy)
+            ring.append(cursor)
+            i += 2
+    return rings
+
+
+def square(min_lon, min_lat, max_lon, max_lat):
+    return [[[min_lon, min_lat], [max_lon, min_lat], [max_lon, max_lat], [min_lon, max_lat], [min_lon, min_lat]]]
+
+
+class TestTileGeometry:
+    """Test projection, clipping and winding"""
+
+    def test_tile_bounds_world(self):
+        min_lon, min_lat, max_lon, max_lat = tile_bounds(0, 0, 0)
+        assert (min_lon, max_lon) == (-180, 180)
+        assert max_lat == pytest.approx(85.0511, abs=1e-4) and min_lat == pytest.approx(-85.0511, abs=1e-4)
+
+    def test_exterior_ring_is_clockwise_on_screen(self):
+        commands = polygon_commands(square(-90, -45, 90, 45), 0, 0, 0)
+
+        assert commands[0] == MOVE_TO | (1 << 3)
+        assert commands[3] == LINE_TO | (3 << 3)
+        [ring] = decode_commands(commands)
+        assert len(ring) == 4 and _ring_area(ring) > 0
+
+    def test_footprint_is_clipped_to_buffered_tile(self):
+        commands = polygon_commands(square(-180, -80, 180, 80), 2, 1, 1)
+
+        [ring] = decode_commands(commands)
+        xs, ys = [x for x, _ in ring], [y for _, y in ring]
+        assert min(xs) == -64 and max(xs) == MVT_EXTENT + 64
+        assert min(ys) == -64 and max(ys) == MVT_EXTENT + 64
+
+    def test_polygon_collapsing_at_low_zoom_is_dropped(self):
+        assert polygon_commands(square(10, 10, 10.00001, 10.00001), 0, 0, 0) == []
+
+    def test_point_outside_tile_is_dropped(self):
+        assert point_commands(100, 10, 1, 0, 0) == []
+        assert point_commands(-100, 10, 1, 0, 0)
+
+
+class TestEncodeTile:
+    """Test the protobuf layer written by encode_tile"""
+
+    def test_empty_tile(self):
+        assert encode_tile([], 0, 0, 0) == b""
+        assert encode_tile([{"geometry": None, "ndvi_value": 0.5}], 0, 0, 0) == b""
+
+    def test_layer_features_and_attributes(self):
+        documents = [
+            {"region": "Tile_0_0", "ndvi_value": 0.71, "timestamp": datetime(2024, 3, 1, 2, 0),
+             "geometry": {"type": "Polygon", "coordinates": square(68, 8, 73.8, 13.4)}},
+            {"region": "Tile_0_1", "ndvi_value": 0.71, "timestamp": datetime(2024, 3, 1, 2, 0),
+             "geometry": {"type": "Point", "coordinates": [75, 15]}},
+        ]
+
+        [(number, _, layer)] = read_fields(encode_tile(documents, 0, 0, 0))
+        assert number == 3
+        fields = read_fields(layer)
+        by_number = {}
+        for field_number, _, value in fields:
+            by_number.setdefault(field_number, []).append(value)
+
+        assert by_number[15] == [2]
+        assert by_number[1] == [b"crop_health"]
+        assert by_number[5] == [MVT_EXTENT]
+        assert [bytes(key) for key in by_number[3]] == [b"region", b"ndvi_value", b"date"]
+        # Equal ndvi and date values are stored once
+        assert len(by_number[4]) == 4
+        types = [dict((n, v) for n, _, v in read_fields(feature))[3] for feature in by_number[2]]
+        assert types == [3, 1]
+
+
+class TestTileStore:
+    """Test memory and disk tile caching"""
+
+    @pytest.mark.asyncio
+    async def test_builds_once_then_serves_from_memory(self, tmp_path):
+        store = TileStore(directory=str(tmp_path))
+        builds = []
+
+        async def build():
+            builds.append(1)
+            return b"tile"
+
+        assert await store.get_or_build((1, "IN", "wheat", 0, 0, 0), build) == b"tile"
+        assert await store.get_or_build((1, "IN", "wheat", 0, 0, 0), build) == b"tile"
+        assert len(builds) == 1
+
+    @pytest.mark.asyncio
+    async def test_disk_cache_survives_new_store(self, tmp_path):
+        async def build():
+            return b"tile"
+
+        await TileStore(directory=str(tmp_path)).get_or_build((1, "IN", "wheat", 3, 5, 2), build)
+
+        async def fail():
+            raise AssertionError("should be served from disk")
+
+        store = TileStore(directory=str(tmp_path))
+        assert await store.get_or_build((1, "IN", "wheat", 3, 5, 2), fail) == b"tile"
+        assert store.disk_hits == 1
+
+    @pytest.mark.asyncio
+    async def test_new_version_prunes_old_directories(self, tmp_path):
+        store = TileStore(directory=str(tmp_path))
+
+        async def build():
+            return b"tile"
+
+        await store.get_or_build((1, "IN", "wheat", 0, 0, 0), build)
+        await store.get_or_build((2, "IN", "wheat", 0, 0, 0), build)
+
+        assert sorted(os.listdir(tmp_path)) == ["v2"]
+
+    @pytest.mark.asyncio
+    async def test_memory_only_without_directory(self):
+        store = TileStore(directory="")
+
+        async def build():
+            return b""
+
+        assert await store.get_or_build((1, "IN", "wheat", 0, 0, 0), build) == b""
+        assert store.stats()["disk_enabled"] is False
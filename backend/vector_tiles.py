@@ -0,0 +1,313 @@
+"""
+Mapbox Vector Tiles for the crop-health map
+
+/map/tiles/{z}/{x}/{y}.mvt encodes the NDVI tiles intersecting one web
+mercator tile as a single "crop_health" layer (spec version 2), with
+region, ndvi_value and date as feature attributes. The encoder is a small
+protobuf writer for the two geometry types stored on satellites documents:
+tile footprint polygons and center points (see database.geo).
+
+Encoded tiles are cached in memory and on disk (MVT_CACHE_DIR), keyed by
+the satellites data version. A new version misses everywhere; disk
+directories of older versions are removed when the first tile of a newer
+one is written.
+"""
+
+import asyncio
+import hashlib
+import math
+import os
+import shutil
+import struct
+import tempfile
+from typing import Awaitable, Callable, Dict, Iterable, List, Optional, Tuple
+
+from cache import SingleFlight, TTLCache
+
+MVT_MEDIA_TYPE = "application/vnd.mapbox-vector-tile"
+MVT_LAYER = "crop_health"
+MVT_EXTENT = 4096
+# Tile units drawn past each edge so polygon outlines do not seam
+MVT_BUFFER = 64
+MVT_MAX_ZOOM = int(os.getenv("MVT_MAX_ZOOM", "14"))
+MVT_MAX_FEATURES = int(os.getenv("MVT_MAX_FEATURES", "5000"))
+# Shared by the API workers of one host; empty string keeps tiles in memory only
+MVT_CACHE_DIR = os.getenv("MVT_CACHE_DIR", os.path.join(tempfile.gettempdir(), "macro-data-mvt"))
+
+# Web mercator latitude limit
+MAX_LATITUDE = 85.0511287798
+
+# Geometry types and commands from the vector tile spec
+POINT = 1
+POLYGON = 3
+MOVE_TO = 1
+LINE_TO = 2
+CLOSE_PATH = 7
+
+
+def tile_bounds(z: int, x: int, y: int, buffer: int = 0) -> Tuple[float, float, float, float]:
+    """(min_lon, min_lat, max_lon, max_lat) of a tile, widened by buffer tile units"""
+    n = 2 ** z
+    pad = buffer / MVT_EXTENT
+
+    def lon(tx: float) -> float:
+        return max(-180.0, min(180.0, tx / n * 360 - 180))
+
+    def lat(ty: float) -> float:
+        ty = max(0.0, min(float(n), ty))
+        return math.degrees(math.atan(math.sinh(math.pi * (1 - 2 * ty / n))))
+
+    return lon(x - pad), lat(y + 1 + pad), lon(x + 1 + pad), lat(y - pad)
+
+
+def _project(lon: float, lat: float, z: int, x: int, y: int) -> Tuple[float, float]:
+    """Longitude/latitude to unrounded tile units of tile (z, x, y)"""
+    n = 2 ** z
+    lat = max(-MAX_LATITUDE, min(MAX_LATITUDE, lat))
+    world_x = (lon + 180) / 360 * n
+    world_y = (1 - math.asinh(math.tan(math.radians(lat))) / math.pi) / 2 * n
+    return (world_x - x) * MVT_EXTENT, (world_y - y) * MVT_EXTENT
+
+
+def _ring_area(ring: List[Tuple[int, int]]) -> int:
+    """Twice the signed area; positive is clockwise on screen (y down)"""
+    return sum(x1 * y2 - x2 * y1 for (x1, y1), (x2, y2) in zip(ring, ring[1:] + ring[:1]))
+
+
+def polygon_commands(rings: Iterable[List[Tuple[float, float]]], z: int, x: int, y: int) -> List[int]:
+    """
+    Geometry commands of a GeoJSON polygon in tile (z, x, y)
+
+    Rings are clamped to the buffered tile, which clips the axis-aligned
+    footprints exactly. The exterior ring is wound clockwise and holes
+    counter-clockwise, as the spec requires; rings that collapse to zero
+    area at this zoom are dropped (a dropped exterior drops the polygon).
+    """
+    low, high = -MVT_BUFFER, MVT_EXTENT + MVT_BUFFER
+    commands, cursor = [], (0, 0)
+    for index, ring in enumerate(rings):
+        points = []
+        for lon, lat in ring[:-1] if ring and ring[0] == ring[-1] else ring:
+            px, py = _project(lon, lat, z, x, y)
+            point = (int(round(max(low, min(high, px)))), int(round(max(low, min(high, py)))))
+            if not points or point != points[-1]:
+                points.append(point)
+        while len(points) > 1 and points[0] == points[-1]:
+            points.pop()
+
+        area = _ring_area(points) if len(points) >= 3 else 0
+        if area == 0:
+            if index == 0:
+                return []
+            continue
+        if (area > 0) != (index == 0):
+            points.reverse()
+
+        commands.append(_command(MOVE_TO, 1))
+        cursor = _append_deltas(commands, points[:1], cursor)
+        commands.append(_command(LINE_TO, len(points) - 1))
+        cursor = _append_deltas(commands, points[1:], cursor)
+        commands.append(_command(CLOSE_PATH, 1))
+    return commands
+
+
+def point_commands(lon: float, lat: float, z: int, x: int, y: int) -> List[int]:
+    """Geometry commands of a point, empty when it falls outside the tile"""
+    px, py = _project(lon, lat, z, x, y)
+    point = (int(round(px)), int(round(py)))
+    if not (0 <= point[0] < MVT_EXTENT and 0 <= point[1] < MVT_EXTENT):
+        return []
+    commands = [_command(MOVE_TO, 1)]
+    _append_deltas(commands, [point], (0, 0))
+    return commands
+
+
+def _command(command_id: int, count: int) -> int:
+    return (command_id & 0x7) | (count << 3)
+
+
+def _append_deltas(commands: List[int], points: List[Tuple[int, int]],
+                   cursor: Tuple[int, int]) -> Tuple[int, int]:
+    for px, py in points:
+        commands.append(_zigzag(px - cursor[0]))
+        commands.append(_zigzag(py - cursor[1]))
+        cursor = (px, py)
+    return cursor
+
+
+def _zigzag(n: int) -> int:
+    return (n << 1) ^ (n >> 63)
+
+
+def _varint(n: int) -> bytes:
+    out = bytearray()
+    while n > 0x7F:
+        out.append((n & 0x7F) | 0x80)
+        n >>= 7
+    out.append(n)
+    return bytes(out)
+
+
+def _field(number: int, payload: bytes) -> bytes:
+    """Length-delimited field"""
+    return _varint((number << 3) | 2) + _varint(len(payload)) + payload
+
+
+def _varint_field(number: int, value: int) -> bytes:
+    return _varint(number << 3) + _varint(value)
+
+
+def _packed(number: int, values: List[int]) -> bytes:
+    return _field(number, b"".join(_varint(value) for value in values))
+
+
+def _value(value) -> bytes:
+    """Layer value message for a str, bool, int or float attribute"""
+    if isinstance(value, bool):
+        return _varint_field(7, int(value))
+    if isinstance(value, int):
+        return _varint_field(6, _zigzag(value))
+    if isinstance(value, float):
+        return _varint((3 << 3) | 1) + struct.pack("<d", value)
+    return _field(1, str(value).encode("utf-8"))
+
+
+def encode_tile(documents: List[Dict], z: int, x: int, y: int) -> bytes:
+    """
+    One-layer vector tile of satellites documents
+
+    Documents need a GeoJSON "geometry" (Polygon or Point); region,
+    ndvi_value and the timestamp's date become attributes. An empty tile
+    encodes to b"".
+    """
+    keys: Dict[str, int] = {}
+    values: Dict[Tuple[type, object], int] = {}
+    features = []
+
+    for document in documents:
+        geometry = document.get("geometry") or {}
+        if geometry.get("type") == "Polygon":
+            geom_type, commands = POLYGON, polygon_commands(geometry["coordinates"], z, x, y)
+        elif geometry.get("type") == "Point":
+            geom_type, commands = POINT, point_commands(*geometry["coordinates"][:2], z, x, y)
+        else:
+            continue
+        if not commands:
+            continue
+
+        timestamp = document.get("timestamp")
+        attributes = {
+            "region": document.get("region"),
+            "ndvi_value": document.get("ndvi_value"),
+            "date": timestamp.date().isoformat() if hasattr(timestamp, "date") else timestamp
+        }
+        tags = []
+        for key, value in attributes.items():
+            if value is None:
+                continue
+            tags.append(keys.setdefault(key, len(keys)))
+            tags.append(values.setdefault((type(value), value), len(values)))
+
+        features.append(_packed(2, tags) + _varint_field(3, geom_type) + _packed(4, commands))
+
+    if not features:
+        return b""
+
+    layer = _varint_field(15, 2) + _field(1, MVT_LAYER.encode("utf-8"))
+    layer += b"".join(_field(2, feature) for feature in features)
+    layer += b"".join(_field(3, key.encode("utf-8")) for key in keys)
+    layer += b"".join(_field(4, _value(value)) for _, value in values)
+    layer += _varint_field(5, MVT_EXTENT)
+    return _field(3, layer)
+
+
+class TileStore:
+    """
+    Encoded tiles in memory, then on disk, then built once per key
+
+    Keys are (data version, *parts); the version leads so a data refresh
+    never serves old tiles.
+    """
+
+    def __init__(self, directory: Optional[str] = MVT_CACHE_DIR,
+                 maxsize: int = int(os.getenv("MVT_CACHE_MAXSIZE", "4096")),
+                 ttl: float = float(os.getenv("MVT_CACHE_TTL_SECONDS", "86400"))):
+        """
+        Args:
+            directory: Disk cache root, None or "" for memory only
+            maxsize: Tiles kept in memory
+            ttl: Seconds a tile stays in memory
+        """
+        self.directory = directory or None
+        self.memory = TTLCache(maxsize=maxsize, ttl=ttl)
+        self.flight = SingleFlight()
+        self._newest_version = -1
+
+        self.disk_hits = 0
+        self.builds = 0
+
+    async def get_or_build(self, key: Tuple, build: Callable[[], Awaitable[bytes]]) -> bytes:
+        body = self.memory.get(key)
+        if body is not None:
+            return body
+        return await self.flight.do(key, lambda: self._load(key, build))
+
+    async def _load(self, key: Tuple, build: Callable[[], Awaitable[bytes]]) -> bytes:
+        path = self._path(key)
+        body = await asyncio.to_thread(self._read, path) if path else None
+        if body is not None:
+            self.disk_hits += 1
+        else:
+            body = await build()
+            self.builds += 1
+            if path:
+                await asyncio.to_thread(self._write, key[0], path, body)
+        self.memory.set(key, body)
+        return body
+
+    def _path(self, key: Tuple) -> Optional[str]:
+        if self.directory is None:
+            return None
+        # Parts come from the query string; hash them rather than trust them as path segments
+        digest = hashlib.sha1("|".join(str(part) for part in key[1:]).encode("utf-8")).hexdigest()
+        return os.path.join(self.directory, f"v{int(key[0])}", digest[:2], f"{digest}.mvt")
+
+    @staticmethod
+    def _read(path: str) -> Optional[bytes]:
+        try:
+            with open(path, "rb") as f:
+                return f.read()
+        except FileNotFoundError:
+            return None
+
+    def _write(self, version: int, path: str, body: bytes):
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            # Atomic for other workers reading the same path
+            temporary = f"{path}.{os.getpid()}.tmp"
+            with open(temporary, "wb") as f:
+                f.write(body)
+            os.replace(temporary, path)
+        except OSError:
+            return
+        if version > self._newest_version:
+            self._newest_version = version
+            self._prune(version)
+
+    def _prune(self, version: int):
+        """Remove disk directories of versions older than version"""
+        for name in os.listdir(self.directory):
+            if name.startswith("v") and name[1:].isdigit() and int(name[1:]) < version:
+                shutil.rmtree(os.path.join(self.directory, name), ignore_errors=True)
+
+    def stats(self) -> Dict:
+        return {
+            "memory": self.memory.stats(),
+            "disk_enabled": self.directory is not None,
+            "disk_hits": self.disk_hits,
+            "builds": self.builds,
+            "singleflight": self.flight.stats()
+        }
+
+
+tile_store = TileStore()
@@ -130,7 +130,60 @@ export interface PriceForecast {
   current_price: number
 }
 
+export interface DashboardBundle {
+  country: string
+  crop: string
+  fusion_score: FusionScoreResponse | null
+  crop_health: { tiles: CropHealthTile[] } | null
+  weather_forecast: { data: WeatherData[] } | null
+  price_prediction: PriceForecast | null
+  news_risk: { risk_score: number; recent_news: NewsItem[] } | null
+  errors: Record<string, string>
+  timings_ms: Record<string, number>
+}
+
+export interface FusionScoreUpdate {
+  type: "fusion_score"
+  country: string
+  crop: string
+  fusion_score: number
+  risk_level: string
+  previous_score: number | null
+  delta: number | null
+  risk_level_changed: boolean
+  timestamp: string
+}
+
+export interface DataUpdatedEvent {
+  type: "data_updated"
+  collection: string
+  timestamp: string
+}
+
 class FusionApiClient {
+  async getDashboard(country: string, crop: string): Promise<DashboardBundle> {
+    try {
+      const response = await fetch(`${API_BASE}/dashboard?country=${country}&crop=${crop}`)
+      if (!response.ok) throw new Error("Failed to fetch dashboard")
+      return await response.json()
+    } catch (error) {
+      console.log("[v0] Using mock dashboard data for", crop, country)
+      const mock = generateMockData(country, crop)
+      return {
+        country,
+        crop,
+        fusion_score: mock.fusionScore as FusionScoreResponse,
+        crop_health: mock.cropHealth,
+        weather_forecast: mock.weather,
+        price_prediction: mock.price,
+        news_risk: mock.news,
+        errors: {},
+        timings_ms: {},
+      }
+    }
+  }
+
+
   async getFusionScore(country: string, crop: string): Promise<FusionScoreResponse> {
     try {
       const response = await fetch(`${API_BASE}/fusion-score?country=${country}&crop=${crop}`)
@@ -188,6 +241,19 @@ class FusionApiClient {
     }
   }
 
+  // Push updates instead of polling; returns a function that closes the stream
+  subscribeUpdates(
+    country: string,
+    crop: string,
+    onEvent: (event: FusionScoreUpdate | DataUpdatedEvent) => void,
+  ): () => void {
+    const source = new EventSource(`${API_BASE}/updates?country=${country}&crop=${crop}`)
+    const handle = (message: MessageEvent) => onEvent(JSON.parse(message.data))
+    source.addEventListener("fusion_score", handle)
+    source.addEventListener("data_updated", handle)
+    return () => source.close()
+  }
+
   async getHealth(): Promise<{ status: string; database: string }> {
     try {
       const response = await fetch(`${API_BASE}/health`)